@@ -0,0 +1,99 @@
+"""
+Leveled logging kept in memory so the GUI can show it.
+
+Modules log through get_logger(name), a child of the "brower" logger, instead of
+printing. RING keeps the most recent records as structured entries (time, level,
+logger, message and any fields passed as extra={'fields': {...}}) for the log
+window; nothing reaches the terminal unless enable_console() is called.
+
+The parse logger sits on the per-line hot path and defaults to WARNING, so its
+debug calls cost no more than a level check. Turn it up with
+set_level('parse', logging.DEBUG) when a file is malformed.
+"""
+import collections
+import logging
+import sys
+from datetime import datetime
+
+ROOT = 'brower'
+RING_SIZE = 2000
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the last capacity records as plain dicts."""
+
+    def __init__(self, capacity=RING_SIZE):
+        super().__init__()
+        self.records = collections.deque(maxlen=capacity)
+        self.count = 0  # Records ever emitted, so viewers can tell when there is something new
+
+    def emit(self, record):
+        self.count += 1
+        self.records.append({
+            'time': record.created,
+            'level': record.levelno,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'fields': getattr(record, 'fields', None),
+        })
+
+    def entries(self, level=logging.DEBUG):
+        """Entries at level or above, oldest first."""
+        return [entry for entry in list(self.records) if entry['level'] >= level]
+
+    def clear(self):
+        self.records.clear()
+
+
+class FieldsFormatter(logging.Formatter):
+    """Formats a record with its structured fields appended as key=value pairs."""
+
+    def format(self, record):
+        line = super().format(record)
+        fields = getattr(record, 'fields', None)
+        if fields:
+            line += '  ' + format_fields(fields)
+        return line
+
+
+RING = RingBufferHandler()
+
+_root = logging.getLogger(ROOT)
+_root.setLevel(logging.INFO)
+_root.addHandler(RING)
+_root.propagate = False
+logging.getLogger(f"{ROOT}.parse").setLevel(logging.WARNING)
+
+_console = None
+
+
+def get_logger(name):
+    return logging.getLogger(f"{ROOT}.{name}")
+
+
+def set_level(name, level):
+    """Sets the level of one of the app's loggers; name None means all of them."""
+    logging.getLogger(f"{ROOT}.{name}" if name else ROOT).setLevel(level)
+
+
+def enable_console(level=logging.INFO):
+    """Also writes records at level or above to stderr, e.g. for the command line tools."""
+    global _console
+    if _console is None:
+        _console = logging.StreamHandler(sys.stderr)
+        _console.setFormatter(FieldsFormatter('%(levelname)-7s %(name)s: %(message)s'))
+        _root.addHandler(_console)
+    _console.setLevel(level)
+
+
+def format_fields(fields):
+    return ' '.join(f"{key}={value!r}" for key, value in fields.items())
+
+
+def format_entry(entry):
+    """One line of the log window for a RING entry."""
+    time = datetime.fromtimestamp(entry['time']).strftime('%H:%M:%S')
+    line = f"{time} {logging.getLevelName(entry['level']):<7} {entry['logger'][len(ROOT) + 1:]}: {entry['message']}"
+    if entry['fields']:
+        line += '  ' + format_fields(entry['fields'])
+    return line
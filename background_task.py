@@ -0,0 +1,101 @@
+"""
+Runs long jobs (export, validation) off the Tk main loop.
+
+The work function runs in a daemon thread and never touches Tk. It reports progress
+and its result through a queue that the main loop drains every few milliseconds with
+root.after, so every callback below runs on the main thread.
+"""
+import queue
+import threading
+
+
+class Field:
+    """Stand-in for tk.StringVar holding a value read on the main thread, safe to use from workers."""
+
+    def __init__(self, value=""):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+class TaskCancelled(Exception):
+    """Raised inside the work function when the user cancels the task."""
+
+
+class BackgroundTask:
+    """
+    work(task) runs in the worker thread and returns the result handed to on_done.
+    It can call task.report(percent, message) for progress and task.check_cancelled()
+    between steps so cancel() takes effect at the next checkpoint.
+    """
+
+    POLL_MS = 50
+
+    def __init__(self, root, work, on_done, on_progress=None, on_error=None, on_cancelled=None):
+        self.root = root
+        self.work = work
+        self.on_done = on_done
+        self.on_progress = on_progress
+        self.on_error = on_error
+        self.on_cancelled = on_cancelled
+        self.events = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+        self.root.after(self.POLL_MS, self.poll)
+        return self
+
+    def run(self):
+        try:
+            result = self.work(self)
+        except TaskCancelled:
+            self.events.put(('cancelled', None))
+        except Exception as e:
+            self.events.put(('error', e))
+        else:
+            self.events.put(('done', result))
+
+    def report(self, percent, message=None):
+        self.check_cancelled()
+        self.events.put(('progress', (percent, message)))
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise TaskCancelled()
+
+    def is_running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def poll(self):
+        """Dispatches queued events on the main thread and reschedules itself until the task ends."""
+        try:
+            while True:
+                kind, payload = self.events.get_nowait()
+                if kind == 'progress':
+                    if self.on_progress and not self.cancelled:
+                        self.on_progress(*payload)
+                    continue
+                if kind == 'done':
+                    self.on_done(payload)
+                elif kind == 'error' and self.on_error:
+                    self.on_error(payload)
+                elif kind == 'cancelled' and self.on_cancelled:
+                    self.on_cancelled()
+                return
+        except queue.Empty:
+            pass
+        self.root.after(self.POLL_MS, self.poll)
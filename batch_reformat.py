@@ -0,0 +1,364 @@
+"""
+Command line batch reformatting of Brower exports, without opening any Tk window.
+
+    python batch_reformat.py camp/*.csv --event GS --hill "Mont-Tremblant" --team SQAH
+    python batch_reformat.py camp/ --metadata camp.json --output-dir reformatted/ --jobs 8
+
+Metadata comes from the command line flags and an optional --metadata JSON file.
+A sidecar JSON next to a CSV (same name, .json extension) overrides both for that
+file. Recognized keys: hill, event, team, snow, sky, precipitation, wind, guests,
+session. guests is a list of {"name": ..., "bib": ...}; session picks which session
+(1 = first) to reformat from a file that holds several.
+
+Workbooks are named like the app names them (Hill_Team_Event_Date) followed by the
+CSV's own name, and the session for files holding several, since a camp day
+produces several exports with the same hill, team, event and date.
+
+With --jobs, files are spread over a process pool. Settings and rosters are read
+once here and shipped to each worker when it starts. Every file's workbook path
+is worked out first, from its metadata and session index, and files that would
+write the same workbook as an earlier one (e.g. "run 1.csv" and "run-1.csv", or two
+folders' "run1.csv" into one --output-dir) are failed before anything is
+dispatched, instead of workers overwriting each other.
+
+Warnings (e.g. skipped malformed rows) go to stderr; --debug adds per-line parse
+diagnostics.
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from app_log import enable_console, get_logger, set_level
+from background_task import Field
+from brower_parser import index_sessions
+from gen1 import TimingSystemApp
+from profiling import Profiler
+
+log = get_logger('batch')
+
+METADATA_KEYS = ('hill', 'event', 'team', 'snow', 'sky', 'precipitation', 'wind', 'guests', 'session')
+
+
+class BatchReformatter(TimingSystemApp):
+    """
+    The gen1 export pipeline with the GUI left out. Settings and rosters are loaded
+    the same way as the app; errors raise instead of opening dialogs.
+    """
+
+    def __init__(self, snapshot=None):
+        self.root = None
+        self.selected_file = None
+        self.sessions = []
+        self.sessions_key = None
+        self.session_span = None
+        self.timing_session = None
+        self.athletes = {"SQAH": [], "SQAF": [], "OTHER": []}
+        self.temp_guests = []
+        self.team_bib_index = {}
+        self.guest_bib_index = {}
+        self.current_team = "SQAH"
+        self.outlier_threshold = 2
+        self.profiler = Profiler("Batch")
+
+        self.team_var = Field()
+        self.event_var = Field()
+        self.hill_var = Field()
+        self.snow_condition_var = Field()
+        self.sky_condition_var = Field()
+        self.precipitation_var = Field()
+        self.wind_condition_var = Field()
+        self.date_var = Field()
+        self.time_var = Field()
+        self.session_var = Field()
+
+        self.excel_title = "Training SQA Équipe du Québec"
+        self.team_names = {"SQAH": "SQAH", "SQAF": "SQAF"}
+        self.default_hill = ""
+        if snapshot is None:
+            self.load_settings()
+            self.load_athletes_from_json()
+        else:
+            self.excel_title = snapshot['excel_title']
+            self.team_names = snapshot['team_names']
+            self.default_hill = snapshot['default_hill']
+            self.athletes = snapshot['athletes']
+            self.rebuild_bib_index()
+
+    def snapshot(self):
+        """Settings and rosters as plain data, for starting workers without re-reading files."""
+        return {
+            'excel_title': self.excel_title,
+            'team_names': self.team_names,
+            'default_hill': self.default_hill,
+            'athletes': self.athletes,
+        }
+
+    def parse_timing_data(self, file_path, span=None):
+        # No dialog to show; let the caller report the error for this file
+        return self.load_timing_data(file_path, span)
+
+    def check_guest_conflicts_with_athletes(self, new_team):
+        """Marks guests whose bib clashes with the team as inactive, without the warning dialog."""
+        for guest in self.temp_guests:
+            guest["inactive"] = new_team in self.team_bib_index.get(int(guest["bib"]), {})
+
+    def apply_metadata(self, metadata):
+        """Fills the form fields from a metadata dict, like a user would in the GUI."""
+        team = metadata.get('team') or "SQAH"
+        if team not in self.athletes:
+            raise ValueError(f"Unknown team '{team}' (expected one of {', '.join(self.athletes)})")
+        if not metadata.get('event'):
+            raise ValueError("No event type (SL/GS/SG/DH/SX) given.")
+        if not (metadata.get('hill') or self.default_hill).strip():
+            raise ValueError("No hill name given.")
+
+        self.temp_guests = [
+            {"name": guest["name"], "bib": int(guest["bib"])}
+            for guest in metadata.get('guests') or []
+        ]
+        self.rebuild_bib_index()
+        self.current_team = team
+        self.team_var.set(team)
+        self.check_guest_conflicts_with_athletes(team)
+
+        self.event_var.set(metadata['event'])
+        self.hill_var.set((metadata.get('hill') or self.default_hill).strip())
+        self.snow_condition_var.set(metadata.get('snow') or "")
+        self.sky_condition_var.set(metadata.get('sky') or "")
+        self.precipitation_var.set(metadata.get('precipitation') or "")
+        self.wind_condition_var.set(metadata.get('wind') or "")
+
+    def reformat(self, csv_path, metadata, output_dir=None, overwrite=False, streaming=False):
+        """
+        Reformats one CSV and returns the path of the workbook written.
+        """
+        self.apply_metadata(metadata)
+
+        self.selected_file = csv_path
+        self.index_file_sessions(csv_path)
+        position = int(metadata.get('session') or 1)
+        if self.sessions:
+            if not 1 <= position <= len(self.sessions):
+                raise ValueError(f"No session {position} in the file, it holds {len(self.sessions)}.")
+            if len(self.sessions) > 1 and not metadata.get('session'):
+                log.warning("%s holds %d sessions; reformatting the first (pick another with --session)",
+                            os.path.basename(csv_path), len(self.sessions))
+            self.select_session(position - 1)
+        else:
+            self.date_var.set("")
+            self.time_var.set("")
+            self.session_var.set("")
+
+        output_dir = output_dir or os.path.dirname(os.path.abspath(csv_path))
+        output_path = os.path.join(output_dir, self.output_filename(csv_path, position, len(self.sessions)))
+        if os.path.exists(output_path) and not overwrite:
+            raise FileExistsError(f"{output_path} already exists (use --overwrite)")
+
+        self.profiler = Profiler(f"Export {os.path.basename(output_path)}")
+        wb = self.build_formatted_workbook(streaming=streaming)
+        with self.profiler.span('save'):
+            wb.save(output_path)
+        return output_path
+
+    def output_filename(self, csv_path, position, session_count, **fields):
+        """
+        generate_filename, from fields or the form, with the CSV's name (and session)
+        appended, one workbook per input.
+        """
+        name, extension = os.path.splitext(self.generate_filename(**fields))
+        source = output_source(csv_path)
+        if session_count > 1:
+            source += f"_Session-{position}"
+        return f"{name}_{source}{extension}"
+
+    def output_target(self, csv_path, metadata, output_dir=None):
+        """
+        The path reformat would write csv_path to, worked out from the metadata and the
+        file's session index without reformatting it. None when reformat would fail
+        before writing anything.
+        """
+        try:
+            sessions = index_sessions(csv_path)
+            position = int(metadata.get('session') or 1)
+        except (OSError, ValueError):
+            return None
+        if sessions and not 1 <= position <= len(sessions):
+            return None
+        name = self.output_filename(
+            csv_path, position, len(sessions),
+            hill=(metadata.get('hill') or self.default_hill).strip(),
+            team=metadata.get('team') or "SQAH",
+            event=metadata.get('event') or "",
+            date_str=sessions[position - 1].date if sessions else ""
+        )
+        folder = output_dir or os.path.dirname(os.path.abspath(csv_path))
+        return os.path.normcase(os.path.abspath(os.path.join(folder, name)))
+
+
+def output_source(csv_path):
+    """The CSV's file name, reduced to the characters generate_filename keeps."""
+    stem = '-'.join(os.path.splitext(os.path.basename(csv_path))[0].split())
+    return ''.join(c for c in stem if c.isalnum() or c in '-_')
+
+
+# One reformatter per worker process, built from the snapshot by init_worker
+_worker_app = None
+
+
+def configure_logging(debug=False):
+    enable_console(logging.DEBUG if debug else logging.WARNING)
+    if debug:
+        set_level(None, logging.DEBUG)
+        set_level('parse', logging.DEBUG)
+
+
+def init_worker(snapshot, debug=False):
+    global _worker_app
+    configure_logging(debug)
+    _worker_app = BatchReformatter(snapshot)
+
+
+def reformat_one(csv_path, metadata, output_dir, overwrite, streaming=False):
+    """
+    Worker task: returns (csv_path, output_path, None) or (csv_path, None, error message).
+    """
+    try:
+        return csv_path, _worker_app.reformat(csv_path, metadata, output_dir, overwrite, streaming), None
+    except Exception as e:
+        return csv_path, None, str(e)
+
+
+def run_batch(csv_files, base_metadata, output_dir=None, overwrite=False, jobs=1, on_result=None,
+              streaming=False, debug=False):
+    """
+    Reformats every file, in a process pool when jobs > 1.
+    Returns the (csv_path, output_path, error) results in input order.
+    """
+    reformatter = BatchReformatter()
+    snapshot = reformatter.snapshot()
+    tasks = []
+    results = {}
+    targets = {}
+    for path in csv_files:
+        metadata = metadata_for(path, base_metadata)
+        target = reformatter.output_target(path, metadata, output_dir)
+        if target is not None and target in targets:
+            result = (path, None, f"Would write the same workbook as {targets[target]}")
+            results[path] = result
+            if on_result:
+                on_result(result)
+            continue
+        targets[target] = path
+        tasks.append((path, metadata, output_dir, overwrite, streaming))
+
+    if jobs <= 1 or len(tasks) <= 1:
+        init_worker(snapshot, debug)
+        for task in tasks:
+            result = reformat_one(*task)
+            results[result[0]] = result
+            if on_result:
+                on_result(result)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker,
+                                 initargs=(snapshot, debug)) as executor:
+            futures = [executor.submit(reformat_one, *task) for task in tasks]
+            for future in as_completed(futures):
+                result = future.result()
+                results[result[0]] = result
+                if on_result:
+                    on_result(result)
+
+    return [results[path] for path in csv_files]
+
+
+def find_csv_files(patterns):
+    """Expands directories and glob patterns into a sorted list of CSV paths."""
+    files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(pattern, '*.csv'))
+        else:
+            matches = glob.glob(pattern)
+        files.extend(path for path in matches if os.path.isfile(path))
+    return sorted(set(files))
+
+
+def load_metadata_file(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        metadata = json.load(f)
+    return {key: value for key, value in metadata.items() if key in METADATA_KEYS}
+
+
+def metadata_for(csv_path, base_metadata):
+    """Combines the shared metadata with the CSV's sidecar JSON, if there is one."""
+    metadata = dict(base_metadata)
+    sidecar = os.path.splitext(csv_path)[0] + '.json'
+    if os.path.isfile(sidecar):
+        metadata.update(load_metadata_file(sidecar))
+    return metadata
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Reformat Brower CSV exports into formatted Excel workbooks.")
+    parser.add_argument('inputs', nargs='+', help="CSV files, directories or glob patterns")
+    parser.add_argument('--metadata', help="JSON file with metadata shared by every file")
+    parser.add_argument('--hill')
+    parser.add_argument('--event', help="SL, GS, SG, DH or SX")
+    parser.add_argument('--team', help="Team key, e.g. SQAH or SQAF")
+    parser.add_argument('--snow', help="Snow condition")
+    parser.add_argument('--sky', help="Sky condition")
+    parser.add_argument('--precipitation')
+    parser.add_argument('--wind', help="Wind condition")
+    parser.add_argument('--session', type=int,
+                        help="Which session to reformat from files holding several (1 = first, the default)")
+    parser.add_argument('--output-dir', help="Where to write workbooks (default: next to each CSV)")
+    parser.add_argument('--overwrite', action='store_true', help="Replace existing workbooks")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help="Worker processes (0 = one per CPU, default 1)")
+    parser.add_argument('--streaming', action='store_true',
+                        help="Write sheets in openpyxl write-only mode to save memory on very large files")
+    parser.add_argument('--debug', action='store_true',
+                        help="Log per-line parse diagnostics and other debug messages to stderr")
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    configure_logging(args.debug)
+
+    base_metadata = load_metadata_file(args.metadata) if args.metadata else {}
+    for key in METADATA_KEYS:
+        value = getattr(args, key, None)
+        if value:
+            base_metadata[key] = value
+
+    csv_files = find_csv_files(args.inputs)
+    if not csv_files:
+        print("No CSV files found.", file=sys.stderr)
+        return 1
+
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    def report(result):
+        csv_path, output_path, error = result
+        if error:
+            print(f"FAILED {csv_path}: {error}", file=sys.stderr)
+        else:
+            print(f"OK     {csv_path} -> {output_path}")
+
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    results = run_batch(csv_files, base_metadata, args.output_dir, args.overwrite, jobs, report,
+                        args.streaming, args.debug)
+
+    failures = sum(1 for _, _, error in results if error)
+    print(f"{len(csv_files) - failures} of {len(csv_files)} files reformatted.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
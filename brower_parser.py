@@ -0,0 +1,244 @@
+"""
+Streaming reader for Brower timing exports.
+
+The file is read line by line exactly once. Session header fields come out first,
+then the column layout once the Bib#/Run# header line is reached, then one typed
+row per timing line. Callers that only need the header stop consuming early.
+
+The timing laptop can also write several sessions into one file. index_sessions
+memory-maps the file and finds every Bib#/Run# line with mmap.find, then reads
+only the few header lines above each one, so even a very large export is indexed
+without decoding its rows. Each SessionSpan records the byte range of one session
+(its header lines through its last row); passing it as span reads just that range.
+"""
+import mmap
+import os
+from collections import namedtuple
+from datetime import datetime
+
+SEPARATOR = '>'
+ENCODING = 'utf-8'
+
+HeaderField = namedtuple('HeaderField', ['name', 'value'])
+ColumnLayout = namedtuple('ColumnLayout', ['bib', 'run', 'splits', 'finish', 'status'])
+TimingRow = namedtuple('TimingRow', ['bib', 'run', 'splits', 'finish', 'status'])
+SessionSpan = namedtuple('SessionSpan', ['session', 'date', 'time', 'layout', 'start', 'end'])
+
+
+def format_session_date(date_str):
+    """
+    Converts the Brower mm/dd/yy date to dd/mm/yyyy, keeping the original if it doesn't parse.
+    """
+    if not date_str:
+        return ""
+    try:
+        return datetime.strptime(date_str, '%m/%d/%y').strftime('%d/%m/%Y')
+    except ValueError:
+        return date_str
+
+
+def parse_column_layout(line):
+    """
+    Maps the Bib#/Run# header line to column indices.
+    Split columns are returned as (split number, column index) pairs sorted by split number.
+    """
+    layout = {'bib': None, 'run': None, 'finish': None, 'status': None}
+    splits = []
+    for i, header in enumerate(line.split(SEPARATOR)):
+        header = header.lower().strip()
+        if "bib" in header:
+            layout['bib'] = i
+        elif "run" in header:
+            layout['run'] = i
+        elif "finish time" in header:
+            layout['finish'] = i
+        elif "status" in header:
+            layout['status'] = i
+        elif "split" in header:
+            split_num = ''.join(filter(str.isdigit, header))
+            if split_num:
+                splits.append((int(split_num), i))
+    splits.sort()
+    return ColumnLayout(layout['bib'], layout['run'], tuple(splits), layout['finish'], layout['status'])
+
+
+def is_column_line(line):
+    """True for the Bib#/Run# line naming the columns of a session's rows."""
+    return "Bib#" in line and "Run#" in line
+
+
+class BrowerParser:
+    """
+    Incremental parser state: feed it one line at a time and it returns
+    a HeaderField, a ColumnLayout, a TimingRow, or None for lines it skips.
+    """
+
+    def __init__(self, parse_time=None):
+        self.parse_time = parse_time if parse_time is not None else (lambda value: value)
+        self.layout = None
+
+    def feed(self, line):
+        line = line.strip()
+        if not line:
+            return None
+
+        if self.layout is None:
+            if is_column_line(line):
+                self.layout = parse_column_layout(line)
+                return self.layout
+            return self.parse_header_field(line)
+
+        return self.parse_row(line)
+
+    def parse_header_field(self, line):
+        # Try both '>' and ':' as separators
+        if SEPARATOR in line:
+            parts = line.split(SEPARATOR)
+        elif ':' in line:
+            parts = line.split(':')
+        else:
+            return None
+
+        parts = [p.strip() for p in parts]
+        if len(parts) < 2:
+            return None
+
+        if "Session" in parts[0]:
+            return HeaderField('session', parts[1].strip('#').strip())
+        if parts[0] == "Date":
+            return HeaderField('date', parts[1])
+        if parts[0] == "Time":
+            return HeaderField('time', parts[1])
+        return None
+
+    def parse_row(self, line):
+        data = line.split(SEPARATOR)
+        if len(data) <= 1:
+            return None
+
+        layout = self.layout
+
+        def cell(index):
+            if index is None or index >= len(data):
+                return ''
+            return data[index].strip()
+
+        bib = cell(layout.bib)
+        run = cell(layout.run)
+        if not bib or not run:
+            return None
+
+        return TimingRow(
+            bib,
+            run,
+            tuple(self.parse_time(cell(index)) for _, index in layout.splits),
+            self.parse_time(cell(layout.finish)),
+            cell(layout.status)
+        )
+
+
+def iter_brower_records(file_path, parse_time=None, span=None):
+    """
+    Yields the records of a Brower export in file order, reading it in a single pass.
+    With a SessionSpan from index_sessions only that session's bytes are read.
+    """
+    parser = BrowerParser(parse_time)
+    if span is not None:
+        with open(file_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            mm.seek(span.start)
+            while mm.tell() < span.end:
+                record = parser.feed(mm.readline().decode(ENCODING, 'replace'))
+                if record is not None:
+                    yield record
+        return
+
+    with open(file_path, 'r', encoding=ENCODING, errors='replace') as file:
+        for line in file:
+            record = parser.feed(line)
+            if record is not None:
+                yield record
+
+
+def index_sessions(file_path):
+    """
+    Returns a SessionSpan for every session in the file, in file order, without
+    reading any timing rows. A file without a Bib#/Run# line has no sessions.
+    """
+    with open(file_path, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        if size == 0:
+            return []
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # (start, end) of every column header line
+            columns = []
+            pos = mm.find(b'Bib#')
+            while pos != -1:
+                start = mm.rfind(b'\n', 0, pos) + 1
+                end = mm.find(b'\n', pos)
+                if end == -1:
+                    end = size
+                if mm.find(b'Run#', start, end) != -1:
+                    columns.append((start, end))
+                pos = mm.find(b'Bib#', end)
+
+            # A session starts at the header lines above its column line
+            starts = []
+            floor = 0
+            for start, end in columns:
+                starts.append(_header_start(mm, start, floor))
+                floor = end + 1
+
+            spans = []
+            for i, (start, end) in enumerate(columns):
+                header = {'session': "", 'date': "", 'time': ""}
+                parser = BrowerParser()
+                for line in mm[starts[i]:start].decode(ENCODING, 'replace').split('\n'):
+                    record = parser.feed(line)
+                    if record is not None:
+                        header[record.name] = record.value
+                layout = parser.feed(mm[start:end].decode(ENCODING, 'replace'))
+                spans.append(SessionSpan(
+                    header['session'],
+                    format_session_date(header['date']),
+                    header['time'],
+                    layout,
+                    starts[i],
+                    starts[i + 1] if i + 1 < len(starts) else size
+                ))
+            return spans
+
+
+def _header_start(mm, line_start, floor):
+    """
+    Walks up from the column line at line_start over the lines that aren't timing
+    rows (rows start with a bib number), stopping at floor. Returns where they begin.
+    """
+    while line_start > floor:
+        previous = max(mm.rfind(b'\n', floor, line_start - 1) + 1, floor)
+        if mm[previous:line_start].lstrip()[:1].isdigit():
+            break
+        line_start = previous
+    return line_start
+
+
+def read_session_header(file_path):
+    """
+    Reads the session, date and time fields, stopping at the column header line.
+    """
+    header = {'session': "", 'date': "", 'time': "", 'layout': None}
+    for record in iter_brower_records(file_path):
+        if isinstance(record, ColumnLayout):
+            header['layout'] = record
+            break
+        header[record.name] = record.value
+    header['date'] = format_session_date(header['date'])
+    return header
+
+
+def read_timing_rows(file_path, parse_time=None):
+    """
+    Yields only the timing rows, with split and finish cells passed through parse_time.
+    """
+    for record in iter_brower_records(file_path, parse_time):
+        if isinstance(record, TimingRow):
+            yield record
@@ -0,0 +1,73 @@
+"""
+Streaming worksheet for large exports.
+
+StreamingSheet wraps an openpyxl write-only worksheet with the small part of the
+Worksheet API the writers use (ws.cell, ws['B3'], column/row dimensions, add_chart).
+Cells are held per row until flush() appends the finished rows in order, so only
+the rows still being written stay in memory.
+"""
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils.cell import column_index_from_string, coordinate_from_string
+
+
+class StreamingSheet:
+    def __init__(self, ws):
+        self.ws = ws
+        self.pending = {}   # row -> {column: WriteOnlyCell}
+        self.next_row = 1   # first row not yet appended to the sheet
+
+    @property
+    def title(self):
+        return self.ws.title
+
+    @property
+    def column_dimensions(self):
+        return self.ws.column_dimensions
+
+    @property
+    def row_dimensions(self):
+        return self.ws.row_dimensions
+
+    def cell(self, row, column, value=None):
+        if row < self.next_row:
+            raise ValueError(f"Row {row} has already been written to the stream")
+        cells = self.pending.setdefault(row, {})
+        cell = cells.get(column)
+        if cell is None:
+            cell = cells[column] = WriteOnlyCell(self.ws)
+        if value is not None:
+            cell.value = value
+        return cell
+
+    def __getitem__(self, coordinate):
+        column, row = coordinate_from_string(coordinate)
+        return self.cell(row, column_index_from_string(column))
+
+    def __setitem__(self, coordinate, value):
+        self[coordinate].value = value
+
+    def add_chart(self, chart, anchor):
+        self.ws.add_chart(chart, anchor)
+
+    def flush(self, before_row=None):
+        """
+        Appends every pending row above before_row (all of them by default).
+        Rows that were never touched are written empty to keep row numbers aligned.
+        """
+        if before_row is None:
+            last_row = max(self.pending, default=self.next_row - 1)
+        else:
+            last_row = before_row - 1
+
+        while self.next_row <= last_row:
+            cells = self.pending.pop(self.next_row, {})
+            width = max(cells, default=0)
+            self.ws.append([cells.get(column) for column in range(1, width + 1)])
+            self.next_row += 1
+
+
+def streaming_workbook(title="Sheet"):
+    """Returns a write-only workbook and a StreamingSheet over its only worksheet."""
+    wb = Workbook(write_only=True)
+    return wb, StreamingSheet(wb.create_sheet(title))
@@ -0,0 +1,120 @@
+"""
+Shared openpyxl style objects for the Excel writers.
+
+STYLES hands out one Font, Border, Alignment or PatternFill per distinct set of
+arguments and reuses it for every cell, sheet and workbook that asks again, instead
+of each writer building fresh style objects cell by cell. Ranking gradients are
+built the same way: one palette of fills per (total, scheme, opacity).
+
+openpyxl is only imported when the first style is built, so importing this module
+doesn't slow down application startup.
+"""
+
+# Gradient colour stops from best to worst, and the opacity each is blended at over white
+GRADIENT_SCHEMES = {
+    'normal': ((
+        (144, 238, 144),  # Light green
+        (255, 230, 102),  # Warm yellow
+        (255, 165, 0),    # Orange
+        (255, 99, 71),    # Tomato red
+        (255, 64, 64)     # Bright red
+    ), 0.5),
+    'acceleration': ((
+        (135, 206, 250),  # Light blue
+        (100, 149, 237),  # Cornflower blue
+        (65, 105, 225),   # Royal blue
+        (0, 0, 205),      # Medium blue
+        (0, 0, 139)       # Dark blue
+    ), 0.6),
+    'classic': ((
+        (0, 128, 0),      # Dark green
+        (139, 0, 0)       # Dark red
+    ), 1.0),
+}
+
+
+def openpyxl_styles():
+    import openpyxl.styles
+    return openpyxl.styles
+
+
+def blend_hex(color, opacity):
+    """Blends an RGB color over white and returns it as a hex string."""
+    r, g, b = (int(channel * opacity + 255 * (1 - opacity)) for channel in color)
+    return f"{r:02x}{g:02x}{b:02x}".upper()
+
+
+def gradient_colors(total, stops, opacity):
+    """Hex colors for positions 0..total-1 spread evenly across the stops."""
+    if total <= 1:
+        return [blend_hex(stops[0], opacity)]
+
+    num_segments = len(stops) - 1
+    segment_length = 1.0 / num_segments
+    colors = []
+    for index in range(total):
+        position = index / (total - 1)
+        segment_index = min(int(position / segment_length), num_segments - 1)
+        segment_position = (position - (segment_index * segment_length)) / segment_length
+
+        color1 = stops[segment_index]
+        color2 = stops[segment_index + 1]
+        color = tuple(int(c1 + (c2 - c1) * segment_position) for c1, c2 in zip(color1, color2))
+        colors.append(blend_hex(color, opacity))
+    return colors
+
+
+class StyleRegistry:
+    def __init__(self):
+        self.cache = {}
+
+    def intern(self, kind, factory, key):
+        style = self.cache.get((kind, key))
+        if style is None:
+            style = self.cache[(kind, key)] = factory()
+        return style
+
+    def font(self, **kwargs):
+        return self.intern('font', lambda: openpyxl_styles().Font(**kwargs), tuple(sorted(kwargs.items())))
+
+    def alignment(self, **kwargs):
+        return self.intern('alignment', lambda: openpyxl_styles().Alignment(**kwargs), tuple(sorted(kwargs.items())))
+
+    def box(self, style):
+        """Border with the same side style on all four sides."""
+        def build():
+            styles = openpyxl_styles()
+            return styles.Border(
+                left=styles.Side(style=style),
+                right=styles.Side(style=style),
+                top=styles.Side(style=style),
+                bottom=styles.Side(style=style)
+            )
+        return self.intern('box', build, style)
+
+    def bottom(self, style):
+        """Border with only a bottom side."""
+        return self.intern('bottom', lambda: openpyxl_styles().Border(bottom=openpyxl_styles().Side(style=style)), style)
+
+    def fill(self, color):
+        """Solid fill of a hex RGB color."""
+        return self.intern('fill', lambda: openpyxl_styles().PatternFill(start_color=color, end_color=color, fill_type='solid'), color)
+
+    def gradient(self, total, scheme='normal', opacity=None):
+        """
+        Fills for ranks 1..total of one column, best first. Built once per (total, scheme, opacity);
+        opacity defaults to the scheme's own.
+        """
+        stops, default_opacity = GRADIENT_SCHEMES[scheme]
+        if opacity is None:
+            opacity = default_opacity
+        return self.intern('gradient', lambda: tuple(
+            self.fill(color) for color in gradient_colors(total, stops, opacity)
+        ), (total, scheme, opacity))
+
+    def gradient_fill(self, index, total, scheme='normal', opacity=None):
+        palette = self.gradient(total, scheme, opacity)
+        return palette[min(index, len(palette) - 1)]
+
+
+STYLES = StyleRegistry()
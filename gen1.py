@@ -1,21 +1,39 @@
 import os
+import copy
 import json
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from tkinter.ttk import Combobox
-from datetime import datetime
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, PatternFill
-from openpyxl.utils import get_column_letter
-from openpyxl.styles import Border, Side  # Add to existing imports
-from openpyxl.chart import LineChart, Reference
-from openpyxl.chart.marker import Marker
+from background_task import BackgroundTask, Field
+from brower_parser import index_sessions
+from excel_styles import STYLES
+from hill_index import HillIndex
+from live_window import LiveWindow
+from log_window import LogWindow
+from app_log import get_logger
+from name_index import NameIndex
+from profiling import Profiler
+from storage import RecentJournal, StateWriter, data_path
+from time_ticks import MIN_VALID_TIME, TICKS_PER_SECOND, format_ticks, parse_ticks, to_seconds
+from ui_scheduler import UIScheduler, update_listbox
+from timing_session import TimingSession, load_timing_table
+from timing_stats import Ranking
+
+log = get_logger('app')
+parse_log = get_logger('parse')
+export_log = get_logger('export')
 
 class TimingSystemApp:
     def __init__(self, root):
         # Initialization and GUI setup
         self.root = root
         self.root.title("Timing System Data Formatter")
+        self.startup_profile = Profiler("Startup")
+        self.profiler = self.startup_profile  # Spans of the job in progress
+        self.last_export_profile = None
+        self.timing_report_window = None
+        self.log_window = None
+        self.live_window = None
 
         # Data structures
         self.selected_file = None
@@ -28,9 +46,11 @@ class TimingSystemApp:
         self.name_entry_width = 0  # Will store the width of the entry
         self.animation_height = 0  # Current animation height
         self.target_height = 0     # Target height for animation
-        self.animation_speed = 2   # Pixels per frame
-        self.is_animating = False
+        self.animation_speed = 4   # Pixels per frame
         self.line_height = 20  # Default line height - will be updated after widget creation
+        self.scheduler = UIScheduler(self.root)  # One timer for animations and debounced refreshes
+        self.state_writer = StateWriter(self.root, on_error=self.on_save_error)  # Batched saves of rosters and settings
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         self.snow_condition_var = tk.StringVar()
         self.sky_condition_var = tk.StringVar()
         self.precipitation_var = tk.StringVar()
@@ -40,10 +60,10 @@ class TimingSystemApp:
         self.session_var = tk.StringVar()
         self.outlier_threshold = 2  # Number of standard deviations for outlier detection
         # Hill-related attributes
-        self.recent_hills = []
+        self.hill_index = HillIndex()
+        self.hills_journal = RecentJournal(data_path("recent_hills.txt"))
         self.hill_animation_height = 0
         self.hill_target_height = 0
-        self.hill_is_animating = False
 
 
         # Version and author
@@ -57,10 +77,17 @@ class TimingSystemApp:
             "SQAF": "SQAF"
         }
         self.default_hill = ""
-        self.load_settings()
+        with self.startup_profile.span('load_settings'):
+            self.load_settings()
         self.selected_file = None
+        self.sessions = []          # SessionSpans of selected_file; exports can hold several sessions
+        self.sessions_key = None    # file_key of selected_file when it was indexed
+        self.session_span = None    # The session of selected_file being reformatted
+        self.timing_session = None  # Parsed data for selected_file, reused across exports
         self.athletes = {"SQAH": [], "SQAF": [], "OTHER": []}
         self.temp_guests = []
+        self.team_bib_index = {}   # bib -> {team: athlete}
+        self.guest_bib_index = {}  # bib -> guest
         self.current_team = "SQAH"
         # In the __init__ method, add these attributes
         self.top_buttons_frame = tk.Frame(self.root)
@@ -76,18 +103,41 @@ class TimingSystemApp:
         )
         self.settings_button.pack(side=tk.RIGHT)
 
+        self.timing_button = tk.Button(
+            self.top_buttons_frame,
+            text="T",
+            width=2,
+            height=1,
+            command=self.toggle_timing_report,
+            font=("Arial", 10, "bold")
+        )
+        self.timing_button.pack(side=tk.RIGHT, padx=(0, 5))
+
+        self.log_button = tk.Button(
+            self.top_buttons_frame,
+            text="L",
+            width=2,
+            height=1,
+            command=self.toggle_log_window,
+            font=("Arial", 10, "bold")
+        )
+        self.log_button.pack(side=tk.RIGHT, padx=(0, 5))
 
-        # Recent names memory (max 2000 names)
-        self.recent_names = []
+
+        # Recent names memory (max 2000 names), indexed for autocomplete
+        self.name_index = NameIndex()
+        self.names_journal = RecentJournal(data_path("recent_names.txt"))
         
-        # Initialize data
-        self.load_recent_names()
-        self.load_recent_hills()
-        self.load_athletes_from_json()
+        # Initialize data; recent names and hills load once the window is up
+        self.root.after_idle(self.load_recent_names)
+        self.root.after_idle(self.load_recent_hills)
+        with self.startup_profile.span('load_athletes_from_json'):
+            self.load_athletes_from_json()
 
         # Build GUI
-        self.build_gui()
-        self.apply_settings_to_gui()
+        with self.startup_profile.span('build_gui'):
+            self.build_gui()
+            self.apply_settings_to_gui()
         # Set the default team and bindings
         self.set_team("SQAH")
         self.athlete_name_entry.bind('<KeyRelease>', self.autocomplete_athlete_name)
@@ -117,6 +167,10 @@ class TimingSystemApp:
         self.file_label = tk.Label(self.button_label_border_frame, text="No file selected", anchor="w", width=40)
         self.file_label.pack(side=tk.LEFT, padx=5, pady=5)
 
+        # Live standings while Brower is still writing the file
+        self.live_button = tk.Button(self.button_label_border_frame, text="Live", command=self.toggle_live_window)
+        self.live_button.pack(side=tk.LEFT, padx=5, pady=5)
+
         # Training Parameters Section
         self.training_parameters_frame = tk.Frame(self.root, bd=4, relief="solid", padx=50, pady=10)
         self.training_parameters_frame.grid(row=1, column=0, pady=(72, 10), sticky="n")
@@ -138,6 +192,12 @@ class TimingSystemApp:
         )
         self.reformat_button.pack(padx=20, pady=10)
 
+        # Export progress, shown while the workbook is built in the background
+        self.export_task = None
+        self.export_status_var = tk.StringVar()
+        self.export_status_label = tk.Label(self.reformat_frame, textvariable=self.export_status_var, font=("Arial", 10))
+        self.export_status_label.pack()
+
         # Add a new frame at the bottom for version and author info
         self.bottom_frame = tk.Frame(self.root)
         self.bottom_frame.grid(row=999, column=0, columnspan=3, sticky="ew", pady=(10,5))
@@ -320,6 +380,15 @@ class TimingSystemApp:
         self.session_entry = tk.Entry(self.file_details_frame, textvariable=self.session_var, width=20, state='readonly')
         self.session_entry.grid(row=2, column=1, padx=5, pady=5, sticky='w')
 
+        # Session picker, only shown for files holding more than one session
+        self.session_picker_label = tk.Label(self.file_details_frame, text="Session:")
+        self.session_picker_label.grid(row=3, column=0, padx=5, pady=5, sticky='e')
+        self.session_picker = Combobox(self.file_details_frame, width=28, state='readonly')
+        self.session_picker.grid(row=3, column=1, padx=5, pady=5, sticky='w')
+        self.session_picker.bind('<<ComboboxSelected>>', lambda e: self.select_session(self.session_picker.current()))
+        self.session_picker_label.grid_remove()
+        self.session_picker.grid_remove()
+
 
     def save_current_state(self):
         """Saves the current state of athletes and settings."""
@@ -328,6 +397,7 @@ class TimingSystemApp:
             self.save_recent_names()
             self.save_recent_hills()
             self.save_settings()
+            self.state_writer.flush_now()
             messagebox.showinfo("Success", "Current state saved successfully!")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save current state: {str(e)}")
@@ -341,15 +411,23 @@ class TimingSystemApp:
             "team_names": self.team_names,
             "default_hill": self.default_hill
         }
-        try:
-            with open("settings.json", "w", encoding='utf-8') as f:
-                json.dump(settings, f, indent=4, ensure_ascii=False)
+        self.state_writer.mark_dirty(data_path("settings.json"), lambda: settings)
                 
-            # Update UI elements
-            self.update_team_buttons()
+        # Update UI elements
+        self.update_team_buttons()
+
+    def on_save_error(self, error):
+        """Reports a background save that failed."""
+        log.error("Error saving state: %s", error)
+        messagebox.showerror("Error", f"Failed to save data: {str(error)}")
+
+    def on_close(self):
+        """Writes any pending state before the window closes."""
+        try:
+            self.state_writer.flush_now()
         except Exception as e:
-            print(f"Error saving settings: {str(e)}")  # Add debug print
-            messagebox.showerror("Error", f"Failed to save settings: {str(e)}")
+            messagebox.showerror("Error", f"Failed to save data: {str(e)}")
+        self.root.destroy()
 
     def update_team_buttons(self):
         """Updates the team button text based on current settings."""
@@ -369,7 +447,7 @@ class TimingSystemApp:
     def load_settings(self):
         """Loads settings from JSON file."""
         try:
-            with open("settings.json", "r", encoding='utf-8') as f:
+            with open(data_path("settings.json"), "r", encoding='utf-8') as f:
                 settings = json.load(f)
                 
                 # Load each setting with proper default fallback
@@ -378,9 +456,9 @@ class TimingSystemApp:
                 self.default_hill = settings.get("default_hill", "")
                 
         except FileNotFoundError:
-            print("No settings file found, using defaults")
+            log.info("No settings file found, using defaults")
         except Exception as e:
-            print(f"Error loading settings: {str(e)}")
+            log.error("Error loading settings: %s", e)
     def open_settings(self):
         """Opens the settings window."""
         settings_window = tk.Toplevel(self.root)
@@ -440,15 +518,12 @@ class TimingSystemApp:
         hill_listbox.pack(fill="x", pady=5)
         hill_listbox.pack_forget()  # Hide initially
         
-        def show_hill_suggestions(*args):
+        def show_hill_suggestions():
             input_text = hill_var.get().lower()
             if input_text:
-                suggestions = [hill for hill in self.recent_hills 
-                            if hill.lower().startswith(input_text)][:3]
+                suggestions = self.get_hill_name_matches(input_text)
                 if suggestions:
-                    hill_listbox.delete(0, tk.END)
-                    for hill in suggestions:
-                        hill_listbox.insert(tk.END, hill)
+                    update_listbox(hill_listbox, suggestions)
                     hill_listbox.pack(fill="x", pady=5)
                 else:
                     hill_listbox.pack_forget()
@@ -461,7 +536,7 @@ class TimingSystemApp:
                 hill_var.set(selected)
                 hill_listbox.pack_forget()
         
-        hill_entry.bind('<KeyRelease>', show_hill_suggestions)
+        hill_entry.bind('<KeyRelease>', lambda event: self.scheduler.debounce('settings_hill', show_hill_suggestions))
         hill_listbox.bind('<<ListboxSelect>>', use_suggestion)
         
         # Null button at the bottom of hill_frame
@@ -526,6 +601,7 @@ class TimingSystemApp:
             
             # Parse the file and extract details
             file_details = self.parse_csv_file(file_path)
+            self.update_session_picker()
             if file_details:
                 # Update UI elements with the parsed details
                 self.date_var.set(file_details['date'] if file_details['date'] else "")
@@ -541,44 +617,58 @@ class TimingSystemApp:
                 self.session_var.set("")
                 messagebox.showwarning("Warning", "Could not read file details. Please check the file format.")
 
+    def update_session_picker(self):
+        """Lists the sessions of the selected file in the picker, hiding it when there is only one."""
+        if len(self.sessions) > 1:
+            self.session_picker.config(values=[
+                f"#{span.session} {span.date} {span.time}".strip() for span in self.sessions
+            ])
+            self.session_picker.current(self.sessions.index(self.session_span))
+            self.session_picker_label.grid()
+            self.session_picker.grid()
+        else:
+            self.session_picker_label.grid_remove()
+            self.session_picker.grid_remove()
+
+    def select_session(self, index):
+        """Switches to another session of the selected file and shows its details."""
+        if not 0 <= index < len(self.sessions):
+            return
+        self.session_span = self.sessions[index]
+        self.date_var.set(self.session_span.date)
+        self.time_var.set(self.session_span.time)
+        self.session_var.set(self.session_span.session)
+
     # Athlete Data Management Methods
     def add_athlete_to_memory(self, athlete_name):
         """Adds an athlete name to recent names memory, ensuring a maximum of 2000 entries."""
-        if athlete_name in self.recent_names:
-            self.recent_names.remove(athlete_name)
-        self.recent_names.append(athlete_name)
-        if len(self.recent_names) > 2000:
-            self.recent_names = self.recent_names[-2000:]  # Keep the last 2000 names
-        self.save_recent_names()
+        self.name_index.add(athlete_name)
+        self.names_journal.append(athlete_name, self.name_index.names)
 
     def save_recent_names(self):
-        """Saves the list of recent names to a text file."""
-        with open("recent_names.txt", "w", encoding='utf-8') as f:
-            for name in self.recent_names:
-                f.write(name + '\n')
+        """Compacts the recent names journal down to the current list, one name per line."""
+        self.names_journal.compact(self.name_index.names())
 
     def load_recent_names(self):
-        """Loads the list of recent names from a text file."""
-        try:
-            with open("recent_names.txt", "r", encoding='utf-8') as f:
-                self.recent_names = [line.strip() for line in f.readlines()]
-        except FileNotFoundError:
-            self.recent_names = []
+        """Loads the recent names journal into the autocomplete index, keeping names added since startup."""
+        with self.startup_profile.span('load_recent_names') as span:
+            self.name_index.load(self.names_journal.read() + self.name_index.names())
+            span['rows'] = len(self.name_index)
 
     def save_athletes_to_json(self):
-        """Saves the athlete data to a JSON file."""
-        with open("athletes_data.json", "w") as f:
-            json.dump(self.athletes, f, indent=4)
+        """Marks the athlete data for saving; rapid edits are written to the JSON file once."""
+        self.state_writer.mark_dirty(data_path("athletes_data.json"), lambda: self.athletes)
 
     def load_athletes_from_json(self):
         """Loads the athlete data from a JSON file."""
         try:
-            with open("athletes_data.json", "r") as f:
+            with open(data_path("athletes_data.json"), "r", encoding='utf-8') as f:
                 self.athletes = json.load(f)
         except FileNotFoundError:
             self.athletes = {"SQAH": [], "SQAF": [], "OTHER": []}
         self.athletes["OTHER"] = []
         self.temp_guests = []
+        self.rebuild_bib_index()
 
     # GUI Update Methods
     def update_athlete_listbox(self):
@@ -616,29 +706,36 @@ class TimingSystemApp:
    
     # Event Handlers and Animations
     def animate_listbox(self):
-        """Handles the animation for the autocomplete listbox."""
-        if self.is_animating:
-            current_height = self.animation_height
-            target_height = self.target_height
-
-            if current_height < target_height:
-                # Opening animation
-                self.animation_height = min(current_height + self.animation_speed, target_height)
-                self.autocomplete_listbox.configure(height=int(self.animation_height / self.line_height))
-            elif current_height > target_height:
-                # Closing animation
-                self.animation_height = max(current_height - self.animation_speed, target_height)
-                self.autocomplete_listbox.configure(height=int(self.animation_height / self.line_height))
-
-            # Continue animation if not reached target
-            if self.animation_height != target_height:
-                self.root.after(10, self.animate_listbox)
-            else:
-                self.is_animating = False
-                if target_height == 0:
-                    self.autocomplete_listbox.grid_remove()
+        """
+        One frame of the autocomplete listbox animation, run by the shared scheduler.
+        Returns True while the listbox hasn't reached its target height.
+        """
+        current_height = self.animation_height
+        target_height = self.target_height
+
+        if current_height < target_height:
+            # Opening animation
+            self.animation_height = min(current_height + self.animation_speed, target_height)
+        elif current_height > target_height:
+            # Closing animation
+            self.animation_height = max(current_height - self.animation_speed, target_height)
+
+        # Only touch the widget when the visible number of lines changes
+        lines = int(self.animation_height / self.line_height)
+        if lines != int(current_height / self.line_height):
+            self.autocomplete_listbox.configure(height=lines)
+
+        if self.animation_height != target_height:
+            return True
+        if target_height == 0:
+            self.autocomplete_listbox.grid_remove()
+        return False
 
     def autocomplete_athlete_name(self, event):
+        """Refreshes the athlete name suggestions once typing pauses."""
+        self.scheduler.debounce('athlete_name', self.refresh_athlete_suggestions)
+
+    def refresh_athlete_suggestions(self):
         """Provides autocomplete suggestions for athlete names based on recent entries."""
         input_text = self.athlete_name_entry.get().lower()
 
@@ -652,23 +749,17 @@ class TimingSystemApp:
         if not input_text:
             # Animate closing if input is empty
             self.target_height = 0
-            if not self.is_animating:
-                self.is_animating = True
-                self.animate_listbox()
+            self.scheduler.animate('athlete_suggestions', self.animate_listbox)
             return
 
-        # Filter recent names that start with the input text
-        suggestions = [name for name in reversed(self.recent_names) if name.lower().startswith(input_text)]
-        suggestions = suggestions[:2]  # Limit to 2 suggestions
+        # Most recent names with a word starting with the input text, ignoring accents
+        suggestions = self.name_index.search(input_text, limit=2)
 
         # Update the Listbox with suggestions
         if suggestions:
-            self.autocomplete_listbox.delete(0, tk.END)
-            for suggestion in suggestions:
-                self.autocomplete_listbox.insert(tk.END, suggestion)
-
-            # Update the suggestion box width
-            self.update_suggestion_box_width()
+            if update_listbox(self.autocomplete_listbox, suggestions):
+                # Update the suggestion box width
+                self.update_suggestion_box_width()
 
             # Calculate target height based on number of suggestions
             num_suggestions = len(suggestions)
@@ -679,18 +770,12 @@ class TimingSystemApp:
                 self.autocomplete_listbox.grid(row=2, column=1, padx=(0, 5), pady=(0, 5), sticky="w")
                 self.animation_height = 0
 
-            # Start animation if not already animating
-            if not self.is_animating:
-                self.is_animating = True
-                self.animate_listbox()
-
+            self.scheduler.animate('athlete_suggestions', self.animate_listbox)
             self.autocomplete_listbox.lift()
         else:
             # Animate closing if no suggestions
             self.target_height = 0
-            if not self.is_animating:
-                self.is_animating = True
-                self.animate_listbox()
+            self.scheduler.animate('athlete_suggestions', self.animate_listbox)
 
     def on_suggestion_select(self, event):
         """Handles the selection of a suggestion from the autocomplete listbox."""
@@ -701,9 +786,7 @@ class TimingSystemApp:
 
             # Animate closing
             self.target_height = 0
-            if not self.is_animating:
-                self.is_animating = True
-                self.animate_listbox()
+            self.scheduler.animate('athlete_suggestions', self.animate_listbox)
 
     # Athlete Management Methods
     def add_athlete(self):
@@ -719,20 +802,19 @@ class TimingSystemApp:
             bib_number = int(bib_number)  # Ensure bib_number is an integer
 
             # Check for duplicate bib in the current team's athlete list
-            for athlete in self.athletes[self.current_team]:
-                if int(athlete['bib']) == bib_number:
-                    messagebox.showwarning("Duplicate Bib", "This bib number is already assigned to an athlete in this team.")
-                    return
+            if self.current_team in self.team_bib_index.get(bib_number, {}):
+                messagebox.showwarning("Duplicate Bib", "This bib number is already assigned to an athlete in this team.")
+                return
 
             # Check for duplicate bib in the temporary guest list
-            for guest in self.temp_guests:
-                if int(guest['bib']) == bib_number:
-                    messagebox.showwarning("Duplicate Bib", "This bib number is already assigned to a temporary guest.")
-                    return
+            if bib_number in self.guest_bib_index:
+                messagebox.showwarning("Duplicate Bib", "This bib number is already assigned to a temporary guest.")
+                return
 
             # Add the new athlete if no duplicates found
             new_athlete = {"name": athlete_name, "bib": bib_number}
             self.athletes[self.current_team].append(new_athlete)
+            self.index_athlete(new_athlete, self.current_team)
             self.save_athletes_to_json()
             self.update_athlete_listbox()
 
@@ -758,20 +840,19 @@ class TimingSystemApp:
             bib_number = int(bib_number)  # Ensure bib_number is an integer
 
             # Check for duplicate bib in the current team's athlete list
-            for athlete in self.athletes[self.current_team]:
-                if int(athlete['bib']) == bib_number:
-                    messagebox.showwarning("Duplicate Bib", "This bib number is already assigned to an athlete in this team.")
-                    return
+            if self.current_team in self.team_bib_index.get(bib_number, {}):
+                messagebox.showwarning("Duplicate Bib", "This bib number is already assigned to an athlete in this team.")
+                return
 
             # Check for duplicate bib in the temporary guest list
-            for guest in self.temp_guests:
-                if int(guest['bib']) == bib_number:
-                    messagebox.showwarning("Duplicate Bib", "This bib number is already assigned to a temporary guest.")
-                    return
+            if bib_number in self.guest_bib_index:
+                messagebox.showwarning("Duplicate Bib", "This bib number is already assigned to a temporary guest.")
+                return
 
             # Add the new guest if no duplicates found
             new_guest = {"name": guest_name, "bib": bib_number}
             self.temp_guests.append(new_guest)
+            self.index_guest(new_guest)
             self.update_guest_listbox()
 
             # Add guest name to recent names
@@ -790,12 +871,13 @@ class TimingSystemApp:
 
         if selected_team_athlete and self.current_team:
             if messagebox.askyesno("Confirm Deletion", "Are you sure you want to remove this athlete?"):
-                del self.athletes[self.current_team][selected_team_athlete[0]]
+                removed = self.athletes[self.current_team].pop(selected_team_athlete[0])
+                self.unindex_athlete(removed, self.current_team)
                 self.save_athletes_to_json()  # Save changes to JSON
                 self.update_athlete_listbox()
         elif selected_guest:
             if messagebox.askyesno("Confirm Deletion", "Are you sure you want to remove this guest?"):
-                del self.temp_guests[selected_guest[0]]
+                self.unindex_guest(self.temp_guests.pop(selected_guest[0]))
                 self.update_guest_listbox()
         else:
             messagebox.showwarning("Selection Error", "No athlete or guest selected to remove.")
@@ -808,7 +890,7 @@ class TimingSystemApp:
             guest_bib = int(guest["bib"])
 
             # Check for duplicate bibs in the new team's athlete list
-            duplicate_found = any(int(athlete['bib']) == guest_bib for athlete in self.athletes[new_team])
+            duplicate_found = new_team in self.team_bib_index.get(guest_bib, {})
 
             # If a duplicate is found, mark the guest as inactive
             if duplicate_found:
@@ -846,32 +928,25 @@ class TimingSystemApp:
     # Add these methods to the TimingSystemApp class:
 
     def add_hill_to_memory(self, hill_name):
-        """Adds a hill name to recent hills memory, ensuring a maximum of 2000 entries."""
-        if hill_name in self.recent_hills:
-            self.recent_hills.remove(hill_name)
-        self.recent_hills.append(hill_name)
-        if len(self.recent_hills) > 2000:
-            self.recent_hills = self.recent_hills[-2000:]  # Keep the last 2000 names
-        self.save_recent_hills()
+        """Adds a hill name to recent hills memory, ensuring a maximum of 10000 entries."""
+        self.hill_index.add(hill_name)
+        self.hills_journal.append(hill_name, self.hill_index.hills)
 
     def save_recent_hills(self):
-        """Saves the list of recent hills to a text file."""
-        with open("recent_hills.txt", "w", encoding='utf-8') as f:
-            for name in self.recent_hills:
-                f.write(name + '\n')
+        """Compacts the recent hills journal down to the current list, one hill per line."""
+        self.hills_journal.compact(self.hill_index.hills())
 
     def load_recent_hills(self):
-        """Loads the list of recent hills from a text file."""
-        try:
-            with open("recent_hills.txt", "r", encoding='utf-8') as f:
-                self.recent_hills = [line.strip() for line in f.readlines()]
-        except FileNotFoundError:
-            self.recent_hills = []
+        """Loads the recent hills journal into the hill index, keeping hills added since startup."""
+        with self.startup_profile.span('load_recent_hills') as span:
+            self.hill_index.load(self.hills_journal.read() + self.hill_index.hills())
+            span['rows'] = len(self.hill_index)
 
     def get_hill_name_matches(self, input_text):
         """
         Returns matching hill names based on various search criteria.
-        Handles partial matches after common prefixes and within compound names.
+        Handles partial matches after common prefixes and within compound names,
+        ignoring accents, hyphens and apostrophes. See hill_index for the ranking.
         
         Args:
             input_text (str): The search text
@@ -879,55 +954,15 @@ class TimingSystemApp:
         Returns:
             list: Matching hill names
         """
-        input_text = input_text.lower().strip()
-        matches = set()  # Using set to avoid duplicates
-        
-        for hill in self.recent_hills:
-            hill_lower = hill.lower()
-            
-            # Direct start match
-            if hill_lower.startswith(input_text):
-                matches.add(hill)
-                
-            # Split hill name into parts and check each part
-            parts = hill_lower.replace('-', ' ').split()
-            
-            # Handle common prefixes like "Mont-" or "Mont "
-            if len(parts) > 1:
-                # If the hill starts with "Mont" or similar, check the part after it
-                if parts[0] in ['mont']:
-                    remaining_name = ' '.join(parts[1:])
-                    if remaining_name.startswith(input_text):
-                        matches.add(hill)
-                    
-                    # Also check individual parts after "Mont"
-                    for part in parts[1:]:
-                        if part.startswith(input_text):
-                            matches.add(hill)
-            
-            # Check each part individually
-            for part in parts:
-                if part.startswith(input_text):
-                    matches.add(hill)
-        
-        # Convert set back to list and sort by relevance
-        matches_list = list(matches)
-        matches_list.sort(key=lambda x: (
-            # Prioritize exact matches
-            not x.lower().startswith(input_text),
-            # Then prioritize matches after "Mont-" or "Mont "
-            not any(part.lower().startswith(input_text) 
-                for part in x.lower().replace('-', ' ').split()[1:] 
-                if x.lower().startswith('mont')),
-            # Finally sort alphabetically
-            x.lower()
-        ))
-        
-        return matches_list[:3]  # Limit to top 3 matches
+        return self.hill_index.search(input_text, limit=3)
 
 
 
     def autocomplete_hill_name(self, event):
+        """Refreshes the hill suggestions once typing pauses."""
+        self.scheduler.debounce('hill_name', self.refresh_hill_suggestions)
+
+    def refresh_hill_suggestions(self):
         """
         Enhanced autocomplete for hill names with improved matching logic.
         """
@@ -936,9 +971,7 @@ class TimingSystemApp:
         if not input_text:
             # Animate closing if input is empty
             self.hill_target_height = 0
-            if not self.hill_is_animating:
-                self.hill_is_animating = True
-                self.animate_hill_listbox()
+            self.scheduler.animate('hill_suggestions', self.animate_hill_listbox)
             return
         
         # Get matches using the new matching function
@@ -946,9 +979,7 @@ class TimingSystemApp:
         
         # Update the Listbox with suggestions
         if suggestions:
-            self.hill_autocomplete_listbox.delete(0, tk.END)
-            for suggestion in suggestions:
-                self.hill_autocomplete_listbox.insert(tk.END, suggestion)
+            update_listbox(self.hill_autocomplete_listbox, suggestions)
             
             # Calculate target height based on number of suggestions
             self.hill_target_height = self.line_height * len(suggestions)
@@ -958,41 +989,38 @@ class TimingSystemApp:
                 self.hill_autocomplete_listbox.grid()
                 self.hill_animation_height = 0
             
-            # Start animation if not already animating
-            if not self.hill_is_animating:
-                self.hill_is_animating = True
-                self.animate_hill_listbox()
-            
+            self.scheduler.animate('hill_suggestions', self.animate_hill_listbox)
             self.hill_autocomplete_listbox.lift()
         else:
             # Animate closing if no suggestions
             self.hill_target_height = 0
-            if not self.hill_is_animating:
-                self.hill_is_animating = True
-                self.animate_hill_listbox()
+            self.scheduler.animate('hill_suggestions', self.animate_hill_listbox)
 
     def animate_hill_listbox(self):
-        """Handles the animation for the hill autocomplete listbox."""
-        if self.hill_is_animating:
-            current_height = self.hill_animation_height
-            target_height = self.hill_target_height
-
-            if current_height < target_height:
-                # Opening animation
-                self.hill_animation_height = min(current_height + self.animation_speed, target_height)
-                self.hill_autocomplete_listbox.configure(height=int(self.hill_animation_height / self.line_height))
-            elif current_height > target_height:
-                # Closing animation
-                self.hill_animation_height = max(current_height - self.animation_speed, target_height)
-                self.hill_autocomplete_listbox.configure(height=int(self.hill_animation_height / self.line_height))
-
-            # Continue animation if not reached target
-            if self.hill_animation_height != target_height:
-                self.root.after(10, self.animate_hill_listbox)
-            else:
-                self.hill_is_animating = False
-                if target_height == 0:
-                    self.hill_autocomplete_listbox.grid_remove()
+        """
+        One frame of the hill autocomplete listbox animation, run by the shared scheduler.
+        Returns True while the listbox hasn't reached its target height.
+        """
+        current_height = self.hill_animation_height
+        target_height = self.hill_target_height
+
+        if current_height < target_height:
+            # Opening animation
+            self.hill_animation_height = min(current_height + self.animation_speed, target_height)
+        elif current_height > target_height:
+            # Closing animation
+            self.hill_animation_height = max(current_height - self.animation_speed, target_height)
+
+        # Only touch the widget when the visible number of lines changes
+        lines = int(self.hill_animation_height / self.line_height)
+        if lines != int(current_height / self.line_height):
+            self.hill_autocomplete_listbox.configure(height=lines)
+
+        if self.hill_animation_height != target_height:
+            return True
+        if target_height == 0:
+            self.hill_autocomplete_listbox.grid_remove()
+        return False
 
     def on_hill_suggestion_select(self, event):
         """Handles the selection of a suggestion from the hill autocomplete listbox."""
@@ -1004,231 +1032,215 @@ class TimingSystemApp:
 
             # Animate closing
             self.hill_target_height = 0
-            if not self.hill_is_animating:
-                self.hill_is_animating = True
-                self.animate_hill_listbox()
+            self.scheduler.animate('hill_suggestions', self.animate_hill_listbox)
+
+    # Bib Index Methods
+    def rebuild_bib_index(self):
+        """Rebuilds the bib lookup tables from the team rosters and temporary guests."""
+        self.team_bib_index = {}
+        self.guest_bib_index = {}
+        for team, athletes in self.athletes.items():
+            for athlete in athletes:
+                self.index_athlete(athlete, team)
+        for guest in self.temp_guests:
+            self.index_guest(guest)
+
+    def index_athlete(self, athlete, team):
+        # The first athlete listed with a bib keeps it, like the old roster scan
+        self.team_bib_index.setdefault(int(athlete['bib']), {}).setdefault(team, athlete)
+
+    def unindex_athlete(self, athlete, team):
+        bib = int(athlete['bib'])
+        teams = self.team_bib_index.get(bib, {})
+        if teams.get(team) is athlete:
+            del teams[team]
+            # Another athlete of the same team may share the bib in a hand-edited roster
+            for other in self.athletes.get(team, []):
+                if other is not athlete and int(other['bib']) == bib:
+                    teams[team] = other
+                    break
+            if not teams:
+                del self.team_bib_index[bib]
+
+    def index_guest(self, guest):
+        self.guest_bib_index.setdefault(int(guest['bib']), guest)
+
+    def unindex_guest(self, guest):
+        bib = int(guest['bib'])
+        if self.guest_bib_index.get(bib) is guest:
+            del self.guest_bib_index[bib]
+
+    def find_athlete_by_bib(self, bib_number, include_inactive_guests=False):
+        """
+        Returns the athlete or guest wearing a bib, or None.
+        The current team wins, then active guests, then the other teams in roster order.
+        Inactive guests (bib clash with the current team) are skipped unless asked for.
+        """
+        bib_number = int(bib_number)
+        teams = self.team_bib_index.get(bib_number)
+        if teams and self.current_team in teams:
+            return teams[self.current_team]
+
+        guest = self.guest_bib_index.get(bib_number)
+        if guest and (include_inactive_guests or not guest.get('inactive', False)):
+            return guest
+
+        if teams:
+            for team in self.athletes:
+                if team in teams:
+                    return teams[team]
+        return None
 
     def get_athlete_name(self, bib_number):
         """
         Given a bib number, returns the athlete's name from all teams' athletes or temp guests.
         """
-        bib_number = int(bib_number)
-        # Check in all teams
-        for team in self.athletes:
-            for athlete in self.athletes[team]:
-                if int(athlete['bib']) == bib_number:
-                    return athlete['name']
-        # Then, check in temp guests
-        for guest in self.temp_guests:
-            if int(guest['bib']) == bib_number and not guest.get('inactive', False):
-                return guest['name']
-        # If not found, return 'Unknown Athlete'
-        return 'Unknown Athlete'
+        athlete = self.find_athlete_by_bib(bib_number)
+        return athlete['name'] if athlete else 'Unknown Athlete'
 
     def parse_csv_file(self, file_path):
         """
         Parses the CSV file to extract session details.
-        Updated to handle the custom separator and add debug logging.
+        Indexes every session in the file without reading the rows, which are left to
+        parse_timing_data, and returns the details of the first one.
         """
         try:
-            with open(file_path, 'r') as file:
-                lines = file.readlines()
-                
-                # Initialize variables
-                session_num = ""
-                date_str = ""
-                time_str = ""
-                
-                print("Parsing file:", file_path)  # Debug logging
-                
-                # Parse the header section
-                for line in lines[:20]:  # Only check first 20 lines for headers
-                    line = line.strip()
-                    print("Processing line:", line)  # Debug logging
-                    
-                    # Try both '>' and ':' as separators
-                    if '>' in line:
-                        parts = line.split('>')
-                    elif ':' in line:
-                        parts = line.split(':')
-                    else:
-                        continue
-                    
-                    # Clean up parts
-                    parts = [p.strip() for p in parts]
-                    
-                    if len(parts) < 2:
-                        continue
-                        
-                    # Check for each field
-                    if "Session" in parts[0]:
-                        session_num = parts[1].strip('#').strip()
-                        print("Found session:", session_num)  # Debug logging
-                    elif "Date" == parts[0]:
-                        date_str = parts[1].strip()
-                        print("Found date:", date_str)  # Debug logging
-                    elif "Time" == parts[0]:
-                        time_str = parts[1].strip()
-                        print("Found time:", time_str)  # Debug logging
-                    
-                # Convert date format if found
-                if date_str:
-                    try:
-                        # Parse the date (assuming mm/dd/yy format)
-                        date_obj = datetime.strptime(date_str, '%m/%d/%y')
-                        # Convert to dd/mm/yyyy format
-                        formatted_date = date_obj.strftime('%d/%m/%Y')
-                    except ValueError:
-                        print("Date parsing failed, using original:", date_str)  # Debug logging
-                        formatted_date = date_str
-                else:
-                    formatted_date = ""
-                
-                print("Final values:", {  # Debug logging
-                    'session': session_num,
-                    'date': formatted_date,
-                    'time': time_str
-                })
-                
-                return {
-                    'session': session_num,
-                    'date': formatted_date,
-                    'time': time_str
-                }
-                
+            parse_log.debug("Parsing file", extra={'fields': {'file': file_path}})
+            self.index_file_sessions(file_path)
+            if self.session_span is None:
+                return None
+            session_details = {
+                'session': self.session_span.session,
+                'date': self.session_span.date,
+                'time': self.session_span.time
+            }
+            parse_log.debug("Session details", extra={'fields': session_details})
+            return session_details
+
         except Exception as e:
-            print(f"Error reading file: {str(e)}")  # Debug logging
+            parse_log.error("Error reading file: %s", e, extra={'fields': {'file': file_path}})
             messagebox.showerror("Error", f"Error reading file: {str(e)}")
             return None
 
-    def parse_timing_data(self, file_path):
+    def index_file_sessions(self, file_path):
         """
-        Parses the CSV file to extract timing data, organized by runs.
-        Handles custom separator and header format.
+        Finds the sessions in file_path and picks the first one, or the one at the same
+        position as before when the same file is indexed again after it changed.
+        """
+        key = TimingSession.file_key(file_path)
+        same_file = self.sessions_key is not None and self.sessions_key[0] == key[0]
+        position = self.sessions.index(self.session_span) if same_file and self.session_span in self.sessions else 0
+        self.sessions_key = key
+        self.sessions = index_sessions(file_path)
+        self.session_span = self.sessions[min(position, len(self.sessions) - 1)] if self.sessions else None
+        if len(self.sessions) > 1:
+            parse_log.info("%s holds %d sessions", os.path.basename(file_path), len(self.sessions))
+
+    def current_session_span(self, file_path):
+        """The chosen session of file_path, re-indexing the file if it changed since it was indexed."""
+        if TimingSession.file_key(file_path) != self.sessions_key:
+            self.index_file_sessions(file_path)
+        return self.session_span
+
+    def load_timing_data(self, file_path, span=None):
+        """
+        Reads the timing data organized by runs, raising ValueError if the file has none.
+        Rows are streamed from the shared Brower parser into a columnar table.
         """
         timing_data = {}
-        header_found = False
-        column_indices = {}
-        
+
+        # Rows live in a columnar TimingTable; each entry is a view over one row
+        for entry in load_timing_table(file_path, span=span).entries():
+            timing_data.setdefault(entry['run'], []).append(entry)
+
+        # Sort data for each run
+        for run_number in timing_data:
+            timing_data[run_number] = self.sort_run_data(timing_data[run_number])
+
+        if not timing_data:
+            raise ValueError("No valid timing data found in the file.")
+
+        return timing_data
+
+    def parse_timing_data(self, file_path, span=None):
+        """
+        Parses the CSV file to extract timing data, organized by runs.
+        Shows an error dialog and returns None if the file can't be used.
+        """
         try:
-            with open(file_path, 'r') as file:
-                lines = file.readlines()
-                
-                # First determine the separator
-                separator = '>'  # Based on the sample file format
-                
-                for line in lines:
-                    line = line.strip()
-                    if not line:  # Skip empty lines
-                        continue
-                    
-                    # Look for the header line that contains both Bib# and Run#
-                    if not header_found and "Bib#" in line and "Run#" in line:
-                        header_found = True
-                        # Get column indices from header
-                        headers = line.split(separator)
-                        for i, header in enumerate(headers):
-                            header = header.lower().strip()
-                            if "bib" in header:
-                                column_indices['bib'] = i
-                            elif "run" in header:
-                                column_indices['run'] = i
-                            elif "split 1" in header:
-                                column_indices['split1'] = i
-                            elif "finish time" in header:
-                                column_indices['finish'] = i
-                            elif "status" in header:
-                                column_indices['status'] = i
-                        continue
-                    
-                    # Process data lines after header is found
-                    if header_found:
-                        data = line.split(separator)
-                        if len(data) <= 1:  # Skip empty lines
-                            continue
-                        
-                        try:
-                            # Get run number and clean it
-                            run_number = data[column_indices['run']].strip()
-                            if not run_number:  # Skip if run number is empty
-                                continue
-                            
-                            if run_number not in timing_data:
-                                timing_data[run_number] = []
-                            
-                            # For this format, Split 1 is the intermediate time
-                            # and Finish Time is the total time
-                            split1_time = data[column_indices['split1']].strip()
-                            status = data[column_indices.get('status', -1)].strip() if 'status' in column_indices else ''
-                            
-                            # Create entry for this run
-                            entry = {
-                                'bib': data[column_indices['bib']].strip(),
-                                'split1': self.parse_time(split1_time),
-                                'finish': self.parse_time(data[column_indices.get('finish', -1)].strip() if 'finish' in column_indices else ''),
-                                'status': status if status else '',
-                                'run': run_number
-                            }
-                            
-                            # Only add valid entries
-                            if entry['bib'] and entry['run']:
-                                timing_data[run_number].append(entry)
-                                
-                        except IndexError as e:
-                            print(f"Error processing line: {line}")
-                            print(f"Error details: {str(e)}")
-                            continue
-            
-            # Sort data for each run
-            for run_number in timing_data:
-                timing_data[run_number] = self.sort_run_data(timing_data[run_number])
-            
-            if not timing_data:
-                messagebox.showerror("Error", "No valid timing data found in the file.")
-                return None
-                
-            return timing_data
-            
+            return self.load_timing_data(file_path, span)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return None
         except Exception as e:
             messagebox.showerror("Error", f"Error parsing CSV file: {str(e)}")
             return None
 
+    def get_timing_session(self, file_path):
+        """
+        Returns the parsed and sorted data for file_path.
+        The session is built once and reused until the file's path, mtime or size changes
+        or another session of the file is picked.
+        """
+        span = self.current_session_span(file_path)
+        if self.timing_session is not None and self.timing_session.matches(file_path, span):
+            return self.timing_session
+
+        timing_data = self.parse_timing_data(file_path, span)
+        if not timing_data:
+            self.timing_session = None
+            return None
+
+        table = next(iter(timing_data.values()))[0].table
+        self.timing_session = TimingSession(TimingSession.file_key(file_path, span), timing_data, table)
+        return self.timing_session
+
     def parse_time(self, time_str):
         """
-        Parses a time string into a float value in seconds.
+        Parses a time string into integer ticks (see time_ticks).
         Returns None for invalid times or DNF/DSQ.
         """
-        if not time_str or not isinstance(time_str, str):
-            return None
-            
-        time_str = time_str.strip().upper()
-        if time_str in ['DNF', 'DSQ', '', 'DNS']:
-            return None
-            
-        try:
-            if ':' in time_str:
-                minutes, seconds = time_str.split(':')
-                return float(minutes) * 60 + float(seconds)
-            return float(time_str)
-        except (ValueError, TypeError):
-            return None
+        return parse_ticks(time_str)
 
-    def create_formatted_excel(self, output_path):
+    def create_formatted_excel(self, output_path, streaming=False):
         """
         Creates a formatted Excel file with the specified header layout and timing data.
         """
+        wb = self.build_formatted_workbook(streaming=streaming)
+        
+        try:
+            with self.profiler.span('save'):
+                wb.save(output_path)
+            return True
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to save Excel file: {str(e)}")
+            return False      
+
+    def build_formatted_workbook(self, progress=None, streaming=False):
+        """
+        Builds the formatted workbook from the current form values and selected file.
+        Kept apart from saving so the batch command line tool can reuse it.
+        progress(percent, message) is called between runs when given.
+        With streaming=True the sheet is write-only and each run is flushed once written,
+        which keeps memory flat for very large sessions.
+        """
+        from excel_stream import streaming_workbook
+        from openpyxl import Workbook
         # Create new workbook and get active sheet
-        wb = Workbook()
-        ws = wb.active
+        if streaming:
+            wb, ws = streaming_workbook()
+        else:
+            wb = Workbook()
+            ws = wb.active
         
         # Define fonts
         try:
-            title_font = Font(name='Avenir Next LT Pro', size=18, bold=True)
+            title_font = STYLES.font(name='Avenir Next LT Pro', size=18, bold=True)
         except:
-            title_font = Font(name='Arial', size=18, bold=True)
+            title_font = STYLES.font(name='Arial', size=18, bold=True)
         
-        normal_font = Font(name='Arial', size=11)
-        header_font = Font(name='Arial', size=11, bold=True)
+        normal_font = STYLES.font(name='Arial', size=11)
+        header_font = STYLES.font(name='Arial', size=11, bold=True)
         
        # Set column widths
         ws.column_dimensions['A'].width = 6   # Index column
@@ -1256,7 +1268,7 @@ class TimingSystemApp:
         # Title in B1
         ws['B1'] = self.excel_title
         ws['B1'].font = title_font
-        ws['B1'].alignment = Alignment(vertical='center', horizontal='left')
+        ws['B1'].alignment = STYLES.alignment(vertical='center', horizontal='left')
 
         # Define labels and their corresponding values
         label_value_pairs = {
@@ -1275,48 +1287,55 @@ class TimingSystemApp:
             # Write label
             ws[cell_coord] = label
             ws[cell_coord].font = header_font
-            ws[cell_coord].alignment = Alignment(horizontal='left')
+            ws[cell_coord].alignment = STYLES.alignment(horizontal='left')
             
             # Write value in the next column
             value_col = chr(ord(cell_coord[0]) + 1)  # Next column
             value_cell = f"{value_col}{cell_coord[1]}"
             ws[value_cell] = value
             ws[value_cell].font = normal_font
-            ws[value_cell].alignment = Alignment(horizontal='left')
+            ws[value_cell].alignment = STYLES.alignment(horizontal='left')
 
         # Special handling for Weather row (combines multiple conditions)
         ws['E5'] = 'Weather:'
         ws['E5'].font = header_font
-        ws['E5'].alignment = Alignment(horizontal='left')
+        ws['E5'].alignment = STYLES.alignment(horizontal='left')
         
         weather_value = f"{self.sky_condition_var.get()}, {self.precipitation_var.get()}, {self.wind_condition_var.get()}"
         ws['F5'] = weather_value
         ws['F5'].font = normal_font
-        ws['F5'].alignment = Alignment(horizontal='left')
-
-
-        # Now parse and add timing data
-        if self.selected_file:
-            timing_data = self.parse_timing_data(self.selected_file)
-            if timing_data:
-                current_row = 8  # Start after header section
-                
-                # Write each run's data
-                for run_number in sorted(timing_data.keys(), key=int):
-                    current_row = self.write_run_data(ws, timing_data[run_number], current_row)
-                    current_row += 1  # Extra space between runs
-        # After writing all run data, add the analysis graphs
-        if self.selected_file:
-            timing_data = self.parse_timing_data(self.selected_file)
-            if timing_data:
-                current_row = self.add_analysis_graphs(ws, timing_data, current_row)
-        
-        try:
-            wb.save(output_path)
-            return True
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to save Excel file: {str(e)}")
-            return False      
+        ws['F5'].alignment = STYLES.alignment(horizontal='left')
+
+
+        # Now add timing data, parsed once per file and shared with the graphs
+        with self.profiler.span('parse') as span:
+            session = self.get_timing_session(self.selected_file) if self.selected_file else None
+            if session:
+                span['rows'] = sum(len(run_data) for run_data in session.runs.values())
+        if session:
+            current_row = 8  # Start after header section
+
+            # Write each run's data
+            run_numbers = session.run_numbers()
+            for i, run_number in enumerate(run_numbers):
+                if progress:
+                    progress(10 + 70 * i / len(run_numbers), f"Writing run {run_number}...")
+                run_data = session.runs[run_number]
+                with self.profiler.span('write_run_data', rows=len(run_data)):
+                    current_row = self.write_run_data(ws, run_data, current_row)
+                current_row += 1  # Extra space between runs
+                if streaming:
+                    ws.flush(current_row)
+
+            # After writing all run data, add the analysis graphs
+            if progress:
+                progress(80, "Adding graphs...")
+            with self.profiler.span('add_analysis_graphs'):
+                current_row = self.add_analysis_graphs(ws, session.runs, current_row)
+
+        if streaming:
+            ws.flush()
+        return wb
 
     def get_season(self, date_str):
         """
@@ -1347,27 +1366,10 @@ class TimingSystemApp:
 
     def format_time(self, time_value, as_difference=False):
         """
-        Formats a time value (in seconds) as a string.
+        Formats a time value (in ticks) as a string.
         For differences, includes + sign and ensures 2 decimal places.
         """
-        if time_value is None:
-            return ""
-            
-        # For differences
-        if as_difference:
-            sign = '+' if time_value >= 0 else ''
-            if abs(time_value) < 60:
-                return f"{sign}{time_value:.2f}"
-            minutes = int(abs(time_value) // 60)
-            seconds = abs(time_value) % 60
-            return f"{sign}{minutes}:{seconds:05.2f}"
-        
-        # For regular times
-        if time_value < 60:
-            return f"{time_value:.2f}"
-        minutes = int(time_value // 60)
-        seconds = time_value % 60
-        return f"{minutes}:{seconds:05.2f}"
+        return format_ticks(time_value, as_difference)
 
     def sort_run_data(self, run_data):
         """
@@ -1384,17 +1386,17 @@ class TimingSystemApp:
 
  
 
-    def generate_filename(self):
+    def generate_filename(self, hill=None, team=None, event=None, date_str=None):
         """
         Generates a filename in the format Hill_Team_Event_Date or Hill-hill_Team_Event_Date.
-        Date is formatted as dd-mm-yyyy.
+        Date is formatted as dd-mm-yyyy. Fields not given are read from the form.
         
         Returns:
             str: The formatted filename with .xlsx extension
         """
         try:
             # Get and sanitize hill name
-            hill = self.hill_var.get().strip()
+            hill = (self.hill_var.get() if hill is None else hill).strip()
             if not hill:
                 hill = "Unknown-Hill"
             # Replace spaces with hyphens and remove any invalid filename characters
@@ -1402,13 +1404,15 @@ class TimingSystemApp:
             hill = ''.join(c for c in hill if c.isalnum() or c in '-_')
             
             # Get team name
-            team = self.current_team if self.current_team else "Unknown-Team"
+            team = self.current_team if team is None else team
+            team = team if team else "Unknown-Team"
             
             # Get event
-            event = self.event_var.get().strip() if self.event_var.get() else "Unknown-Event"
+            event = self.event_var.get() if event is None else event
+            event = event.strip() if event else "Unknown-Event"
             
             # Format the date
-            date_str = self.date_var.get().strip()
+            date_str = (self.date_var.get() if date_str is None else date_str).strip()
             if date_str and '/' in date_str:
                 try:
                     # Parse the date from dd/mm/yyyy
@@ -1428,7 +1432,7 @@ class TimingSystemApp:
             # Add extension
             return f"{filename}.xlsx"
         except Exception as e:
-            print(f"Error generating filename: {str(e)}")
+            log.error("Error generating filename: %s", e)
             return "reformatted_timing_data.xlsx"
 
    
@@ -1447,8 +1451,8 @@ class TimingSystemApp:
         if not times:
             return None, None, None, []
         
-        # Initial filtering of valid times (>= 10.0 seconds)
-        filtered_times = [t for t in times if t >= 10.0]
+        # Initial filtering of valid times (>= 10 seconds)
+        filtered_times = [t for t in times if t >= MIN_VALID_TIME]
         
         if not filtered_times:
             return None, None, None, []
@@ -1457,7 +1461,7 @@ class TimingSystemApp:
         mean_time = sum(filtered_times) / len(filtered_times)
         
         # Set threshold based on type
-        threshold = 3 if is_split else 5
+        threshold = (3 if is_split else 5) * TICKS_PER_SECOND
         
         # Calculate bounds
         lower_bound = mean_time - threshold
@@ -1474,33 +1478,8 @@ class TimingSystemApp:
         Writes run data to worksheet with gradient highlighting from fastest to slowest times.
         """
         # Define base styles
-        header_border = Border(
-            left=Side(style='thick'), 
-            right=Side(style='thick'),
-            top=Side(style='thick'),
-            bottom=Side(style='thick')
-        )
-        normal_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-
-        def get_gradient_color(index, total, start_color=(0, 128, 0), end_color=(139, 0, 0)):
-            """
-            Generates a color along a gradient from dark green to dark red.
-            """
-            if total <= 1:
-                return PatternFill(start_color='008000', end_color='008000', fill_type='solid')
-                
-            factor = index / (total - 1)
-            r = int(start_color[0] + (end_color[0] - start_color[0]) * factor)
-            g = int(start_color[1] + (end_color[1] - start_color[1]) * factor)
-            b = int(start_color[2] + (end_color[2] - start_color[2]) * factor)
-            
-            hex_color = f"{r:02x}{g:02x}{b:02x}".upper()
-            return PatternFill(start_color=hex_color, end_color=hex_color, fill_type='solid')
+        header_border = STYLES.box('thick')
+        normal_border = STYLES.box('thin')
 
         # Pre-process and organize entries
         valid_entries = []
@@ -1514,8 +1493,8 @@ class TimingSystemApp:
             status = entry['status'].upper()
             
             if status not in ['DNF', 'DSQ', 'DNS']:
-                split_invalid = split_time is not None and split_time < 10.0
-                finish_invalid = finish_time is not None and finish_time < 10.0
+                split_invalid = split_time is not None and split_time < MIN_VALID_TIME
+                finish_invalid = finish_time is not None and finish_time < MIN_VALID_TIME
                 if split_invalid or finish_invalid:
                     status = 'ERR'
                     entry['status'] = 'ERR'
@@ -1544,7 +1523,7 @@ class TimingSystemApp:
             cell = ws.cell(row=current_row, column=col)
             cell.value = header
             cell.border = header_border
-            cell.alignment = Alignment(horizontal='center')
+            cell.alignment = STYLES.alignment(horizontal='center')
         
         current_row += 1
 
@@ -1556,35 +1535,39 @@ class TimingSystemApp:
         for entry in run_data:
             bib = entry['bib']
             # Include split times even if DNF, as long as the time is valid
-            if entry['split1'] is not None and entry['split1'] >= 10.0 and entry['status'].upper() not in ['DNS', 'ERR']:
+            if entry['split1'] is not None and entry['split1'] >= MIN_VALID_TIME and entry['status'].upper() not in ['DNS', 'ERR']:
                 valid_split_times.append((entry['split1'], bib))
             
             # For finish and split-finish times, only include complete runs
             if entry['status'].upper() not in ['DNF', 'DSQ', 'DNS', 'ERR']:
-                if entry['finish'] is not None and entry['finish'] >= 10.0:
+                if entry['finish'] is not None and entry['finish'] >= MIN_VALID_TIME:
                     valid_finish_times.append((entry['finish'], bib))
                 if (entry['finish'] is not None and entry['split1'] is not None and 
-                    entry['finish'] >= 10.0 and entry['split1'] >= 10.0):
+                    entry['finish'] >= MIN_VALID_TIME and entry['split1'] >= MIN_VALID_TIME):
                     split_finish_time = entry['finish'] - entry['split1']
                     if split_finish_time > 0:
                         valid_split_finish_times.append((split_finish_time, bib))
 
-        # Sort times and create color lookups
-        valid_split_times.sort(key=lambda x: x[0])
-        valid_finish_times.sort(key=lambda x: x[0])
-        valid_split_finish_times.sort(key=lambda x: x[0])
+        # Rank each column once and create color lookups (tied times share a rank and color)
+        split_ranking = Ranking(valid_split_times)
+        finish_ranking = Ranking(valid_finish_times)
+        split_finish_ranking = Ranking(valid_split_finish_times)
+
+        split_palette = STYLES.gradient(len(split_ranking), 'classic')
+        finish_palette = STYLES.gradient(len(finish_ranking), 'classic')
+        split_finish_palette = STYLES.gradient(len(split_finish_ranking), 'classic')
 
-        split_colors = {bib: get_gradient_color(i, len(valid_split_times)) 
-                    for i, (_, bib) in enumerate(valid_split_times)}
-        finish_colors = {bib: get_gradient_color(i, len(valid_finish_times)) 
-                        for i, (_, bib) in enumerate(valid_finish_times)}
-        split_finish_colors = {bib: get_gradient_color(i, len(valid_split_finish_times)) 
-                            for i, (_, bib) in enumerate(valid_split_finish_times)}
+        split_colors = {bib: split_palette[rank - 1] 
+                    for bib, rank in split_ranking.ranks.items()}
+        finish_colors = {bib: finish_palette[rank - 1] 
+                        for bib, rank in finish_ranking.ranks.items()}
+        split_finish_colors = {bib: split_finish_palette[rank - 1] 
+                            for bib, rank in split_finish_ranking.ranks.items()}
 
-        # Calculate best times for differences
-        best_split = min(valid_split_times)[0] if valid_split_times else None
-        best_finish = min(valid_finish_times)[0] if valid_finish_times else None
-        best_split_finish = min(valid_split_finish_times)[0] if valid_split_finish_times else None
+        # Best times for differences
+        best_split = split_ranking.best
+        best_finish = finish_ranking.best
+        best_split_finish = split_finish_ranking.best
 
         # Write data rows
         for entry in ordered_run_data:
@@ -1603,15 +1586,15 @@ class TimingSystemApp:
                     split_finish_diff = split_finish_time - best_split_finish
 
             row = [
-                bib,
+                str(bib),  # Text, as the bib cell has always been written
                 self.get_athlete_name(bib),
-                self.format_time(split_time if split_time is not None and split_time >= 10.0 else None),
+                self.format_time(split_time if split_time is not None and split_time >= MIN_VALID_TIME else None),
                 self.format_time(split_time - best_split if split_time is not None and best_split is not None else None, True),
-                '',  # Rank will be filled in later
+                split_ranking.rank(bib) if status not in ['DNS', 'ERR'] else '',
                 self.format_time(split_finish_time) if split_finish_time is not None and split_finish_time > 0 else '',
                 self.format_time(split_finish_diff, True) if split_finish_diff is not None else '',
-                '',  # Rank will be filled in later
-                self.format_time(finish_time if finish_time is not None and finish_time >= 10.0 else None),
+                split_finish_ranking.rank(bib) if status not in ['DNS', 'ERR', 'DNF', 'DSQ'] else '',
+                self.format_time(finish_time if finish_time is not None and finish_time >= MIN_VALID_TIME else None),
                 self.format_time(finish_time - best_finish if finish_time is not None and best_finish is not None else None, True),
                 status
             ]
@@ -1621,7 +1604,7 @@ class TimingSystemApp:
                 cell = ws.cell(row=current_row, column=col)
                 cell.value = value
                 cell.border = normal_border
-                cell.alignment = Alignment(horizontal='center')
+                cell.alignment = STYLES.alignment(horizontal='center')
                 
                 # Apply gradient highlighting
                 if status not in ['DNS', 'ERR']:  # Allow Split 1 highlighting for DNF
@@ -1661,9 +1644,9 @@ class TimingSystemApp:
         # First pass: collect valid times
         for entry in run_data:
             if entry['status'].upper() not in ['DNF', 'DSQ', 'DNS', 'ERR']:
-                if entry['split1'] is not None and entry['split1'] >= 10.0:
+                if entry['split1'] is not None and entry['split1'] >= MIN_VALID_TIME:
                     valid_splits.append(entry['split1'])
-                if entry['finish'] is not None and entry['finish'] >= 10.0:
+                if entry['finish'] is not None and entry['finish'] >= MIN_VALID_TIME:
                     valid_finishes.append(entry['finish'])
         
         # Get outlier bounds for both split and finish times
@@ -1680,8 +1663,8 @@ class TimingSystemApp:
             
             if status not in ['DNF', 'DSQ', 'DNS', 'ERR']:
                 # Check for invalid times
-                if (entry['split1'] is not None and entry['split1'] < 10.0) or \
-                (entry['finish'] is not None and entry['finish'] < 10.0):
+                if (entry['split1'] is not None and entry['split1'] < MIN_VALID_TIME) or \
+                (entry['finish'] is not None and entry['finish'] < MIN_VALID_TIME):
                     entry['status'] = 'ERR'
                     cleaned_data.append(entry)
                     continue
@@ -1704,131 +1687,6 @@ class TimingSystemApp:
         
         return cleaned_data, outliers
    
-    def add_analysis_graphs(self, ws, timing_data, start_row):
-        """
-        Adds analysis graphs to the Excel worksheet showing split and finish time comparisons.
-        Positions the first graph 2 rows after the last run data.
-        """
-        from openpyxl.chart import LineChart, Reference, Series
-        from openpyxl.chart.marker import Marker
-
-        current_row = start_row + 2
-
-        # Prepare data for graphs
-        run_numbers = sorted(timing_data.keys(), key=int)
-        athletes = {}
-
-        # First pass: collect all athlete data
-        for run_num in run_numbers:
-            run_data = timing_data[run_num]
-            cleaned_data, _ = self.clean_and_analyze_timing_data(run_data)
-            
-            for entry in cleaned_data:
-                if entry['status'].upper() not in ['DNF', 'DSQ', 'DNS']:
-                    bib = entry['bib']
-                    athlete_name = self.get_athlete_name(bib)
-                    
-                    if athlete_name not in athletes:
-                        athletes[athlete_name] = {'splits': {}, 'finishes': {}}
-                    
-                    if entry['split1'] is not None:
-                        athletes[athlete_name]['splits'][run_num] = entry['split1']
-                    if entry['finish'] is not None:
-                        athletes[athlete_name]['finishes'][run_num] = entry['finish']
-
-        if not athletes:
-            print("No valid athlete data found for graphs")
-            return current_row
-
-        # Write data for graphs in a less visible area (column J onwards)
-        data_start_row = current_row
-        ws.cell(row=current_row, column=10, value="Run")  # Column J
-        col = 11
-        for athlete in athletes:
-            ws.cell(row=current_row, column=col, value=f"{athlete} Split")
-            ws.cell(row=current_row, column=col + 1, value=f"{athlete} Finish")
-            col += 2
-        current_row += 1
-
-        # Write data rows
-        for run_num in run_numbers:
-            ws.cell(row=current_row, column=10, value=int(run_num))
-            col = 11
-            for athlete in athletes:
-                split_time = athletes[athlete]['splits'].get(run_num)
-                finish_time = athletes[athlete]['finishes'].get(run_num)
-                
-                ws.cell(row=current_row, column=col, value=split_time)
-                ws.cell(row=current_row, column=col + 1, value=finish_time)
-                
-                # Format cells as numbers
-                if split_time is not None:
-                    ws.cell(row=current_row, column=col).number_format = '0.00'
-                if finish_time is not None:
-                    ws.cell(row=current_row, column=col + 1).number_format = '0.00'
-                
-                col += 2
-            current_row += 1
-
-        data_end_row = current_row - 1
-
-        # Create split times chart
-        split_chart = LineChart()
-        split_chart.title = "Split Times Comparison"
-        split_chart.style = 2
-        split_chart.height = 15
-        split_chart.width = 25
-        split_chart.x_axis.title = "Run Number"
-        split_chart.y_axis.title = "Split Time (seconds)"
-
-        # Create finish times chart
-        finish_chart = LineChart()
-        finish_chart.title = "Finish Times Comparison"
-        finish_chart.style = 2
-        finish_chart.height = 15
-        finish_chart.width = 25
-        finish_chart.x_axis.title = "Run Number"
-        finish_chart.y_axis.title = "Finish Time (seconds)"
-
-        # Colors for different athletes
-        colors = ['FF0000', '00FF00', '0000FF', 'FF00FF', '00FFFF', 'FFA500', '800080']
-
-        # Add data series for each athlete
-        col = 11  # Start from column K
-        for i, athlete in enumerate(athletes):
-            # Split times series
-            split_values = Reference(ws, min_row=data_start_row + 1, max_row=data_end_row, min_col=col)
-            split_series = Series(split_values, title=f"{athlete} Split")
-            split_series.marker = Marker(symbol='circle', size=7)
-            split_series.smooth = True
-            split_series.graphicalProperties.line.width = 20000
-            split_series.graphicalProperties.line.solidFill = colors[i % len(colors)]
-            split_chart.series.append(split_series)
-
-            # Finish times series
-            finish_values = Reference(ws, min_row=data_start_row + 1, max_row=data_end_row, min_col=col + 1)
-            finish_series = Series(finish_values, title=f"{athlete} Finish")
-            finish_series.marker = Marker(symbol='circle', size=7)
-            finish_series.smooth = True
-            finish_series.graphicalProperties.line.width = 20000
-            finish_series.graphicalProperties.line.solidFill = colors[i % len(colors)]
-            finish_chart.series.append(finish_series)
-
-            col += 2
-
-        # Add x-axis labels (run numbers)
-        run_labels = Reference(ws, min_row=data_start_row + 1, max_row=data_end_row, min_col=10)  # Column J
-        split_chart.set_categories(run_labels)
-        finish_chart.set_categories(run_labels)
-
-        # Position the charts - first chart just 2 rows after the last run data
-        first_chart_row = start_row + 2  # This puts it 2 rows after the last run data
-        ws.add_chart(split_chart, f"B{first_chart_row}")
-        ws.add_chart(finish_chart, f"B{first_chart_row + 19}")  # Position second chart after the first
-
-        return first_chart_row + 38  # Return the row after both charts
-
-
     def add_analysis_graphs(self, ws, timing_data, start_row):
         """
         Adds analysis graphs with custom axis labels and intervals.
@@ -1864,20 +1722,20 @@ class TimingSystemApp:
                     athletes[athlete_name] = {'splits': {}, 'finishes': {}, 'split_finishes': {}}
                 
                 # Include split times even for DNF entries if they have valid split times
-                if entry['split1'] is not None and entry['split1'] >= 10.0:
-                    athletes[athlete_name]['splits'][run_num] = entry['split1']
+                if entry['split1'] is not None and entry['split1'] >= MIN_VALID_TIME:
+                    athletes[athlete_name]['splits'][run_num] = to_seconds(entry['split1'])
                 
                 # Calculate and store split-finish times (time between split and finish)
                 if (status not in ['DNF', 'DSQ', 'DNS', 'ERR'] and 
                     entry['finish'] is not None and entry['split1'] is not None and 
-                    entry['finish'] >= 10.0 and entry['split1'] >= 10.0):
+                    entry['finish'] >= MIN_VALID_TIME and entry['split1'] >= MIN_VALID_TIME):
                     split_finish_time = entry['finish'] - entry['split1']
                     if split_finish_time > 0:  # Only store positive time differences
-                        athletes[athlete_name]['split_finishes'][run_num] = split_finish_time
-                        athletes[athlete_name]['finishes'][run_num] = entry['finish']
+                        athletes[athlete_name]['split_finishes'][run_num] = to_seconds(split_finish_time)
+                        athletes[athlete_name]['finishes'][run_num] = to_seconds(entry['finish'])
 
         if not athletes:
-            print("No valid athlete data found for graphs")
+            export_log.info("No valid athlete data found for graphs")
             return current_row
 
         # Add an extra run number for spacing
@@ -2037,6 +1895,12 @@ class TimingSystemApp:
 
     def reformat_file(self):
         """Handle the reformatting of the selected file with validation checks."""
+        # While an export runs the button cancels it
+        if self.export_task and self.export_task.is_running():
+            self.export_task.cancel()
+            self.export_status_var.set("Cancelling...")
+            return
+
         # Check if a file is selected
         if not self.selected_file:  # Changed condition to check selected_file
             messagebox.showwarning("Error", "Please select a Brower CSV file first.")
@@ -2055,7 +1919,7 @@ class TimingSystemApp:
         try:
             # Generate the default filename
             default_filename = self.generate_filename()
-            print(f"Generated filename: {default_filename}")  # Debug print
+            export_log.debug("Generated filename", extra={'fields': {'filename': default_filename}})
             
             # Add the hill to recent hills memory for future autocomplete
             hill_name = self.hill_var.get().strip()
@@ -2071,13 +1935,130 @@ class TimingSystemApp:
             )
             
             if output_file:  # If user didn't cancel the save dialog
-                if self.create_formatted_excel(output_file):
-                    messagebox.showinfo("Success", "File has been reformatted and saved successfully.")
-                else:
-                    messagebox.showerror("Error", "Failed to create reformatted file.")
+                self.start_export(output_file)
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {str(e)}")
-            print(f"Error in reformat_file: {str(e)}")  # Debug print
+            export_log.error("Error in reformat_file: %s", e)
+
+    def snapshot_for_export(self):
+        """
+        Returns a copy of the app for the export thread. Form values are read here on the
+        main thread and rosters are copied, so edits made during the export don't reach it.
+        """
+        job = copy.copy(self)
+        for name in ('team_var', 'event_var', 'hill_var', 'snow_condition_var', 'sky_condition_var',
+                     'precipitation_var', 'wind_condition_var', 'date_var', 'time_var', 'session_var'):
+            setattr(job, name, Field(getattr(self, name).get()))
+        job.athletes = copy.deepcopy(self.athletes)
+        job.temp_guests = copy.deepcopy(self.temp_guests)
+        job.team_names = dict(self.team_names)
+        job.rebuild_bib_index()
+        # Errors go back through the task instead of opening dialogs from the worker
+        job.parse_timing_data = job.load_timing_data
+        return job
+
+    def start_export(self, output_file):
+        """
+        Builds and saves the workbook in a background thread so the window stays responsive.
+        """
+        job = self.snapshot_for_export()
+        job.profiler = Profiler(f"Export {os.path.basename(output_file)}")
+
+        def work(task):
+            task.report(0, "Reading timing data...")
+            with job.profiler.span('build_workbook'):
+                wb = job.build_formatted_workbook(task.report)
+            task.report(90, "Saving...")
+            with job.profiler.span('save'):
+                wb.save(output_file)
+            try:
+                job.profiler.dump(os.path.splitext(os.path.basename(output_file))[0])
+            except OSError as e:
+                export_log.warning("Could not save export timings: %s", e)
+            return job.timing_session
+
+        def on_progress(percent, message):
+            self.export_status_var.set(f"{message} ({percent:.0f}%)")
+
+        def finish():
+            self.export_task = None
+            self.export_status_var.set("")
+            self.reformat_button.config(text="Reformat Selected File")
+
+        def on_done(session):
+            finish()
+            self.timing_session = session  # Keep the parsed file for the next export
+            self.last_export_profile = job.profiler
+            self.refresh_timing_report()
+            export_log.info("Exported %s", os.path.basename(output_file),
+                            extra={'fields': {'seconds': round(job.profiler.total_seconds(), 3)}})
+            messagebox.showinfo("Success", "File has been reformatted and saved successfully.")
+
+        def on_error(error):
+            finish()
+            messagebox.showerror("Error", f"Failed to create reformatted file: {str(error)}")
+            export_log.error("Error in export: %s", error, extra={'fields': {'output': output_file}})
+
+        def on_cancelled():
+            finish()
+            self.export_status_var.set("Export cancelled.")
+
+        self.reformat_button.config(text="Cancel Export")
+        self.export_task = BackgroundTask(self.root, work, on_done, on_progress, on_error, on_cancelled).start()
+
+    def toggle_timing_report(self):
+        """Opens the timing report window, or closes it if it is already open."""
+        if self.timing_report_window is not None and self.timing_report_window.winfo_exists():
+            self.timing_report_window.destroy()
+            self.timing_report_window = None
+            return
+
+        self.timing_report_window = tk.Toplevel(self.root)
+        self.timing_report_window.title("Timing Report")
+        self.timing_report_window.geometry("640x480")
+
+        self.timing_report_text = tk.Text(self.timing_report_window, wrap=tk.NONE, font=("Courier", 10))
+        scrollbar = tk.Scrollbar(self.timing_report_window, command=self.timing_report_text.yview)
+        self.timing_report_text.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.timing_report_text.pack(fill=tk.BOTH, expand=True)
+        self.refresh_timing_report()
+
+    def toggle_log_window(self):
+        """Opens the log window, or closes it if it is already open."""
+        if self.log_window is not None and self.log_window.exists():
+            self.log_window.close()
+        else:
+            self.log_window = LogWindow(self.root)
+
+    def toggle_live_window(self):
+        """
+        Opens live standings for the selected file, or for the newest CSV in a folder
+        chosen now if no file is selected. Closes them if they are already open.
+        """
+        if self.live_window is not None and self.live_window.exists():
+            self.live_window.close()
+            return
+
+        source = self.selected_file or filedialog.askdirectory(title="Folder Brower writes its CSV files to")
+        if source:
+            self.live_window = LiveWindow(self.root, source, self.get_athlete_name)
+
+    def refresh_timing_report(self):
+        """Shows the startup and last export timings in the report window, if it is open."""
+        if self.timing_report_window is None or not self.timing_report_window.winfo_exists():
+            return
+
+        reports = [self.startup_profile.report()]
+        if self.last_export_profile is not None:
+            reports.append(self.last_export_profile.report())
+        else:
+            reports.append("No export yet.")
+
+        self.timing_report_text.configure(state=tk.NORMAL)
+        self.timing_report_text.delete("1.0", tk.END)
+        self.timing_report_text.insert(tk.END, "\n\n".join(reports))
+        self.timing_report_text.configure(state=tk.DISABLED)
 
 
    
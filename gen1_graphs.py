@@ -1,4 +1,6 @@
+import os
 import json
+import logging
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from tkinter.ttk import Combobox
@@ -9,6 +11,10 @@ from openpyxl.utils import get_column_letter
 from openpyxl.styles import Border, Side  # Add to existing imports
 from openpyxl.chart import LineChart, Reference
 from openpyxl.chart.marker import Marker
+from app_log import get_logger
+
+parse_log = get_logger('parse')
+export_log = get_logger('export')
 
 class TimingSystemApp:
     def __init__(self, root):
@@ -822,6 +828,7 @@ class TimingSystemApp:
         timing_data = {}
         header_found = False
         column_indices = {}
+        skipped_lines = 0
         
         try:
             with open(file_path, 'r') as file:
@@ -888,10 +895,16 @@ class TimingSystemApp:
                                 timing_data[run_number].append(entry)
                                 
                         except IndexError as e:
-                            print(f"Error processing line: {line}")
-                            print(f"Error details: {str(e)}")
+                            skipped_lines += 1
+                            if parse_log.isEnabledFor(logging.DEBUG):
+                                parse_log.debug("Error processing line",
+                                                extra={'fields': {'line': line, 'error': str(e)}})
                             continue
             
+            if skipped_lines:
+                parse_log.warning("Skipped %d malformed lines in %s", skipped_lines,
+                                  os.path.basename(file_path))
+
             # Sort data for each run
             for run_number in timing_data:
                 timing_data[run_number] = self.sort_run_data(timing_data[run_number])
@@ -1288,7 +1301,7 @@ class TimingSystemApp:
                         athletes[athlete_name]['finishes'][run_num] = entry['finish']
 
         if not athletes:
-            print("No valid athlete data found for graphs")
+            export_log.info("No valid athlete data found for graphs")
             return current_row
 
         # Write data headers
@@ -1,24 +1,41 @@
 # This is the new code, updated but not complete.
 import os
 import json
+import logging
 import tkinter as tk
 import tkinter as ttk
 import sv_ttk
 from tkinter import filedialog, messagebox
 from tkinter.ttk import Combobox
 from datetime import datetime
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, PatternFill
-from openpyxl.utils import get_column_letter
-from openpyxl.styles import Border, Side
-from openpyxl.chart import LineChart, Reference
-from openpyxl.chart.marker import Marker
+from background_task import BackgroundTask
+from brower_parser import index_sessions
+from excel_styles import STYLES
+from hill_index import HillIndex
+from log_window import LogWindow
+from app_log import get_logger
+from name_index import NameIndex
+from profiling import Profiler
+from storage import RecentJournal, data_path
+from time_ticks import TimeTokenParser, format_ticks, scan_time, to_seconds
+from timing_session import load_timing_table
+from timing_stats import Ranking, RunRanking
+from ui_scheduler import UIScheduler, update_listbox
+
+log = get_logger('app')
+parse_log = get_logger('parse')
+export_log = get_logger('export')
+validation_log = get_logger('validation')
 
 class TimingSystemApp:
     def __init__(self, root):
         """Initialize the application with enhanced timing capabilities."""
         self.root = root
         self.root.title("Timing System Data Formatter")
+        self.startup_profile = Profiler("Startup")
+        self.profiler = self.startup_profile  # Spans of the job in progress
+        self.last_export_profile = None
+        self.timing_report_window = None
         
         # Apply Sun Valley theme
         sv_ttk.set_theme("dark")
@@ -32,10 +49,15 @@ class TimingSystemApp:
         
         # Data structures
         self.selected_file = None
+        self.session_span = None  # Session of selected_file to read; files can hold several
         self.athletes = {"SQAH": [], "SQAF": [], "OTHER": []}
         self.temp_guests = []
         self.current_team = "SQAH"
+        self.team_bib_index = {}   # bib -> {team: athlete}
+        self.guest_bib_index = {}  # bib -> guest
         self.num_splits = 0  # Will be determined from data
+        self.validation_task = None  # Background validation, if one is running
+        self.scheduler = UIScheduler(self.root)  # One timer for animations and debounced refreshes
         
         # UI state variables
         self.team_var = tk.StringVar()
@@ -48,15 +70,28 @@ class TimingSystemApp:
         self.date_var = tk.StringVar()
         self.time_var = tk.StringVar()
         self.session_var = tk.StringVar()
-        
-        # Load saved data
-        self.load_settings()
-        self.load_recent_names()
-        self.load_recent_hills()
-        self.load_athletes_from_json()
+        self.show_timing_report_var = tk.BooleanVar(value=False)
+        self.show_log_var = tk.BooleanVar(value=False)
+        self.log_window = None
+        
+        # Recent names and hills, indexed for autocomplete and journaled to disk
+        self.name_index = NameIndex()
+        self.names_journal = RecentJournal(data_path("recent_names.txt"))
+        self.hill_index = HillIndex()
+        self.hills_journal = RecentJournal(data_path("recent_hills.txt"))
+
+        # Load saved data; recent names and hills load once the window is up
+        with self.startup_profile.span('load_settings'):
+            self.load_settings()
+        self.root.after_idle(self.load_recent_names)
+        self.root.after_idle(self.load_recent_hills)
+        with self.startup_profile.span('load_athletes_from_json'):
+            self.load_athletes_from_json()
+            self.rebuild_bib_index()
         
         # Build GUI
-        self.build_gui()
+        with self.startup_profile.span('build_gui'):
+            self.build_gui()
         
     def parse_timing_data(self, file_path):
         """
@@ -176,105 +211,92 @@ class TimingSystemApp:
     def validate_run_data(self, run_data):
         """
         Validates timing data for a complete run with enhanced split time handling.
+        Split and finish statistics come from one batched pass over the run's time matrix.
         """
-        # First pass: collect times for each split position
-        split_times = [[] for _ in range(self.num_splits)]
-        finish_times = []
-        
-        for entry in run_data:
-            if entry['status'].upper() not in ['DNF', 'DSQ', 'DNS', 'ERR']:
-                # Collect all non-zero split times
-                for i, split in enumerate(entry['splits']):
-                    if split is not None and split > 0:
-                        split_times[i].append(split)
-                
-                if entry['finish'] is not None and entry['finish'] > 0:
-                    finish_times.append(entry['finish'])
-        
-        # Analyze characteristics of each split
-        split_characteristics = []
-        for split_position, times in enumerate(split_times):
-            if times:
-                mean = sum(times) / len(times)
-                std_dev = (sum((x - mean) ** 2 for x in times) / len(times)) ** 0.5
-                
-                is_acceleration_split = mean < 5.0 and std_dev < 0.5
-                
-                bounds = self.calculate_adaptive_bounds(
-                    times,
-                    z_score=3.0 if is_acceleration_split else 2.5,
-                    min_allowed=self.MIN_ACCELERATION_SPLIT_TIME if is_acceleration_split 
-                              else self.MIN_REGULAR_SPLIT_TIME
-                )
-                
-                split_characteristics.append({
-                    'mean': mean,
-                    'std_dev': std_dev,
-                    'is_acceleration_split': is_acceleration_split,
-                    'bounds': bounds
-                })
-            else:
-                split_characteristics.append(None)
-        
+        import numpy as np
+        from split_stats import ColumnStats, run_arrays, status_mask
+        splits, finish, statuses = run_arrays(run_data, self.num_splits)
+        counted = status_mask(statuses)
+
+        # Analyze characteristics of every split at once
+        split_stats = ColumnStats(splits, counted)
+        is_acceleration_split = (split_stats.mean < 5.0) & (split_stats.std_dev < 0.5)
+        lower, upper = split_stats.adaptive_bounds(
+            z_score=np.where(is_acceleration_split, 3.0, 2.5),
+            min_allowed=np.where(is_acceleration_split, self.MIN_ACCELERATION_SPLIT_TIME,
+                                 self.MIN_REGULAR_SPLIT_TIME)
+        )
+        has_bounds = split_stats.count > 0
+
         # Calculate finish time bounds
-        finish_bounds = self.calculate_adaptive_bounds(finish_times) if finish_times else None
-        
-        # Second pass: validate entries
+        finish_stats = ColumnStats(finish, counted)
+        finish_lower, finish_upper = finish_stats.adaptive_bounds()
+        has_finish_bounds = finish_stats.count[0] > 0
+
+        with np.errstate(invalid='ignore'):
+            # Split times inside / outside their split's bounds
+            present = (splits > 0) & has_bounds
+            in_bounds = (splits >= lower) & (splits <= upper)
+            out_of_bounds = present & ~in_bounds
+            valid = present & in_bounds
+
+            # Each valid split must beat the previous valid split of the same entry
+            rows = np.arange(len(run_data))
+            if self.num_splits:
+                last_valid = np.maximum.accumulate(np.where(valid, np.arange(self.num_splits), -1), axis=1)
+                previous = np.hstack([np.full((len(run_data), 1), -1), last_valid[:, :-1]])
+                previous_times = np.take_along_axis(splits, np.maximum(previous, 0), axis=1)
+                bad_progression = valid & (previous >= 0) & (splits <= previous_times)
+                last_index = last_valid[:, -1]
+                last_split = splits[rows, np.maximum(last_index, 0)]
+            else:
+                previous_times = splits
+                bad_progression = valid
+                last_index = np.full(len(run_data), -1)
+                last_split = np.full(len(run_data), np.nan)
+
+            # Finish time against its bounds and the last valid split
+            finish_present = finish > 0
+            finish_out = finish_present & has_finish_bounds & \
+                ~((finish >= finish_lower[0]) & (finish <= finish_upper[0]))
+            finish_before_split = finish_present & (last_index >= 0) & (finish <= last_split)
+
+        invalid = out_of_bounds.any(axis=1) | bad_progression.any(axis=1) | finish_out | finish_before_split
+
+        # Second pass only over the entries that need messages
         valid_entries = []
-        for entry in run_data:
-            status = entry['status'].upper()
-            
+        for row, entry in enumerate(run_data):
+            status = statuses[row]
+
             # Skip DNS entries
             if status == 'DNS':
                 valid_entries.append(entry)
                 continue
-                
-            is_valid = True
+
             error_details = []
-            
-            # Validate split times
-            valid_splits = []
-            for i, split in enumerate(entry['splits']):
-                if split is not None and split > 0:
-                    char = split_characteristics[i]
-                    if char and char['bounds']:
-                        bounds = char['bounds']
-                        if bounds[0] <= split <= bounds[1]:
-                            valid_splits.append(split)
-                        else:
-                            error_details.append(
-                                f"Split {i+1}: {split:.2f}s outside bounds "
-                                f"[{bounds[0]:.2f}, {bounds[1]:.2f}]"
-                            )
-                            is_valid = False
-            
-            # Check split progression
-            if len(valid_splits) > 1:
-                for j in range(1, len(valid_splits)):
-                    if valid_splits[j] <= valid_splits[j-1]:
-                        error_details.append(
-                            f"Invalid progression: {valid_splits[j-1]:.2f} → {valid_splits[j]:.2f}"
-                        )
-                        is_valid = False
-            
-            # Validate finish time
-            if entry['finish'] is not None and entry['finish'] > 0:
-                if finish_bounds:
-                    if not (finish_bounds[0] <= entry['finish'] <= finish_bounds[1]):
-                        error_details.append(
-                            f"Finish: {entry['finish']:.2f}s outside bounds "
-                            f"[{finish_bounds[0]:.2f}, {finish_bounds[1]:.2f}]"
-                        )
-                        is_valid = False
-                if valid_splits and entry['finish'] <= valid_splits[-1]:
+            if invalid[row]:
+                for i in np.flatnonzero(out_of_bounds[row]):
                     error_details.append(
-                        f"Finish ({entry['finish']:.2f}) ≤ last split ({valid_splits[-1]:.2f})"
+                        f"Split {i+1}: {splits[row, i]:.2f}s outside bounds "
+                        f"[{lower[i]:.2f}, {upper[i]:.2f}]"
                     )
-                    is_valid = False
-            
-            # Update entry status
-            if not is_valid and status not in ['DNF', 'DSQ']:
-                entry['status'] = 'ERR'
+                for j in np.flatnonzero(bad_progression[row]):
+                    error_details.append(
+                        f"Invalid progression: {previous_times[row, j]:.2f} → {splits[row, j]:.2f}"
+                    )
+                if finish_out[row]:
+                    error_details.append(
+                        f"Finish: {finish[row]:.2f}s outside bounds "
+                        f"[{finish_lower[0]:.2f}, {finish_upper[0]:.2f}]"
+                    )
+                if finish_before_split[row]:
+                    error_details.append(
+                        f"Finish ({finish[row]:.2f}) ≤ last split ({last_split[row]:.2f})"
+                    )
+
+                # Update entry status
+                if status not in ['DNF', 'DSQ']:
+                    entry['status'] = 'ERR'
             entry['error_details'] = error_details
             valid_entries.append(entry)
         
@@ -283,31 +305,6 @@ class TimingSystemApp:
             float('inf') if x['finish'] is None else x['finish']
         ))
 
-    def calculate_adaptive_bounds(self, times, z_score=2.5, min_allowed=3.0, max_allowed=180.0):
-        """
-        Calculate statistical bounds with adaptive thresholds.
-        """
-        if not times:
-            return None
-            
-        mean = sum(times) / len(times)
-        std_dev = (sum((x - mean) ** 2 for x in times) / len(times)) ** 0.5
-        
-        # For very consistent times, widen bounds slightly
-        if std_dev < 0.1:
-            z_score = z_score * 1.5
-        
-        lower_bound = max(min_allowed, mean - (z_score * std_dev))
-        upper_bound = min(max_allowed, mean + (z_score * std_dev))
-        
-        # Adjust bounds for acceleration splits
-        if mean < 5.0:
-            relative_range = 0.5  # 50% variation allowed
-            lower_bound = max(min_allowed, mean * (1 - relative_range))
-            upper_bound = mean * (1 + relative_range)
-        
-        return (lower_bound, upper_bound)
-
     def format_time(self, time_value, as_difference=False):
         """Format time values with appropriate precision."""
         if time_value is None:
@@ -330,31 +327,23 @@ class TimingSystemApp:
 
     def create_formatted_excel(self, output_path):
             """Creates a formatted Excel file with enhanced split time handling."""
+            from openpyxl import Workbook
+            from openpyxl.utils import get_column_letter
             wb = Workbook()
             ws = wb.active
             
             # Define styles
             try:
-                title_font = Font(name='Avenir Next LT Pro', size=18, bold=True)
+                title_font = STYLES.font(name='Avenir Next LT Pro', size=18, bold=True)
             except:
-                title_font = Font(name='Arial', size=18, bold=True)
+                title_font = STYLES.font(name='Arial', size=18, bold=True)
             
-            normal_font = Font(name='Arial', size=11)
-            header_font = Font(name='Arial', size=11, bold=True)
+            normal_font = STYLES.font(name='Arial', size=11)
+            header_font = STYLES.font(name='Arial', size=11, bold=True)
             
             # Define borders
-            header_border = Border(
-                left=Side(style='thick'), 
-                right=Side(style='thick'),
-                top=Side(style='thick'),
-                bottom=Side(style='thick')
-            )
-            normal_border = Border(
-                left=Side(style='thin'),
-                right=Side(style='thin'),
-                top=Side(style='thin'),
-                bottom=Side(style='thin')
-            )
+            header_border = STYLES.box('thick')
+            normal_border = STYLES.box('thin')
                 
             # Set dynamic column widths based on number of splits
             basic_columns = {
@@ -393,7 +382,7 @@ class TimingSystemApp:
             # Write title and header information
             ws['B1'] = self.excel_title
             ws['B1'].font = title_font
-            ws['B1'].alignment = Alignment(vertical='center', horizontal='left')
+            ws['B1'].alignment = STYLES.alignment(vertical='center', horizontal='left')
 
             # Header information
             header_info = {
@@ -411,14 +400,14 @@ class TimingSystemApp:
                 # Write label
                 ws[cell_coord] = label
                 ws[cell_coord].font = header_font
-                ws[cell_coord].alignment = Alignment(horizontal='left')
+                ws[cell_coord].alignment = STYLES.alignment(horizontal='left')
                 
                 # Write value in next column
                 value_col = chr(ord(cell_coord[0]) + 1)
                 value_cell = f"{value_col}{cell_coord[1]}"
                 ws[value_cell] = value
                 ws[value_cell].font = normal_font
-                ws[value_cell].alignment = Alignment(horizontal='left')
+                ws[value_cell].alignment = STYLES.alignment(horizontal='left')
 
             # Process timing data
             if self.selected_file:
@@ -459,14 +448,9 @@ class TimingSystemApp:
         # Write headers
         for col, header in enumerate(headers, start=2):
             cell = ws.cell(row=current_row, column=col, value=header)
-            cell.border = Border(
-                left=Side(style='thick'),
-                right=Side(style='thick'),
-                top=Side(style='thick'),
-                bottom=Side(style='thick')
-            )
-            cell.alignment = Alignment(horizontal='center')
-            cell.font = Font(name='Arial', size=11, bold=True)
+            cell.border = STYLES.box('thick')
+            cell.alignment = STYLES.alignment(horizontal='center')
+            cell.font = STYLES.font(name='Arial', size=11, bold=True)
         
         current_row += 1
         
@@ -485,9 +469,7 @@ class TimingSystemApp:
                     finish_data.append((entry['finish'], entry['bib']))
         
         # Sort times and calculate ranks
-        for i in range(self.num_splits):
-            split_data[i].sort(key=lambda x: x[0])
-        finish_data.sort(key=lambda x: x[0])
+        ranking = RunRanking(split_data, finish_data)
         
         # Write data rows with enhanced formatting
         for entry in run_data:
@@ -500,9 +482,9 @@ class TimingSystemApp:
             # Process each split
             for i, split in enumerate(entry['splits']):
                 if split is not None and split > 0:
-                    best_split = split_data[i][0][0] if split_data[i] else None
+                    best_split = ranking.split(i).best
                     split_diff = split - best_split if best_split is not None else None
-                    split_rank = next((j + 1 for j, (_, b) in enumerate(split_data[i]) if b == bib), '')
+                    split_rank = ranking.split(i).rank(bib)
                     
                     row_data.extend([
                         self.format_time(split),
@@ -514,7 +496,7 @@ class TimingSystemApp:
             
             # Add finish data
             if status not in ['DNF', 'DSQ', 'DNS', 'ERR']:
-                best_finish = finish_data[0][0] if finish_data else None
+                best_finish = ranking.finish.best
                 finish_diff = (entry['finish'] - best_finish 
                              if entry['finish'] is not None and best_finish is not None 
                              else None)
@@ -530,33 +512,26 @@ class TimingSystemApp:
             # Write row with formatting
             for col, value in enumerate(row_data, start=2):
                 cell = ws.cell(row=current_row, column=col, value=value)
-                cell.border = Border(
-                    left=Side(style='thin'),
-                    right=Side(style='thin'),
-                    top=Side(style='thin'),
-                    bottom=Side(style='thin')
-                )
-                cell.alignment = Alignment(horizontal='center')
+                cell.border = STYLES.box('thin')
+                cell.alignment = STYLES.alignment(horizontal='center')
                 
                 # Apply gradient coloring for valid times
                 if status not in ['DNS', 'ERR']:
                     # Color split times
-                    if (col - 4) % 3 == 0 and (col - 4) // 3 < len(split_data):
+                    if (col - 4) % 3 == 0 and (col - 4) // 3 < len(ranking.splits):
                         split_idx = (col - 4) // 3
-                        if split_data[split_idx]:
-                            rank = next((i for i, (_, b) in enumerate(split_data[split_idx]) 
-                                      if b == bib), None)
-                            if rank is not None:
-                                cell.fill = self.get_gradient_color(
-                                    rank, len(split_data[split_idx]), 
-                                    0.6 if split_idx == 0 else 0.5
-                                )
+                        rank = ranking.split(split_idx).rank(bib, None)
+                        if rank is not None:
+                            cell.fill = self.get_gradient_color(
+                                rank - 1, len(ranking.split(split_idx)), 
+                                self.split_gradient_scheme(split_idx)
+                            )
                     
                     # Color finish time
-                    elif col == len(row_data) - 1 and finish_data:
-                        rank = next((i for i, (_, b) in enumerate(finish_data) if b == bib), None)
+                    elif col == len(row_data) - 1:
+                        rank = ranking.finish.rank(bib, None)
                         if rank is not None:
-                            cell.fill = self.get_gradient_color(rank, len(finish_data), 0.5)
+                            cell.fill = self.get_gradient_color(rank - 1, len(ranking.finish))
             
             current_row += 1
             
@@ -564,17 +539,18 @@ class TimingSystemApp:
             if entry['error_details']:
                 error_cell = ws.cell(row=current_row, column=2, 
                                    value=f"Validation Issues for Bib {bib}:")
-                error_cell.font = Font(color="FF0000")
+                error_cell.font = STYLES.font(color="FF0000")
                 current_row += 1
                 
                 for error in entry['error_details']:
-                    ws.cell(row=current_row, column=2, value=f"  • {error}").font = Font(color="FF0000")
+                    ws.cell(row=current_row, column=2, value=f"  • {error}").font = STYLES.font(color="FF0000")
                     current_row += 1
         
         return current_row
     
     def create_athlete_analysis_sheet(self, wb, timing_data):
             """Creates detailed athlete analysis sheet with enhanced split analysis."""
+            from openpyxl.utils import get_column_letter
             analysis_sheet = wb.create_sheet(title="Athlete Analysis")
             
             # Apply column formatting
@@ -596,6 +572,24 @@ class TimingSystemApp:
             analysis_sheet.column_dimensions[chr(ord(current_col) + 2)] = base_width  # Status
 
             current_row = 2
+
+            # Rank each run once for all athletes
+            run_rankings = {}
+            for run_number, run_data in timing_data.items():
+                run_splits = [[] for _ in range(self.num_splits)]
+                run_finishes = []
+                for entry in run_data:
+                    if entry['status'].upper() not in ['DNS', 'ERR']:
+                        # Collect split times
+                        for i, split in enumerate(entry['splits']):
+                            if split is not None and split > 0:
+                                run_splits[i].append((split, entry['bib']))
+
+                        # Collect finish times
+                        if (entry['status'].upper() not in ['DNF', 'DSQ'] and 
+                            entry['finish'] is not None and entry['finish'] > 0):
+                            run_finishes.append((entry['finish'], entry['bib']))
+                run_rankings[run_number] = RunRanking(run_splits, run_finishes)
             
             # Process each athlete
             for athlete in sorted(self.athletes[self.current_team], key=lambda x: int(x['bib'])):
@@ -605,7 +599,7 @@ class TimingSystemApp:
                 # Write athlete header
                 athlete_header = f"{athlete_name} (Bib {athlete_bib})"
                 cell = analysis_sheet.cell(row=current_row, column=2, value=athlete_header)
-                cell.font = Font(name='Arial', size=11, bold=True)
+                cell.font = STYLES.font(name='Arial', size=11, bold=True)
                 current_row += 1
 
                 # Generate headers
@@ -617,13 +611,8 @@ class TimingSystemApp:
                 # Write column headers
                 for col, header in enumerate(headers, start=2):
                     cell = analysis_sheet.cell(row=current_row, column=col, value=header)
-                    cell.border = Border(
-                        left=Side(style='thick'),
-                        right=Side(style='thick'),
-                        top=Side(style='thick'),
-                        bottom=Side(style='thick')
-                    )
-                    cell.alignment = Alignment(horizontal='center')
+                    cell.border = STYLES.box('thick')
+                    cell.alignment = STYLES.alignment(horizontal='center')
                 current_row += 1
 
                 # Process each run
@@ -633,30 +622,11 @@ class TimingSystemApp:
                     
                     # Find athlete's entry and best times
                     athlete_entry = next((entry for entry in run_data 
-                                        if int(entry['bib']) == athlete_bib), None)
+                                        if entry['bib'] == athlete_bib), None)
                     if not athlete_entry:
                         continue
 
-                    # Collect valid times for this run
-                    run_splits = [[] for _ in range(self.num_splits)]
-                    run_finishes = []
-                    
-                    for entry in run_data:
-                        if entry['status'].upper() not in ['DNS', 'ERR']:
-                            # Collect split times
-                            for i, split in enumerate(entry['splits']):
-                                if split is not None and split > 0:
-                                    run_splits[i].append((split, entry['bib']))
-                            
-                            # Collect finish times
-                            if (entry['status'].upper() not in ['DNF', 'DSQ'] and 
-                                entry['finish'] is not None and entry['finish'] > 0):
-                                run_finishes.append((entry['finish'], entry['bib']))
-
-                    # Sort times
-                    for split_list in run_splits:
-                        split_list.sort(key=lambda x: x[0])
-                    run_finishes.sort(key=lambda x: x[0])
+                    ranking = run_rankings[run_number]
 
                     # Prepare row data
                     row_data = [athlete_bib, f"Run {run_number}"]
@@ -664,10 +634,9 @@ class TimingSystemApp:
                     # Add split data
                     for i, split in enumerate(athlete_entry['splits']):
                         if split is not None and split > 0:
-                            best_split = run_splits[i][0][0] if run_splits[i] else None
+                            best_split = ranking.split(i).best
                             split_diff = split - best_split if best_split is not None else None
-                            split_rank = next((j + 1 for j, (_, b) in enumerate(run_splits[i]) 
-                                            if b == str(athlete_bib)), '')
+                            split_rank = ranking.split(i).rank(athlete_bib)
                             
                             row_data.extend([
                                 self.format_time(split),
@@ -679,7 +648,7 @@ class TimingSystemApp:
 
                     # Add finish data
                     if athlete_entry['status'].upper() not in ['DNF', 'DSQ', 'DNS', 'ERR']:
-                        best_finish = run_finishes[0][0] if run_finishes else None
+                        best_finish = ranking.finish.best
                         finish_diff = (athlete_entry['finish'] - best_finish 
                                     if athlete_entry['finish'] is not None and best_finish is not None 
                                     else None)
@@ -703,13 +672,8 @@ class TimingSystemApp:
                     # Write row with formatting
                     for col, value in enumerate(row_data, start=2):
                         cell = analysis_sheet.cell(row=current_row, column=col, value=value)
-                        cell.border = Border(
-                            left=Side(style='thin'),
-                            right=Side(style='thin'),
-                            top=Side(style='thin'),
-                            bottom=Side(style='thin')
-                        )
-                        cell.alignment = Alignment(horizontal='center')
+                        cell.border = STYLES.box('thin')
+                        cell.alignment = STYLES.alignment(horizontal='center')
                     
                     current_row += 1
 
@@ -798,13 +762,8 @@ class TimingSystemApp:
         
         for col, header in enumerate(headers, start=2):
             cell = ws.cell(row=current_row, column=col, value=header)
-            cell.font = Font(bold=True)
-            cell.border = Border(
-                left=Side(style='thick'),
-                right=Side(style='thick'),
-                top=Side(style='thick'),
-                bottom=Side(style='thick')
-            )
+            cell.font = STYLES.font(bold=True)
+            cell.border = STYLES.box('thick')
         current_row += 1
 
         # Write analysis data
@@ -831,12 +790,7 @@ class TimingSystemApp:
             
             for col, value in enumerate(row_data, start=2):
                 cell = ws.cell(row=current_row, column=col, value=value)
-                cell.border = Border(
-                    left=Side(style='thin'),
-                    right=Side(style='thin'),
-                    top=Side(style='thin'),
-                    bottom=Side(style='thin')
-                )
+                cell.border = STYLES.box('thin')
             current_row += 1
 
         # Add statistical summary
@@ -850,7 +804,7 @@ class TimingSystemApp:
         
         # Write section header
         cell = ws.cell(row=current_row, column=2, value="Statistical Summary")
-        cell.font = Font(bold=True, size=12)
+        cell.font = STYLES.font(bold=True, size=12)
         current_row += 2
 
         # Calculate summary statistics
@@ -894,7 +848,7 @@ class TimingSystemApp:
         ]
 
         for title, value in summary_rows:
-            ws.cell(row=current_row, column=2, value=title).font = Font(bold=True)
+            ws.cell(row=current_row, column=2, value=title).font = STYLES.font(bold=True)
             ws.cell(row=current_row, column=3, value=value)
             current_row += 1
 
@@ -906,7 +860,7 @@ class TimingSystemApp:
                 mean = sum(split_times) / len(split_times)
                 std_dev = (sum((t - mean) ** 2 for t in split_times) / len(split_times)) ** 0.5
                 
-                ws.cell(row=current_row, column=2, value=f"Split {i+1} Statistics:").font = Font(bold=True)
+                ws.cell(row=current_row, column=2, value=f"Split {i+1} Statistics:").font = STYLES.font(bold=True)
                 current_row += 1
                 
                 split_stats = [
@@ -925,92 +879,61 @@ class TimingSystemApp:
 
         return current_row
     
-    def calculate_split_statistics(self, split_times, is_acceleration_split=False):
-        """
-        Calculates comprehensive statistics for a set of split times.
-        Handles both regular and acceleration splits differently.
-        """
-        if not split_times:
-            return None
-            
-        # Remove any None or zero values
-        valid_times = [t for t in split_times if t is not None and t > 0]
-        if not valid_times:
-            return None
-            
-        # Basic statistics
-        mean = sum(valid_times) / len(valid_times)
-        variance = sum((t - mean) ** 2 for t in valid_times) / len(valid_times)
-        std_dev = variance ** 0.5
-        
-        # Determine outlier bounds based on split type
-        z_score = 3.0 if is_acceleration_split else 2.5
-        min_allowed = self.MIN_ACCELERATION_SPLIT_TIME if is_acceleration_split else self.MIN_REGULAR_SPLIT_TIME
-        
-        lower_bound = max(min_allowed, mean - (z_score * std_dev))
-        upper_bound = min(self.MAX_SPLIT_TIME, mean + (z_score * std_dev))
-        
-        return {
-            'mean': mean,
-            'std_dev': std_dev,
-            'min': min(valid_times),
-            'max': max(valid_times),
-            'range': max(valid_times) - min(valid_times),
-            'count': len(valid_times),
-            'bounds': (lower_bound, upper_bound),
-            'coefficient_of_variation': (std_dev / mean) * 100 if mean > 0 else None
-        }
-
     def validate_run_consistency(self, run_data):
         """
         Validates the consistency of times within a run.
         Returns a list of potential issues found.
         """
+        import numpy as np
+        from split_stats import ColumnStats, run_arrays, status_mask
         issues = []
-        
-        # Collect valid times for each split
-        split_times = [[] for _ in range(self.num_splits)]
-        finish_times = []
-        
-        for entry in run_data:
-            if entry['status'].upper() not in ['DNS', 'ERR']:
-                # Collect split times
-                for i, split in enumerate(entry['splits']):
-                    if split is not None and split > 0:
-                        split_times[i].append((split, entry['bib']))
-                
-                # Collect finish times
-                if (entry['status'].upper() not in ['DNF', 'DSQ'] and 
-                    entry['finish'] is not None and entry['finish'] > 0):
-                    finish_times.append((entry['finish'], entry['bib']))
-        
+        if not run_data:
+            return issues
+
+        splits, finish, statuses = run_arrays(run_data, self.num_splits)
+
+        # Splits count unless DNS/ERR; finishes also drop DNF/DSQ
+        split_stats = ColumnStats(splits, status_mask(statuses, ['DNS', 'ERR']))
+        finish_stats = ColumnStats(finish, status_mask(statuses))
+
+        # Split 1 is an acceleration split when every counted time is under 5s
+        is_acceleration = np.zeros(len(split_stats), dtype=bool)
+        if self.num_splits:
+            is_acceleration[0] = split_stats.count[0] > 0 and split_stats.max[0] < 5.0
+        lower, upper = split_stats.bounds(
+            np.where(is_acceleration, 3.0, 2.5),
+            np.where(is_acceleration, self.MIN_ACCELERATION_SPLIT_TIME, self.MIN_REGULAR_SPLIT_TIME),
+            self.MAX_SPLIT_TIME
+        )
+        with np.errstate(invalid='ignore'):
+            suspicious = split_stats.present & ((splits < lower) | (splits > upper))
+
         # Analyze each split
-        for i, times in enumerate(split_times):
-            if times:
-                is_acceleration = i == 0 and all(t[0] < 5.0 for t in times)
-                stats = self.calculate_split_statistics([t[0] for t in times], is_acceleration)
-                
-                if stats:
-                    # Check for suspicious patterns
-                    if stats['coefficient_of_variation'] > 15 and not is_acceleration:
-                        issues.append(f"High variation in Split {i+1} times (CV: {stats['coefficient_of_variation']:.1f}%)")
-                    
-                    # Check for outliers
-                    for time, bib in times:
-                        if time < stats['bounds'][0] or time > stats['bounds'][1]:
-                            issues.append(f"Suspicious time for Bib {bib} in Split {i+1}: {self.format_time(time)}")
+        for i in range(len(split_stats)):
+            if split_stats.count[i] == 0:
+                continue
+
+            # Check for suspicious patterns
+            if split_stats.cv[i] > 15 and not is_acceleration[i]:
+                issues.append(f"High variation in Split {i+1} times (CV: {split_stats.cv[i]:.1f}%)")
+
+            # Check for outliers
+            for row in np.flatnonzero(suspicious[:, i]):
+                issues.append(
+                    f"Suspicious time for Bib {run_data[row]['bib']} in Split {i+1}: "
+                    f"{self.format_time(float(splits[row, i]))}"
+                )
 
         # Analyze finish times
-        if finish_times:
-            stats = self.calculate_split_statistics([t[0] for t in finish_times])
-            if stats and stats['coefficient_of_variation'] > 15:
-                issues.append(f"High variation in Finish times (CV: {stats['coefficient_of_variation']:.1f}%)")
+        if finish_stats.count[0] > 0 and finish_stats.cv[0] > 15:
+            issues.append(f"High variation in Finish times (CV: {finish_stats.cv[0]:.1f}%)")
 
         return issues
 
     def validate_athlete_progression(self, athlete_data):
         """
         Validates an athlete's time progression across runs.
+        Entry times are ticks; the checks work in seconds.
         Returns a list of potential issues or anomalies.
         """
         issues = []
@@ -1023,7 +946,7 @@ class TimingSystemApp:
                     len(run['splits']) > split_index and 
                     run['splits'][split_index] is not None and 
                     run['splits'][split_index] > 0):
-                    split_progression.append((run['run'], run['splits'][split_index]))
+                    split_progression.append((run['run'], to_seconds(run['splits'][split_index])))
             
             if len(split_progression) >= 2:
                 # Check for sudden time changes
@@ -1041,7 +964,7 @@ class TimingSystemApp:
         for run in athlete_data:
             if (run['status'].upper() not in ['DNS', 'ERR', 'DNF', 'DSQ'] and 
                 run['finish'] is not None and run['finish'] > 0):
-                finish_progression.append((run['run'], run['finish']))
+                finish_progression.append((run['run'], to_seconds(run['finish'])))
         
         if len(finish_progression) >= 2:
             # Check for consistent progress
@@ -1069,12 +992,14 @@ class TimingSystemApp:
     def analyze_split_relationships(self, run_data):
         """
         Analyzes relationships between splits and identifies potential timing issues.
+        Entry times are ticks; they are compared and reported in seconds.
         """
         issues = []
         
         for entry in run_data:
             if entry['status'].upper() not in ['DNS', 'ERR', 'DNF', 'DSQ']:
-                valid_splits = [s for s in entry['splits'] if s is not None and s > 0]
+                valid_splits = [to_seconds(s) for s in entry['splits'] if s is not None and s > 0]
+                finish = to_seconds(entry['finish'])
                 
                 if len(valid_splits) >= 2:
                     # Check split time relationships
@@ -1090,11 +1015,11 @@ class TimingSystemApp:
                             )
                 
                 # Check finish time relationship
-                if valid_splits and entry['finish'] is not None and entry['finish'] > 0:
-                    if entry['finish'] <= valid_splits[-1]:
+                if valid_splits and finish is not None and finish > 0:
+                    if finish <= valid_splits[-1]:
                         issues.append(
                             f"Invalid finish time for Bib {entry['bib']}: "
-                            f"Finish ({self.format_time(entry['finish'])}) <= "
+                            f"Finish ({self.format_time(finish)}) <= "
                             f"Last split ({self.format_time(valid_splits[-1])})"
                         )
         
@@ -1333,7 +1258,7 @@ class TimingSystemApp:
         current_row = 1
 
         # Session Overview
-        summary_sheet.cell(row=current_row, column=1, value="Session Overview").font = Font(bold=True, size=14)
+        summary_sheet.cell(row=current_row, column=1, value="Session Overview").font = STYLES.font(bold=True, size=14)
         current_row += 2
 
         overview_data = [
@@ -1347,7 +1272,7 @@ class TimingSystemApp:
         ]
 
         for label, value in overview_data:
-            summary_sheet.cell(row=current_row, column=1, value=label).font = Font(bold=True)
+            summary_sheet.cell(row=current_row, column=1, value=label).font = STYLES.font(bold=True)
             summary_sheet.cell(row=current_row, column=2, value=value)
             current_row += 1
 
@@ -1368,15 +1293,15 @@ class TimingSystemApp:
 
     def add_performance_highlights(self, ws, athletes_metrics, start_row):
         """Adds key performance metrics for each athlete."""
-        ws.cell(row=start_row, column=1, value="Performance Highlights").font = Font(bold=True, size=12)
+        ws.cell(row=start_row, column=1, value="Performance Highlights").font = STYLES.font(bold=True, size=12)
         start_row += 2
 
         # Headers
         headers = ['Athlete', 'Best Performance', 'Improvement Rate', 'Consistency', 'Notes']
         for col, header in enumerate(headers, start=1):
             cell = ws.cell(row=start_row, column=col, value=header)
-            cell.font = Font(bold=True)
-            cell.border = Border(bottom=Side(style='thin'))
+            cell.font = STYLES.font(bold=True)
+            cell.border = STYLES.bottom('thin')
         start_row += 1
 
         # Add metrics for each athlete
@@ -1398,7 +1323,7 @@ class TimingSystemApp:
 
     def add_progression_analysis(self, ws, data, start_row):
         """Adds detailed progression analysis."""
-        ws.cell(row=start_row, column=1, value="Training Progression Analysis").font = Font(bold=True, size=12)
+        ws.cell(row=start_row, column=1, value="Training Progression Analysis").font = STYLES.font(bold=True, size=12)
         start_row += 2
 
         run_numbers = sorted(data.keys(), key=int)
@@ -1408,8 +1333,8 @@ class TimingSystemApp:
         headers = ['Run', 'Completion Rate', 'Avg Time', 'Time Range', 'Notable Events']
         for col, header in enumerate(headers, start=1):
             cell = ws.cell(row=start_row, column=col, value=header)
-            cell.font = Font(bold=True)
-            cell.border = Border(bottom=Side(style='thin'))
+            cell.font = STYLES.font(bold=True)
+            cell.border = STYLES.bottom('thin')
         start_row += 1
 
         for run_num in run_numbers:
@@ -1491,10 +1416,12 @@ class TimingSystemApp:
                     f.write(f"• {anomaly}\n")
 
         except Exception as e:
-            print(f"Error writing validation log: {str(e)}")
+            validation_log.error("Error writing validation log: %s", e)
 
     def find_statistical_anomalies(self, data):
         """Identifies statistical anomalies across the entire session."""
+        import numpy as np
+        from split_stats import ColumnStats, run_arrays, status_mask
         anomalies = []
         
         # Analyze progression across runs
@@ -1524,11 +1451,14 @@ class TimingSystemApp:
 
         # Check for unusual patterns in splits
         for run_num, run_data in data.items():
-            split_stats = self.calculate_split_statistics(run_data)
-            if split_stats and split_stats['coefficient_of_variation'] > 15:
+            if not run_data or not self.num_splits:
+                continue
+            splits, _, statuses = run_arrays(run_data, self.num_splits)
+            split_cv = ColumnStats(splits, status_mask(statuses)).cv
+            if np.any(split_cv > 15):
                 anomalies.append(
                     f"High variation in split times for Run {run_num} "
-                    f"(CV: {split_stats['coefficient_of_variation']:.1f}%)"
+                    f"(CV: {np.nanmax(split_cv):.1f}%)"
                 )
 
         return anomalies
@@ -1749,64 +1679,153 @@ class TimingSystemApp:
         return filtered
 
     def validate_current_data(self):
-        """Performs validation on the current data."""
+        """
+        Performs validation on the current data in a background thread.
+        Progress is reported through the progress bar; Tools > Cancel Validation stops it.
+        """
+        if self.validation_task and self.validation_task.is_running():
+            return
+
         if not self.timing_data:
             messagebox.showwarning("Warning", "No data to validate")
             return
             
         self.show_progress(True, "Validating data...")
-        
-        # Collect all validation results
-        errors = {
-            "Time Validation": [],
-            "Progression Errors": [],
-            "Statistical Anomalies": [],
-            "Data Consistency": []
-        }
-        
-        total_steps = len(self.timing_data) * 2  # Multiple validation passes
-        current_step = 0
-        
-        # Validate each run
-        for run_num, run_data in self.timing_data.items():
-            # Time validation
-            validation_errors = self.validate_run_consistency(run_data)
-            if validation_errors:
-                errors["Time Validation"].extend(
-                    [f"Run {run_num}: {error}" for error in validation_errors]
-                )
-            
-            current_step += 1
-            self.update_progress(
-                (current_step / total_steps) * 100,
-                f"Validating run {run_num}..."
-            )
-            
-            # Statistical validation
-            anomalies = self.analyze_split_relationships(run_data)
-            if anomalies:
-                errors["Statistical Anomalies"].extend(
-                    [f"Run {run_num}: {anomaly}" for anomaly in anomalies]
-                )
-            
-            current_step += 1
-            self.update_progress(
-                (current_step / total_steps) * 100,
-                f"Analyzing run {run_num}..."
+
+        # The worker gets its own copy of the run lists; the UI may reload data meanwhile
+        runs = {run_num: list(run_data) for run_num, run_data in self.timing_data.items()}
+
+        def work(task):
+            # Collect all validation results
+            errors = {
+                "Time Validation": [],
+                "Progression Errors": [],
+                "Statistical Anomalies": [],
+                "Data Consistency": []
+            }
+
+            total_steps = len(runs) * 2  # Multiple validation passes
+            current_step = 0
+
+            # Validate each run
+            for run_num, run_data in runs.items():
+                # Time validation
+                validation_errors = self.validate_run_consistency(run_data)
+                if validation_errors:
+                    errors["Time Validation"].extend(
+                        [f"Run {run_num}: {error}" for error in validation_errors]
+                    )
+
+                current_step += 1
+                task.report((current_step / total_steps) * 100, f"Validating run {run_num}...")
+
+                # Statistical validation
+                anomalies = self.analyze_split_relationships(run_data)
+                if anomalies:
+                    errors["Statistical Anomalies"].extend(
+                        [f"Run {run_num}: {anomaly}" for anomaly in anomalies]
+                    )
+
+                current_step += 1
+                task.report((current_step / total_steps) * 100, f"Analyzing run {run_num}...")
+
+            return errors
+
+        def on_done(errors):
+            self.validation_task = None
+
+            # Update status indicators
+            total_errors = sum(len(err_list) for err_list in errors.values())
+            self.update_validation_status(
+                "Valid" if total_errors == 0 else "Invalid",
+                total_errors
             )
-        
-        # Update status indicators
-        total_errors = sum(len(err_list) for err_list in errors.values())
-        self.update_validation_status(
-            "Valid" if total_errors == 0 else "Invalid",
-            total_errors
-        )
-        
-        # Show error details if any
-        if total_errors > 0:
-            self.show_error_details(errors)
-        
-        self.show_progress(False)
+            validation_log.info("Validation found %d issues", total_errors,
+                                extra={'fields': {name: len(err_list) for name, err_list in errors.items()}})
+
+            # Show error details if any
+            if total_errors > 0:
+                self.show_error_details(errors)
+
+            self.show_progress(False)
+
+        def on_error(error):
+            self.validation_task = None
+            self.show_progress(False)
+            validation_log.error("Validation failed: %s", error)
+            messagebox.showerror("Error", f"Validation failed: {str(error)}")
+
+        def on_cancelled():
+            self.validation_task = None
+            self.show_progress(False)
+            self.update_validation_status("Not Validated")
+
+        self.validation_task = BackgroundTask(
+            self.root, work, on_done, self.update_progress, on_error, on_cancelled
+        ).start()
+
+    def finish_export_profile(self, output_path):
+        """Keeps the export's timings for the report window and saves them as JSON."""
+        self.last_export_profile = self.profiler
+        try:
+            self.profiler.dump(os.path.splitext(os.path.basename(output_path))[0])
+        except OSError as e:
+            export_log.warning("Could not save export timings: %s", e)
+        self.refresh_timing_report()
+
+    def toggle_timing_report(self):
+        """Shows or hides the timing report window to match the View menu check."""
+        if not self.show_timing_report_var.get():
+            if self.timing_report_window is not None and self.timing_report_window.winfo_exists():
+                self.timing_report_window.destroy()
+            self.timing_report_window = None
+            return
+
+        self.timing_report_window = tk.Toplevel(self.root)
+        self.timing_report_window.title("Timing Report")
+        self.timing_report_window.geometry("640x480")
+
+        def on_close():
+            self.show_timing_report_var.set(False)
+            self.toggle_timing_report()
+
+        self.timing_report_window.protocol("WM_DELETE_WINDOW", on_close)
+
+        self.timing_report_text = tk.Text(self.timing_report_window, wrap=tk.NONE, font=("Courier", 10))
+        scrollbar = tk.Scrollbar(self.timing_report_window, command=self.timing_report_text.yview)
+        self.timing_report_text.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.timing_report_text.pack(fill=tk.BOTH, expand=True)
+        self.refresh_timing_report()
+
+    def refresh_timing_report(self):
+        """Shows the startup and last export timings in the report window, if it is open."""
+        if self.timing_report_window is None or not self.timing_report_window.winfo_exists():
+            return
+
+        reports = [self.startup_profile.report()]
+        if self.last_export_profile is not None:
+            reports.append(self.last_export_profile.report())
+        else:
+            reports.append("No export yet.")
+
+        self.timing_report_text.configure(state=tk.NORMAL)
+        self.timing_report_text.delete("1.0", tk.END)
+        self.timing_report_text.insert(tk.END, "\n\n".join(reports))
+        self.timing_report_text.configure(state=tk.DISABLED)
+
+    def toggle_log_window(self):
+        """Shows or hides the log window to match the View menu check."""
+        if self.log_window is not None and self.log_window.exists():
+            if not self.show_log_var.get():
+                self.log_window.close()
+            return
+        if self.show_log_var.get():
+            self.log_window = LogWindow(self.root, on_close=lambda: self.show_log_var.set(False))
+
+    def cancel_validation(self):
+        if self.validation_task:
+            self.validation_task.cancel()
 
     def create_menu_system(self):
         """Creates the main menu system."""
@@ -1840,11 +1859,18 @@ class TimingSystemApp:
         view_menu.add_checkbutton(label="Show Statistics", 
                                 variable=self.show_statistics_var,
                                 command=self.toggle_statistics)
+        view_menu.add_checkbutton(label="Show Timing Report",
+                                variable=self.show_timing_report_var,
+                                command=self.toggle_timing_report)
+        view_menu.add_checkbutton(label="Show Log",
+                                variable=self.show_log_var,
+                                command=self.toggle_log_window)
 
         # Tools Menu
         tools_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Tools", menu=tools_menu)
         tools_menu.add_command(label="Validate Data", command=self.validate_current_data)
+        tools_menu.add_command(label="Cancel Validation", command=self.cancel_validation)
         tools_menu.add_command(label="Export Error Log", command=self.export_error_log_dialog)
         tools_menu.add_separator()
         tools_menu.add_command(label="Analysis Options...", command=self.show_analysis_options)
@@ -2101,16 +2127,18 @@ timing data from skiing training sessions.
                 return
 
             # Check for bib number conflicts
-            if str(new_bib) != athlete['bib']:  # Only check if bib changed
+            if new_bib != int(athlete['bib']):  # Only check if bib changed
                 if self.check_bib_conflict(new_bib):
                     messagebox.showerror("Error", "Bib number already in use")
                     return
 
             # Update athlete data
+            self.unindex_athlete(athlete, self.current_team)
             athlete['name'] = name_var.get()
             athlete['bib'] = str(new_bib)
             athlete['category'] = category_var.get()
             athlete['notes'] = notes_text.get('1.0', 'end-1c')
+            self.index_athlete(athlete, self.current_team)
 
             # Save changes
             self.save_athletes_to_json()
@@ -2166,7 +2194,7 @@ timing data from skiing training sessions.
                 messagebox.showerror("Error", "Invalid bib number")
                 return
 
-            if self.check_bib_conflict(new_bib, exclude_guest=guest['bib']):
+            if self.check_bib_conflict(new_bib, exclude_guest=guest):
                 messagebox.showerror("Error", "Bib number already in use")
                 return
 
@@ -2181,9 +2209,10 @@ timing data from skiing training sessions.
             # Add to selected team
             selected_team = team_var.get()
             self.athletes[selected_team].append(new_athlete)
+            self.index_athlete(new_athlete, selected_team)
 
             # Remove from guests
-            self.temp_guests.pop(guest_index)
+            self.unindex_guest(self.temp_guests.pop(guest_index))
 
             # Update displays
             self.save_athletes_to_json()
@@ -2433,10 +2462,12 @@ timing data from skiing training sessions.
         
     def create_formatted_excel(self, output_path):
         """Creates a formatted Excel file with comprehensive timing data analysis."""
+        from openpyxl import Workbook
         if not hasattr(self, 'timing_data') or not self.timing_data:
             messagebox.showerror("Error", "No timing data to export")
             return False
 
+        self.profiler = Profiler(f"Export {os.path.basename(output_path)}")
         try:
             wb = Workbook()
             main_sheet = wb.active
@@ -2451,59 +2482,56 @@ timing data from skiing training sessions.
                 main_sheet.column_dimensions[col].width = width
             
             # Write header section
-            current_row = self.write_header_section(main_sheet, styles)
+            with self.profiler.span('write_header_section'):
+                current_row = self.write_header_section(main_sheet, styles)
             
             # Process each run's data
             for run_number in sorted(self.timing_data.keys(), key=int):
                 run_data = self.timing_data[run_number]
-                current_row = self.write_run_data(main_sheet, run_data, current_row, styles)
+                with self.profiler.span('write_run_data', rows=len(run_data)):
+                    current_row = self.write_run_data(main_sheet, run_data, current_row, styles)
                 current_row += 2  # Add spacing between runs
             
             # Create additional sheets
-            self.create_athlete_analysis_sheet(wb, styles)
-            self.create_category_sheet(wb, styles)
-            self.create_statistics_sheet(wb, styles)
+            with self.profiler.span('create_athlete_analysis_sheet'):
+                self.create_athlete_analysis_sheet(wb, styles)
+            with self.profiler.span('create_category_sheet'):
+                self.create_category_sheet(wb, styles)
+            with self.profiler.span('create_statistics_sheet'):
+                self.create_statistics_sheet(wb, styles)
             
             # Save the workbook
-            wb.save(output_path)
+            with self.profiler.span('save'):
+                wb.save(output_path)
+            self.finish_export_profile(output_path)
             return True
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to create Excel file: {str(e)}")
-            print(f"Excel creation error: {str(e)}")  # For debugging
+            export_log.error("Excel creation error: %s", e, extra={'fields': {'output': output_path}})
             return False
 
     def create_excel_styles(self):
         """Creates and returns a dictionary of Excel styles."""
         styles = {
-            'title': Font(name='Arial', size=18, bold=True),
-            'header': Font(name='Arial', size=11, bold=True),
-            'normal': Font(name='Arial', size=11),
-            'error': Font(name='Arial', size=11, color="FF0000"),
+            'title': STYLES.font(name='Arial', size=18, bold=True),
+            'header': STYLES.font(name='Arial', size=11, bold=True),
+            'normal': STYLES.font(name='Arial', size=11),
+            'error': STYLES.font(name='Arial', size=11, color="FF0000"),
             
             'borders': {
-                'thick': Border(
-                    left=Side(style='thick'),
-                    right=Side(style='thick'),
-                    top=Side(style='thick'),
-                    bottom=Side(style='thick')
-                ),
-                'thin': Border(
-                    left=Side(style='thin'),
-                    right=Side(style='thin'),
-                    top=Side(style='thin'),
-                    bottom=Side(style='thin')
-                )
+                'thick': STYLES.box('thick'),
+                'thin': STYLES.box('thin')
             },
             
             'alignments': {
-                'center': Alignment(horizontal='center', vertical='center'),
-                'left': Alignment(horizontal='left', vertical='center')
+                'center': STYLES.alignment(horizontal='center', vertical='center'),
+                'left': STYLES.alignment(horizontal='left', vertical='center')
             },
             
             'fills': {
-                'header': PatternFill(start_color="E6E6E6", end_color="E6E6E6", fill_type="solid"),
-                'category': PatternFill(start_color="CCE5FF", end_color="CCE5FF", fill_type="solid")
+                'header': STYLES.fill("E6E6E6"),
+                'category': STYLES.fill("CCE5FF")
             }
         }
         return styles
@@ -2604,14 +2632,12 @@ timing data from skiing training sessions.
             cell.fill = styles['fills']['header']
         current_row += 1
 
-        # Process and collect valid times
-        split_data = self.collect_valid_times(run_data)
-        finish_data = self.collect_finish_times(run_data)
+        # Rank every split and the finish once for the whole run
+        ranking = self.build_run_ranking(run_data)
 
         # Write athlete data rows
         for entry in run_data:
-            current_row = self.write_athlete_row(ws, entry, split_data, finish_data, 
-                                            current_row, styles)
+            current_row = self.write_athlete_row(ws, entry, ranking, current_row, styles)
             
             # Add error details if present
             if entry['error_details']:
@@ -2654,12 +2680,16 @@ timing data from skiing training sessions.
         
         return finish_data
 
+    def build_run_ranking(self, run_data):
+        """Builds the split and finish rankings for a run, shared by all writers of that run."""
+        return RunRanking(self.collect_valid_times(run_data), self.collect_finish_times(run_data))
+
     def is_valid_split_progression(self, splits):
         """Verifies that split times progress logically."""
         valid_splits = [s for s in splits if s is not None and s > 0]
         return all(valid_splits[i] > valid_splits[i-1] for i in range(1, len(valid_splits)))
 
-    def write_athlete_row(self, ws, entry, split_data, finish_data, current_row, styles):
+    def write_athlete_row(self, ws, entry, ranking, current_row, styles):
         """Writes a single athlete's row with proper formatting."""
         bib = entry['bib']
         status = entry['status'].upper()
@@ -2681,10 +2711,9 @@ timing data from skiing training sessions.
         for split_idx, split in enumerate(entry['splits']):
             if split is not None and split > 0:
                 # Get best split and rank
-                best_split = split_data[split_idx][0][0] if split_data[split_idx] else None
-                split_diff = split - best_split if best_split is not None else None
-                split_rank = next((i + 1 for i, (_, b) in enumerate(split_data[split_idx]) 
-                                if b == bib), '')
+                split_ranking = ranking.split(split_idx)
+                split_diff = split - split_ranking.best if split_ranking.best is not None else None
+                split_rank = split_ranking.rank(bib)
                 
                 # Write split time
                 time_cell = ws.cell(row=current_row, column=current_col, 
@@ -2705,8 +2734,8 @@ timing data from skiing training sessions.
                 if split_rank:
                     gradient_color = self.get_gradient_color(
                         split_rank - 1,
-                        len(split_data[split_idx]),
-                        opacity=0.6 if split_idx == 0 else 0.5
+                        len(split_ranking),
+                        self.split_gradient_scheme(split_idx)
                     )
                     time_cell.fill = gradient_color
             
@@ -2714,10 +2743,9 @@ timing data from skiing training sessions.
         
         # Write finish data
         if status not in ['DNF', 'DSQ', 'DNS', 'ERR'] and entry['finish'] is not None:
-            best_finish = finish_data[0][0] if finish_data else None
+            best_finish = ranking.finish.best
             finish_diff = entry['finish'] - best_finish if best_finish is not None else None
-            finish_rank = next((i + 1 for i, (_, b) in enumerate(finish_data) 
-                            if b == bib), '')
+            finish_rank = ranking.finish.rank(bib)
             
             # Finish time
             finish_cell = ws.cell(row=current_row, column=current_col, 
@@ -2733,8 +2761,7 @@ timing data from skiing training sessions.
             if finish_rank:
                 finish_cell.fill = self.get_gradient_color(
                     finish_rank - 1,
-                    len(finish_data),
-                    opacity=0.5
+                    len(ranking.finish)
                 )
         
         # Status
@@ -2869,7 +2896,7 @@ timing data from skiing training sessions.
         }
         
         for run_num, run_data in sorted(self.timing_data.items()):
-            entry = next((e for e in run_data if int(e['bib']) == bib), None)
+            entry = next((e for e in run_data if e['bib'] == bib), None)
             if entry:
                 run_info = {
                     'run': int(run_num),
@@ -3147,18 +3174,19 @@ timing data from skiing training sessions.
                     if entry['status'].upper() not in ['DNF', 'DSQ', 'DNS', 'ERR']]
         valid_data.sort(key=lambda x: x['finish'] if x['finish'] is not None else float('inf'))
         
-        # Get best times for comparisons
-        best_split = min((entry['splits'][0] for entry in valid_data 
-                        if entry['splits'] and entry['splits'][0] is not None),
-                        default=None)
-        best_finish = min((entry['finish'] for entry in valid_data 
-                        if entry['finish'] is not None),
-                        default=None)
+        # Rank the category once; best times come from the same rankings
+        split_ranking = Ranking((entry['splits'][0], entry['bib']) for entry in valid_data
+                                if entry['splits'] and entry['splits'][0] is not None)
+        finish_ranking = Ranking((entry['finish'], entry['bib']) for entry in valid_data
+                                 if entry['finish'] is not None)
+        best_split = split_ranking.best
+        best_finish = finish_ranking.best
         
         # Write athlete data
-        for rank, entry in enumerate(valid_data, 1):
+        for entry in valid_data:
             current_row = self.write_category_athlete_row(
-                ws, entry, rank, best_split, best_finish, current_row, styles)
+                ws, entry, finish_ranking.rank(entry['bib'], None), best_split, best_finish,
+                current_row, styles)
         
         # Write DNF/DSQ entries
         other_data = [entry for entry in data if entry not in valid_data]
@@ -3394,7 +3422,7 @@ timing data from skiing training sessions.
         current_row += 1
         
         # Collect split times across all runs
-        split_stats = self.calculate_split_statistics(split_idx)
+        split_stats = self.calculate_session_split_statistics(split_idx)
         
         # Write statistics
         stats_rows = [
@@ -3478,6 +3506,34 @@ timing data from skiing training sessions.
         
         return current_row
 
+    def calculate_session_split_statistics(self, split_idx):
+        """Statistics for one split across every run of the session, for the statistics sheet."""
+        import numpy as np
+        from split_stats import ColumnStats, run_arrays, status_mask
+        all_splits = []
+        all_statuses = []
+        for run_data in self.timing_data.values():
+            if run_data:
+                splits, _, statuses = run_arrays(run_data, self.num_splits)
+                all_splits.append(splits[:, split_idx])
+                all_statuses.append(statuses)
+
+        times = np.concatenate(all_splits) if all_splits else np.empty(0)
+        statuses = np.concatenate(all_statuses) if all_statuses else np.empty(0, dtype=object)
+        stats = ColumnStats(times, status_mask(statuses, ['DNS', 'ERR']))
+
+        valid_count = int(stats.count[0])
+        cv = stats.cv[0]
+        return {
+            'best_time': float(stats.min[0]) if valid_count else None,
+            'avg_time': float(stats.mean[0]) if valid_count else None,
+            'std_dev': float(stats.std_dev[0]) if valid_count else 0.0,
+            'consistency_score': max(0.0, 100.0 - float(cv)) if valid_count and not np.isnan(cv) else 0.0,
+            'valid_count': valid_count,
+            'invalid_rate': (1 - valid_count / len(times)) * 100 if len(times) else 0.0,
+            'is_acceleration_split': bool(valid_count and stats.mean[0] < 5.0 and stats.std_dev[0] < 0.5)
+        }
+
     def calculate_session_statistics(self):
         """Calculates overall session statistics."""
         total_athletes = 0
@@ -3563,71 +3619,21 @@ timing data from skiing training sessions.
         
         return current_row
 
-    def get_gradient_color(self, index, total, opacity=0.5):
+    def get_gradient_color(self, index, total, scheme='normal', opacity=None):
         """
-        Enhanced gradient color generator with better color ranges and opacity control.
+        Returns the gradient fill for a ranked time from the shared palette cache.
         
         Args:
             index: Position in sequence (0 = best)
             total: Total number of items
-            opacity: Opacity level (0.0 to 1.0)
+            scheme: 'normal', or 'acceleration' for the first split
+            opacity: Opacity level (0.0 to 1.0), the scheme's default when None
         """
-        if total <= 1:
-            # Single entry - light green
-            base_color = (144, 238, 144)  # Light green
-            bg_color = (255, 255, 255)    # White background
-            r = int(base_color[0] * opacity + bg_color[0] * (1 - opacity))
-            g = int(base_color[1] * opacity + bg_color[1] * (1 - opacity))
-            b = int(base_color[2] * opacity + bg_color[2] * (1 - opacity))
-            hex_color = f"{r:02x}{g:02x}{b:02x}".upper()
-            return PatternFill(start_color=hex_color, end_color=hex_color, fill_type='solid')
-
-        # Color definitions for different types of splits
-        color_schemes = {
-            'normal': [
-                (144, 238, 144),  # Light green
-                (255, 230, 102),  # Warm yellow
-                (255, 165, 0),    # Orange
-                (255, 99, 71),    # Tomato red
-                (255, 64, 64)     # Bright red
-            ],
-            'acceleration': [
-                (135, 206, 250),  # Light blue
-                (100, 149, 237),  # Cornflower blue
-                (65, 105, 225),   # Royal blue
-                (0, 0, 205),      # Medium blue
-                (0, 0, 139)       # Dark blue
-            ]
-        }
+        return STYLES.gradient_fill(index, total, scheme, opacity)
 
-        # Select color scheme based on opacity
-        # Use acceleration scheme for first split (opacity > 0.55)
-        colors = color_schemes['acceleration'] if opacity > 0.55 else color_schemes['normal']
-        
-        # Calculate position in gradient
-        position = index / (total - 1)
-        num_segments = len(colors) - 1
-        segment_length = 1.0 / num_segments
-        segment_index = min(int(position / segment_length), num_segments - 1)
-        segment_position = (position - (segment_index * segment_length)) / segment_length
-        
-        # Interpolate between colors
-        color1 = colors[segment_index]
-        color2 = colors[segment_index + 1]
-        
-        # Calculate interpolated color
-        r = int(color1[0] + (color2[0] - color1[0]) * segment_position)
-        g = int(color1[1] + (color2[1] - color1[1]) * segment_position)
-        b = int(color1[2] + (color2[2] - color1[2]) * segment_position)
-        
-        # Apply opacity
-        bg_color = (255, 255, 255)  # White background
-        r = int(r * opacity + bg_color[0] * (1 - opacity))
-        g = int(g * opacity + bg_color[0] * (1 - opacity))
-        b = int(b * opacity + bg_color[0] * (1 - opacity))
-        
-        hex_color = f"{r:02x}{g:02x}{b:02x}".upper()
-        return PatternFill(start_color=hex_color, end_color=hex_color, fill_type='solid')
+    def split_gradient_scheme(self, split_idx):
+        """The first split is usually the acceleration split and gets the blue scheme."""
+        return 'acceleration' if split_idx == 0 else 'normal'
 
     def get_category_color(self, category_type):
         """Returns consistent colors for different categories."""
@@ -3661,17 +3667,13 @@ timing data from skiing training sessions.
         # Apply specific styles based on type
         if style_type == 'header':
             cell.font = styles['header']
-            cell.fill = PatternFill(start_color=self.get_category_color('header'), 
-                                end_color=self.get_category_color('header'), 
-                                fill_type='solid')
+            cell.fill = STYLES.fill(self.get_category_color('header'))
             cell.border = styles['borders']['thick']
         elif style_type == 'data':
             cell.font = styles['normal']
         elif style_type == 'alert':
             cell.font = styles['error']
-            cell.fill = PatternFill(start_color=self.get_category_color('alert'), 
-                                end_color=self.get_category_color('alert'), 
-                                fill_type='solid')
+            cell.fill = STYLES.fill(self.get_category_color('alert'))
         elif style_type == 'time':
             cell.font = styles['normal']
             cell.number_format = '[h]:mm:ss.000'
@@ -3726,51 +3728,28 @@ timing data from skiing training sessions.
         """Creates comprehensive style dictionary for Excel formatting."""
         styles = {
             'fonts': {
-                'title': Font(name='Arial', size=18, bold=True),
-                'header': Font(name='Arial', size=11, bold=True),
-                'normal': Font(name='Arial', size=11),
-                'error': Font(name='Arial', size=11, color="FF0000"),
-                'alert': Font(name='Arial', size=11, color="FF6B00"),
-                'success': Font(name='Arial', size=11, color="008000")
+                'title': STYLES.font(name='Arial', size=18, bold=True),
+                'header': STYLES.font(name='Arial', size=11, bold=True),
+                'normal': STYLES.font(name='Arial', size=11),
+                'error': STYLES.font(name='Arial', size=11, color="FF0000"),
+                'alert': STYLES.font(name='Arial', size=11, color="FF6B00"),
+                'success': STYLES.font(name='Arial', size=11, color="008000")
             },
             'borders': {
-                'thick': Border(
-                    left=Side(style='thick'),
-                    right=Side(style='thick'),
-                    top=Side(style='thick'),
-                    bottom=Side(style='thick')
-                ),
-                'thin': Border(
-                    left=Side(style='thin'),
-                    right=Side(style='thin'),
-                    top=Side(style='thin'),
-                    bottom=Side(style='thin')
-                ),
-                'none': Border(
-                    left=Side(style='none'),
-                    right=Side(style='none'),
-                    top=Side(style='none'),
-                    bottom=Side(style='none')
-                )
+                'thick': STYLES.box('thick'),
+                'thin': STYLES.box('thin'),
+                'none': STYLES.box('none')
             },
             'alignments': {
-                'center': Alignment(horizontal='center', vertical='center'),
-                'left': Alignment(horizontal='left', vertical='center'),
-                'right': Alignment(horizontal='right', vertical='center')
+                'center': STYLES.alignment(horizontal='center', vertical='center'),
+                'left': STYLES.alignment(horizontal='left', vertical='center'),
+                'right': STYLES.alignment(horizontal='right', vertical='center')
             },
             'fills': {
-                'header': PatternFill(start_color="E6E6E6", 
-                                    end_color="E6E6E6", 
-                                    fill_type="solid"),
-                'alert': PatternFill(start_color="FFD9D9", 
-                                end_color="FFD9D9", 
-                                fill_type="solid"),
-                'success': PatternFill(start_color="D9FFD9", 
-                                    end_color="D9FFD9", 
-                                    fill_type="solid"),
-                'neutral': PatternFill(start_color="F2F2F2", 
-                                    end_color="F2F2F2", 
-                                    fill_type="solid")
+                'header': STYLES.fill("E6E6E6"),
+                'alert': STYLES.fill("FFD9D9"),
+                'success': STYLES.fill("D9FFD9"),
+                'neutral': STYLES.fill("F2F2F2")
             }
         }
         return styles
@@ -3804,7 +3783,57 @@ timing data from skiing training sessions.
 
 
 
+    def add_athlete_to_memory(self, athlete_name):
+        """Adds an athlete name to recent names memory, ensuring a maximum of 2000 entries."""
+        self.name_index.add(athlete_name)
+        self.names_journal.append(athlete_name, self.name_index.names)
+
+    def save_recent_names(self):
+        """Compacts the recent names journal down to the current list, one name per line."""
+        self.names_journal.compact(self.name_index.names())
+
+    def load_recent_names(self):
+        """Loads the recent names journal into the autocomplete index, keeping names added since startup."""
+        with self.startup_profile.span('load_recent_names') as span:
+            self.name_index.load(self.names_journal.read() + self.name_index.names())
+            span['rows'] = len(self.name_index)
+
+    def clear_recent_names(self):
+        """Forgets all remembered athlete names."""
+        self.name_index.clear()
+        self.save_recent_names()
+
+    def add_hill_to_memory(self, hill_name):
+        """Adds a hill name to recent hills memory, ensuring a maximum of 10000 entries."""
+        self.hill_index.add(hill_name)
+        self.hills_journal.append(hill_name, self.hill_index.hills)
+
+    def save_recent_hills(self):
+        """Compacts the recent hills journal down to the current list, one hill per line."""
+        self.hills_journal.compact(self.hill_index.hills())
+
+    def load_recent_hills(self):
+        """Loads the recent hills journal into the hill index, keeping hills added since startup."""
+        with self.startup_profile.span('load_recent_hills') as span:
+            self.hill_index.load(self.hills_journal.read() + self.hill_index.hills())
+            span['rows'] = len(self.hill_index)
+
+    def clear_recent_hills(self):
+        """Forgets all remembered hill names."""
+        self.hill_index.clear()
+        self.save_recent_hills()
+
+    def get_hill_name_matches(self, input_text):
+        """
+        Returns up to 3 hill names matching the start of the name or of any word in it.
+        """
+        return self.hill_index.search(input_text, limit=3)
+
     def autocomplete_athlete_name(self, event):
+        """Refreshes the athlete name suggestions once typing pauses."""
+        self.scheduler.debounce('athlete_name', self.refresh_athlete_suggestions)
+
+    def refresh_athlete_suggestions(self):
         """
         Fixed autocomplete that works with new UI.
         """
@@ -3819,15 +3848,11 @@ timing data from skiing training sessions.
             self.autocomplete_listbox.grid_remove()
             return
         
-        # Filter suggestions
-        suggestions = [name for name in reversed(self.recent_names) 
-                    if name.lower().startswith(input_text)]
-        suggestions = suggestions[:3]  # Limit to 3 suggestions
+        # Most recent names with a word starting with the input text, ignoring accents
+        suggestions = self.name_index.search(input_text, limit=3)
         
         if suggestions:
-            self.autocomplete_listbox.delete(0, tk.END)
-            for suggestion in suggestions:
-                self.autocomplete_listbox.insert(tk.END, suggestion)
+            update_listbox(self.autocomplete_listbox, suggestions)
                 
             # Position and show listbox
             self.autocomplete_listbox.grid(
@@ -3841,242 +3866,116 @@ timing data from skiing training sessions.
     def parse_csv_file(self, file_path):
         """
         Initial CSV file parsing to get session info and detect splits structure.
+        Indexes the sessions in the file without reading their rows and uses the first.
         """
         try:
-            with open(file_path, 'r') as file:
-                lines = file.readlines()
-                separator = '>'
-                
-                # Initialize variables
-                session_info = {
-                    'session': "",
-                    'date': "",
-                    'time': "",
-                    'splits': []  # Will store detected split columns
-                }
-                
-                # First pass: Find header and detect splits
-                header_line_idx = -1
-                for i, line in enumerate(lines[:20]):  # Check first 20 lines
-                    line = line.strip()
-                    if not line:
-                        continue
-                        
-                    parts = line.split(separator)
-                    
-                    # Look for session info
-                    if "Session #" in line:
-                        session_info['session'] = parts[1].strip('#').strip()
-                    elif "Date" == parts[0]:
-                        # Convert date format if needed
-                        date_str = parts[1].strip()
-                        try:
-                            date_obj = datetime.strptime(date_str, '%m/%d/%y')
-                            session_info['date'] = date_obj.strftime('%d/%m/%Y')
-                        except:
-                            session_info['date'] = date_str
-                    elif "Time" == parts[0]:
-                        session_info['time'] = parts[1].strip()
-                    
-                    # Detect header line and split columns
-                    if "Bib#" in line:
-                        header_line_idx = i
-                        headers = [h.lower().strip() for h in parts]
-                        
-                        # Find all split columns
-                        for idx, header in enumerate(headers):
-                            if "split" in header:
-                                split_num = ''.join(filter(str.isdigit, header))
-                                if split_num:  # If there's a number in the split header
-                                    session_info['splits'].append({
-                                        'index': idx,
-                                        'number': int(split_num)
-                                    })
-                        
-                        # Sort splits by their number
-                        session_info['splits'].sort(key=lambda x: x['number'])
-                        break
-                
-                # Set the number of splits for the app
-                self.num_splits = len(session_info['splits'])
-                
-                # Update UI with session info
-                self.date_var.set(session_info['date'])
-                self.time_var.set(session_info['time'])
-                self.session_var.set(session_info['session'])
-                
-                return session_info
-                
+            sessions = index_sessions(file_path)
+            if not sessions:
+                raise ValueError("No Bib#/Run# header line found")
+            if len(sessions) > 1:
+                parse_log.info("%s holds %d sessions; using the first", os.path.basename(file_path), len(sessions))
+            self.session_span = sessions[0]
+
+            session_info = {
+                'session': self.session_span.session,
+                'date': self.session_span.date,
+                'time': self.session_span.time,
+                'splits': [  # Detected split columns
+                    {'index': index, 'number': number}
+                    for number, index in self.session_span.layout.splits
+                ]
+            }
+
+            # Set the number of splits for the app
+            self.num_splits = len(session_info['splits'])
+
+            # Update UI with session info
+            self.date_var.set(session_info['date'])
+            self.time_var.set(session_info['time'])
+            self.session_var.set(session_info['session'])
+
+            return session_info
+
         except Exception as e:
-            print(f"Error reading file: {str(e)}")
+            parse_log.error("Error reading file: %s", e, extra={'fields': {'file': file_path}})
             messagebox.showerror("Error", f"Error reading file: {str(e)}")
             return None
 
     def parse_timing_data(self, file_path):
         """
         Enhanced parsing of timing data handling multiple splits.
+        Entries are row views over a columnar TimingTable, with times in integer
+        ticks so ranking, ties and differences are exact. Each run is validated
+        and sorted by validate_run_data.
         """
         timing_data = {}
-        header_found = False
-        column_indices = {}
-        split_columns = []
-        
+
         try:
-            with open(file_path, 'r') as file:
-                lines = file.readlines()
-                separator = '>'
-                
-                for line in lines:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    # Find header and map columns
-                    if not header_found and "Bib#" in line:
-                        header_found = True
-                        headers = [h.lower().strip() for h in line.split(separator)]
-                        
-                        for i, header in enumerate(headers):
-                            if "bib" in header:
-                                column_indices['bib'] = i
-                            elif "run" in header:
-                                column_indices['run'] = i
-                            elif "finish time" in header:
-                                column_indices['finish'] = i
-                            elif "status" in header:
-                                column_indices['status'] = i
-                            elif "split" in header:
-                                split_columns.append(i)
-                        
-                        self.num_splits = len(split_columns)  # Update number of splits
-                        continue
-                    
-                    # Process data lines
-                    if header_found:
-                        data = line.split(separator)
-                        if len(data) <= 1:
-                            continue
-                        
-                        try:
-                            # Get run number
-                            run_number = data[column_indices['run']].strip()
-                            if not run_number:
-                                continue
-                            
-                            # Initialize run in timing data
-                            if run_number not in timing_data:
-                                timing_data[run_number] = []
-                            
-                            # Process split times
-                            splits = []
-                            valid_split_count = 0
-                            
-                            for split_col in split_columns:
-                                if split_col < len(data):
-                                    split_time = self.validate_time(data[split_col].strip())
-                                    splits.append(split_time)
-                                    if split_time is not None and split_time > 0:
-                                        valid_split_count += 1
-                                else:
-                                    splits.append(None)
-                            
-                            # Create entry
-                            entry = {
-                                'bib': data[column_indices['bib']].strip(),
-                                'splits': splits,
-                                'valid_splits': valid_split_count,
-                                'finish': self.validate_time(
-                                    data[column_indices['finish']].strip() 
-                                    if 'finish' in column_indices and 
-                                    column_indices['finish'] < len(data) 
-                                    else ''
-                                ),
-                                'status': data[column_indices.get('status', -1)].strip() 
-                                        if 'status' in column_indices and 
-                                            column_indices['status'] < len(data) 
-                                        else '',
-                                'run': run_number
-                            }
-                            
-                            # Add entry only if it has valid data
-                            if entry['valid_splits'] > 0 or entry['finish'] is not None:
-                                timing_data[run_number].append(entry)
-                            
-                        except IndexError as e:
-                            print(f"Error processing line: {line}")
-                            print(f"Error details: {str(e)}")
-                            continue
-                
-                if not timing_data:
-                    messagebox.showerror("Error", "No valid timing data found in the file.")
-                    return None
-                
-                return timing_data
-                
+            table = load_timing_table(file_path, TimeTokenParser(zero_is_missing=True), self.session_span)
+            self.num_splits = table.num_splits  # Update number of splits
+
+            # Rows with a non-numeric bib or run and unreadable time cells are
+            # logged by load_timing_table; rows without any time are dropped here
+            skipped_lines = 0
+            for entry in table.entries():
+                # Add entry only if it has valid data
+                if entry['valid_splits'] > 0 or entry['finish'] is not None:
+                    timing_data.setdefault(entry['run'], []).append(entry)
+                else:
+                    skipped_lines += 1
+                    if parse_log.isEnabledFor(logging.DEBUG):
+                        parse_log.debug("Skipping row without any time",
+                                        extra={'fields': {'bib': entry['bib'], 'run': entry['run']}})
+
+            if skipped_lines:
+                parse_log.warning("Skipped %d rows without any time in %s", skipped_lines,
+                                  os.path.basename(file_path),
+                                  extra={'fields': {'file': file_path, 'skipped': skipped_lines}})
+
+            # Validate each run in one batched pass; failing entries become ERR
+            for run_number in timing_data:
+                timing_data[run_number] = self.validate_run_data(timing_data[run_number])
+
+            if not timing_data:
+                parse_log.warning("No valid timing data in %s", os.path.basename(file_path))
+                messagebox.showerror("Error", "No valid timing data found in the file.")
+                return None
+
+            return timing_data
+
         except Exception as e:
+            parse_log.error("Error parsing CSV file: %s", e, extra={'fields': {'file': file_path}})
             messagebox.showerror("Error", f"Error parsing CSV file: {str(e)}")
             return None
 
     def validate_time(self, time_str):
         """
         Enhanced time validation handling multiple time formats.
+        Returns seconds, or None for empty, status (DNF/DSQ/DNS), '0' or malformed values.
         """
         if not time_str or not isinstance(time_str, str):
             return None
-        
-        time_str = time_str.strip().upper()
-        if time_str in ['DNF', 'DSQ', '', 'DNS', '0']:
-            return None
-        
-        try:
-            if ':' in time_str:
-                # Handle MM:SS.sss format
-                parts = time_str.split(':')
-                if len(parts) != 2:
-                    return None
-                    
-                minutes = float(parts[0])
-                
-                # Handle seconds with potential milliseconds
-                if '.' in parts[1]:
-                    seconds, milliseconds = parts[1].split('.')
-                    return (minutes * 60) + float(seconds) + (float(milliseconds) / 1000)
-                else:
-                    return (minutes * 60) + float(parts[1])
-            else:
-                # Handle plain seconds format
-                return float(time_str)
-                
-        except (ValueError, TypeError):
-            return None
+        return to_seconds(scan_time(time_str, zero_is_missing=True)[0])
 
     def create_formatted_excel(self, output_path):
         """Creates a formatted Excel file handling multiple splits properly."""
+        from openpyxl import Workbook
+        self.profiler = Profiler(f"Export {os.path.basename(output_path)}")
         wb = Workbook()
         ws = wb.active
         
         # Define styles
         try:
-            title_font = Font(name='Avenir Next LT Pro', size=18, bold=True)
+            title_font = STYLES.font(name='Avenir Next LT Pro', size=18, bold=True)
         except:
-            title_font = Font(name='Arial', size=18, bold=True)
+            title_font = STYLES.font(name='Arial', size=18, bold=True)
         
-        header_font = Font(name='Arial', size=11, bold=True)
-        normal_font = Font(name='Arial', size=11)
+        header_font = STYLES.font(name='Arial', size=11, bold=True)
+        normal_font = STYLES.font(name='Arial', size=11)
         
         # Define borders
-        header_border = Border(
-            left=Side(style='thick'), 
-            right=Side(style='thick'),
-            top=Side(style='thick'),
-            bottom=Side(style='thick')
-        )
-        normal_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
+        header_border = STYLES.box('thick')
+        normal_border = STYLES.box('thin')
 
         # Set column widths dynamically based on number of splits
         base_columns = {
@@ -4118,7 +4017,7 @@ timing data from skiing training sessions.
         current_row = 1
         ws['B1'] = self.excel_title
         ws['B1'].font = title_font
-        ws['B1'].alignment = Alignment(vertical='center', horizontal='left')
+        ws['B1'].alignment = STYLES.alignment(vertical='center', horizontal='left')
         ws.row_dimensions[1].height = 30
         
         # Write header information
@@ -4140,39 +4039,48 @@ timing data from skiing training sessions.
         for (cell_coord, label), value in header_info.items():
             ws[cell_coord] = label
             ws[cell_coord].font = header_font
-            ws[cell_coord].alignment = Alignment(horizontal='left')
+            ws[cell_coord].alignment = STYLES.alignment(horizontal='left')
             
             value_col = chr(ord(cell_coord[0]) + 1)
             value_cell = f"{value_col}{cell_coord[1]}"
             ws[value_cell] = value
             ws[value_cell].font = normal_font
-            ws[value_cell].alignment = Alignment(horizontal='left')
+            ws[value_cell].alignment = STYLES.alignment(horizontal='left')
         
         # Process timing data
         if self.selected_file:
-            timing_data = self.parse_timing_data(self.selected_file)
+            with self.profiler.span('parse') as span:
+                timing_data = self.parse_timing_data(self.selected_file)
+                if timing_data:
+                    span['rows'] = sum(len(run_data) for run_data in timing_data.values())
             if timing_data:
                 current_row = 8  # Start after header section
                 
                 # Process each run
                 for run_number in sorted(timing_data.keys(), key=int):
-                    current_row = self.write_run_data(
-                        ws, 
-                        timing_data[run_number], 
-                        current_row, 
-                        split_columns
-                    )
+                    with self.profiler.span('write_run_data', rows=len(timing_data[run_number])):
+                        current_row = self.write_run_data(
+                            ws, 
+                            timing_data[run_number], 
+                            current_row, 
+                            split_columns
+                        )
                     current_row += 1  # Space between runs
                 
         try:
-            wb.save(output_path)
+            with self.profiler.span('save'):
+                wb.save(output_path)
+            self.finish_export_profile(output_path)
             return True
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save Excel file: {str(e)}")
             return False
 
     def write_run_data(self, ws, run_data, start_row, split_columns):
-        """Writes run data to Excel with proper split handling."""
+        """
+        Writes run data to Excel with proper split handling.
+        Times and differences are ticks, formatted only when written to a cell.
+        """
         # Write run header
         current_row = start_row + 2
         ws[f'B{current_row}'] = f"Run {run_data[0]['run']}"
@@ -4187,14 +4095,9 @@ timing data from skiing training sessions.
         # Write headers
         for col, header in enumerate(headers, start=2):
             cell = ws.cell(row=current_row, column=col, value=header)
-            cell.font = Font(bold=True)
-            cell.border = Border(
-                left=Side(style='thick'),
-                right=Side(style='thick'),
-                top=Side(style='thick'),
-                bottom=Side(style='thick')
-            )
-            cell.alignment = Alignment(horizontal='center')
+            cell.font = STYLES.font(bold=True)
+            cell.border = STYLES.box('thick')
+            cell.alignment = STYLES.alignment(horizontal='center')
         
         current_row += 1
         
@@ -4221,8 +4124,7 @@ timing data from skiing training sessions.
                 entry['finish'] > 0):
                 finish_data.append((entry['finish'], entry['bib']))
         
-        if finish_data:
-            finish_data.sort(key=lambda x: x[0])
+        ranking = RunRanking(split_data, finish_data)
         
         # Write data rows
         for entry in run_data:
@@ -4240,25 +4142,24 @@ timing data from skiing training sessions.
                     entry['splits'][split_idx] > 0):
                     
                     split_time = entry['splits'][split_idx]
-                    best_split = split_data[split_idx][0][0] if split_data[split_idx] else None
-                    split_diff = split_time - best_split if best_split is not None else None
+                    split_ranking = ranking.split(split_idx)
+                    split_diff = split_time - split_ranking.best if split_ranking.best is not None else None
                     
                     # Find rank
-                    rank = next((i + 1 for i, (_, b) in enumerate(split_data[split_idx]) 
-                            if b == bib), '')
+                    rank = split_ranking.rank(bib)
                     
                     # Write split data
-                    ws.cell(row=current_row, column=col, value=self.format_time(split_time))
+                    ws.cell(row=current_row, column=col, value=format_ticks(split_time))
                     ws.cell(row=current_row, column=col + 1, 
-                        value=self.format_time(split_diff, True) if split_diff is not None else '')
+                        value=format_ticks(split_diff, True) if split_diff is not None else '')
                     ws.cell(row=current_row, column=col + 2, value=rank)
                     
                     # Apply color gradient for valid times
                     if rank and rank != '':
                         ws.cell(row=current_row, column=col).fill = self.get_gradient_color(
                             rank - 1,  # Zero-based index for gradient
-                            len(split_data[split_idx]),
-                            0.6 if split_idx == 0 else 0.5  # Stronger color for first split
+                            len(split_ranking),
+                            self.split_gradient_scheme(split_idx)
                         )
                 else:
                     # Write empty cells for missing split
@@ -4269,22 +4170,20 @@ timing data from skiing training sessions.
             
             # Write finish data
             if status not in ['DNF', 'DSQ', 'DNS', 'ERR'] and entry['finish'] is not None:
-                best_finish = finish_data[0][0] if finish_data else None
+                best_finish = ranking.finish.best
                 finish_diff = entry['finish'] - best_finish if best_finish is not None else None
                 
-                finish_rank = next((i + 1 for i, (_, b) in enumerate(finish_data) 
-                                if b == bib), '')
+                finish_rank = ranking.finish.rank(bib)
                 
-                ws.cell(row=current_row, column=col, value=self.format_time(entry['finish']))
+                ws.cell(row=current_row, column=col, value=format_ticks(entry['finish']))
                 ws.cell(row=current_row, column=col + 1, 
-                    value=self.format_time(finish_diff, True) if finish_diff is not None else '')
+                    value=format_ticks(finish_diff, True) if finish_diff is not None else '')
                 ws.cell(row=current_row, column=col + 2, value=status)
                 
                 if finish_rank and finish_rank != '':
                     ws.cell(row=current_row, column=col).fill = self.get_gradient_color(
                         finish_rank - 1,
-                        len(finish_data),
-                        0.5
+                        len(ranking.finish)
                     )
             else:
                 ws.cell(row=current_row, column=col + 2, value=status)
@@ -4292,13 +4191,8 @@ timing data from skiing training sessions.
             # Apply borders to all cells in row
             for column in range(2, col + 3):
                 cell = ws.cell(row=current_row, column=column)
-                cell.border = Border(
-                    left=Side(style='thin'),
-                    right=Side(style='thin'),
-                    top=Side(style='thin'),
-                    bottom=Side(style='thin')
-                )
-                cell.alignment = Alignment(horizontal='center')
+                cell.border = STYLES.box('thin')
+                cell.alignment = STYLES.alignment(horizontal='center')
             
             current_row += 1
         
@@ -4546,11 +4440,10 @@ timing data from skiing training sessions.
             bib_number = int(bib_number)
 
             # Check for duplicate bib
-            for athlete in self.athletes[self.current_team]:
-                if int(athlete['bib']) == bib_number:
-                    messagebox.showwarning("Duplicate Bib", 
-                                         "This bib number is already assigned.")
-                    return
+            if self.current_team in self.team_bib_index.get(bib_number, {}):
+                messagebox.showwarning("Duplicate Bib", 
+                                     "This bib number is already assigned.")
+                return
 
             # Add the new athlete with gender
             new_athlete = {
@@ -4559,6 +4452,7 @@ timing data from skiing training sessions.
                 "gender": gender
             }
             self.athletes[self.current_team].append(new_athlete)
+            self.index_athlete(new_athlete, self.current_team)
             self.save_athletes_to_json()
             self.update_athlete_display()
 
@@ -4574,6 +4468,7 @@ timing data from skiing training sessions.
 
     def create_split_category_excel(self):
         """Creates an Excel file with men and women split into separate sections."""
+        from openpyxl import Workbook
         if not hasattr(self, 'timing_data') or not self.timing_data:
             messagebox.showwarning("Warning", "No timing data available")
             return
@@ -4584,10 +4479,9 @@ timing data from skiing training sessions.
         ws.title = "Split Categories"
 
         # Style definitions
-        header_font = Font(name='Arial', size=11, bold=True)
-        normal_font = Font(name='Arial', size=11)
-        header_fill = PatternFill(start_color="CCE5FF", end_color="CCE5FF", 
-                                fill_type="solid")
+        header_font = STYLES.font(name='Arial', size=11, bold=True)
+        normal_font = STYLES.font(name='Arial', size=11)
+        header_fill = STYLES.fill("CCE5FF")
 
         current_row = 1
 
@@ -4649,14 +4543,14 @@ timing data from skiing training sessions.
                       end_row=current_row, end_column=6)
         header_cell = ws.cell(row=current_row, column=1)
         header_cell.fill = header_fill
-        header_cell.font = Font(bold=True)
+        header_cell.font = STYLES.font(bold=True)
         current_row += 1
 
         # Column headers
         headers = ['Bib', 'Name', 'Split 1', 'Split Diff', 'Finish', 'Diff']
         for col, header in enumerate(headers, start=1):
             cell = ws.cell(row=current_row, column=col, value=header)
-            cell.font = Font(bold=True)
+            cell.font = STYLES.font(bold=True)
             cell.fill = header_fill
         current_row += 1
 
@@ -4692,18 +4586,75 @@ timing data from skiing training sessions.
 
         return current_row
 
-    def find_athlete_by_bib(self, bib):
-        """Finds an athlete across all teams by bib number."""
-        for team in self.athletes.values():
-            for athlete in team:
-                if athlete['bib'] == str(bib):
-                    return athlete
-        # Check temporary guests
+    def rebuild_bib_index(self):
+        """Rebuilds the bib lookup tables from the team rosters and temporary guests."""
+        self.team_bib_index = {}
+        self.guest_bib_index = {}
+        for team, athletes in self.athletes.items():
+            for athlete in athletes:
+                self.index_athlete(athlete, team)
         for guest in self.temp_guests:
-            if guest['bib'] == str(bib):
-                return guest
+            self.index_guest(guest)
+
+    def index_athlete(self, athlete, team):
+        """Adds an athlete to the bib index; the first athlete listed with a bib keeps it."""
+        self.team_bib_index.setdefault(int(athlete['bib']), {}).setdefault(team, athlete)
+
+    def unindex_athlete(self, athlete, team):
+        """Removes an athlete from the bib index, promoting a same-team duplicate if any."""
+        bib = int(athlete['bib'])
+        teams = self.team_bib_index.get(bib, {})
+        if teams.get(team) is athlete:
+            del teams[team]
+            for other in self.athletes.get(team, []):
+                if other is not athlete and int(other['bib']) == bib:
+                    teams[team] = other
+                    break
+            if not teams:
+                del self.team_bib_index[bib]
+
+    def index_guest(self, guest):
+        self.guest_bib_index.setdefault(int(guest['bib']), guest)
+
+    def unindex_guest(self, guest):
+        bib = int(guest['bib'])
+        if self.guest_bib_index.get(bib) is guest:
+            del self.guest_bib_index[bib]
+
+    def check_bib_conflict(self, bib, exclude_guest=None):
+        """Checks whether a bib is taken in the current team or by another guest."""
+        bib = int(bib)
+        if self.current_team in self.team_bib_index.get(bib, {}):
+            return True
+        guest = self.guest_bib_index.get(bib)
+        return guest is not None and guest is not exclude_guest
+
+    def find_athlete_by_bib(self, bib, include_inactive_guests=False):
+        """
+        Finds an athlete across all teams by bib number.
+        The current team wins, then active guests, then the other teams in roster order.
+        Inactive guests (bib clash with the current team) are skipped unless asked for.
+        """
+        bib = int(bib)
+        teams = self.team_bib_index.get(bib)
+        if teams and self.current_team in teams:
+            return teams[self.current_team]
+
+        guest = self.guest_bib_index.get(bib)
+        if guest and (include_inactive_guests or not guest.get('inactive', False)):
+            return guest
+
+        if teams:
+            for team in self.athletes:
+                if team in teams:
+                    return teams[team]
         return None
 
+    def get_athlete_name(self, bib):
+        """Returns the name for a bib, or 'Unknown Athlete'."""
+        athlete = self.find_athlete_by_bib(bib)
+        return athlete['name'] if athlete else 'Unknown Athlete'
+
     def build_gui(self):
         """Builds the complete GUI with ttk styling and enhanced functionality."""
         # Configure grid weights for proper layout
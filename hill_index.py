@@ -0,0 +1,144 @@
+"""
+Indexed hill-name matching for the hill autocomplete.
+
+Hill names are normalized once when added: accents and case are folded, hyphens
+become spaces and apostrophes are dropped, so "mont tr", "tremblant" and "owls"
+find "Mont-Tremblant" and "Owl’s Head". Each word start of the normalized name goes
+into a sorted suffix list, and a query takes its matching range with bisect instead
+of re-splitting every hill on each keypress.
+
+Ranking follows the original matcher: matches at the start of the name first, then
+matches on a word after a leading "Mont", then any other word, alphabetically within
+each group. Each group has its own suffix list; the first group's range is already
+in alphabetical order, so the others are only consulted when it runs short.
+"""
+import bisect
+import heapq
+
+from name_index import fold, word_starts
+
+APOSTROPHES = "'’‘`´"
+PREFIXES = ('mont',)   # Leading words whose following words rank just after full-name matches
+
+
+def normalize_hill(text):
+    folded = fold(text)
+    for apostrophe in APOSTROPHES:
+        folded = folded.replace(apostrophe, '')
+    return ' '.join(folded.replace('-', ' ').split())
+
+
+class HillIndex:
+    def __init__(self, hills=(), limit=10000):
+        self.limit = limit
+        self.entries = {}   # hill -> normalized name, least recently used first
+        self.suffixes = ([], [], [])  # per rank group, sorted (normalized text from a word start, hill)
+        self.results = {}   # query -> matches, cleared whenever the index changes
+        self.load(hills)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, hill):
+        return hill in self.entries
+
+    def hills(self):
+        """All hills, least recently used first."""
+        return list(self.entries)
+
+    def keys_for(self, hill, normalized):
+        leading_prefix = normalized.split(' ', 1)[0] in PREFIXES
+        for start in word_starts(normalized):
+            if start == 0:
+                group = 0
+            elif leading_prefix:
+                group = 1
+            else:
+                group = 2
+            yield group, (normalized[start:], hill)
+
+    def load(self, hills):
+        """
+        Replaces the contents with hills given oldest first, sorting the suffix list once.
+        """
+        recent = {}
+        for hill in hills:
+            hill = hill.strip()
+            if hill:
+                recent.pop(hill, None)
+                recent[hill] = None
+
+        self.clear()
+        for hill in list(recent)[-self.limit:] if self.limit else []:
+            normalized = normalize_hill(hill)
+            self.entries[hill] = normalized
+            for group, key in self.keys_for(hill, normalized):
+                self.suffixes[group].append(key)
+        for suffixes in self.suffixes:
+            suffixes.sort()
+
+    def add(self, hill):
+        """
+        Adds a hill or marks it as the most recently used, dropping the oldest past the limit.
+        """
+        hill = hill.strip()
+        if not hill:
+            return
+        self.remove(hill)
+
+        normalized = normalize_hill(hill)
+        self.entries[hill] = normalized
+        for group, key in self.keys_for(hill, normalized):
+            bisect.insort(self.suffixes[group], key)
+        self.results.clear()
+
+        while len(self.entries) > self.limit:
+            self.remove(next(iter(self.entries)))
+
+    def remove(self, hill):
+        normalized = self.entries.pop(hill, None)
+        if normalized is None:
+            return
+        for group, key in self.keys_for(hill, normalized):
+            suffixes = self.suffixes[group]
+            del suffixes[bisect.bisect_left(suffixes, key)]
+        self.results.clear()
+
+    def clear(self):
+        self.entries.clear()
+        for suffixes in self.suffixes:
+            suffixes.clear()
+        self.results.clear()
+
+    def search(self, text, limit=3):
+        """
+        Returns up to limit hills matching text at the start of the name or of any word in it.
+        """
+        query = normalize_hill(text)
+        if not query:
+            return []
+
+        key = (query, limit)
+        if key not in self.results:
+            if len(self.results) > 1000:
+                self.results.clear()
+            self.results[key] = self.find(query, limit)
+        return list(self.results[key])
+
+    def find(self, query, limit):
+        matches = []
+        for group, suffixes in enumerate(self.suffixes):
+            lo = bisect.bisect_left(suffixes, (query,))
+            hi = bisect.bisect_left(suffixes, (query + '\U0010ffff',), lo)
+            if group == 0:
+                # Full-name matches: the range is already sorted by name
+                matches.extend(hill for _, hill in suffixes[lo:min(hi, lo + limit)])
+            else:
+                seen = set(matches)
+                hills = {hill for _, hill in suffixes[lo:hi] if hill not in seen}
+                matches.extend(heapq.nsmallest(
+                    limit - len(matches), hills, key=lambda hill: (self.entries[hill], hill)
+                ))
+            if len(matches) >= limit:
+                break
+        return matches
@@ -0,0 +1,253 @@
+"""
+Live standings from a Brower export that is still being written.
+
+CsvTail remembers how far into the file it has read and, on each poll(), reads only
+the bytes appended since then, feeding the complete lines to a BrowerParser. A line
+still being written is held back until its newline arrives. Only if the file stops
+growing with a row open that already has every column but the last one is that row
+shown, provisionally: the line stays held back and is parsed again once it is
+finished, replacing the provisional row. When the file is replaced, shrinks or
+starts differently than before, it is read again from the start. A Bib#/Run# line
+after timing rows begins a new session, so a file holding several sessions is
+followed into the latest one.
+
+LiveStandings keeps one TimingTable row per (run, bib), overwriting it when Brower
+writes the athlete's row again (e.g. once the finish comes in), and re-ranks only
+the runs that received rows. Times are ticks, like the rest of the pipeline. Each
+run also has a RunValidator fed row by row, with the export's ERR status for times
+under MIN_VALID_TIME, so the validation messages follow the run as it fills in
+without checking it again from scratch; only the bibs the validator reports as
+changed get their messages rebuilt.
+"""
+import glob
+import os
+from collections import namedtuple
+
+from brower_parser import (ENCODING, SEPARATOR, BrowerParser, ColumnLayout, HeaderField,
+                           TimingRow, format_session_date, is_column_line)
+from running_stats import RunValidator
+from time_ticks import MIN_VALID_TIME, TimeTokenParser, to_seconds
+from timing_session import TimingEntry, TimingTable
+from timing_stats import Ranking
+
+POLL_MS = 500    # How often the live window looks for new rows
+HEAD_BYTES = 256  # Start of the file compared on each poll to notice it being rewritten
+
+# One line of a run's standings; ranks and diffs are None where they don't apply
+Standing = namedtuple('Standing', ['rank', 'bib', 'split', 'split_diff', 'split_rank',
+                                   'finish', 'finish_diff', 'status', 'errors'])
+
+# Finished runs first, then athletes still on course, then everyone without a result
+STANDING_GROUPS = {'': 0, 'DNF': 2, 'DSQ': 3, 'ERR': 4, 'DNS': 5}
+
+
+def row_status(split, finish, status):
+    """A row's status as the export shows it: ERR for a time under MIN_VALID_TIME."""
+    if status not in ('DNF', 'DSQ', 'DNS') and any(
+            time is not None and time < MIN_VALID_TIME for time in (split, finish)):
+        return 'ERR'
+    return status
+
+
+def newest_csv(folder):
+    """The most recently modified CSV in folder, or None if there is none."""
+    newest, newest_time = None, None
+    for path in glob.glob(os.path.join(folder, '*.csv')):
+        try:
+            if not os.path.isfile(path):
+                continue
+            modified = os.path.getmtime(path)
+        except OSError:
+            continue  # Removed or renamed since the glob
+        if newest_time is None or modified > newest_time:
+            newest, newest_time = path, modified
+    return newest
+
+
+class CsvTail:
+    def __init__(self, file_path, parse_time=None):
+        self.file_path = file_path
+        self.parse_time = parse_time if parse_time is not None else TimeTokenParser()
+        self.reset()
+
+    def reset(self):
+        self.offset = 0         # Bytes of the file consumed so far
+        self.identity = None    # (device, inode) of the file being read
+        self.head = b''         # Its first HEAD_BYTES, as last seen
+        self.partial = b''      # Start of a line whose newline hasn't been written yet
+        self.provisional = b''  # The partial line last returned as a provisional row
+        self.pending = []       # Non-row lines after the rows: the next session's header, or junk
+        self.parser = BrowerParser(self.parse_time)
+
+    def poll(self):
+        """
+        Returns the records (HeaderField, ColumnLayout, TimingRow) completed since the
+        last poll. A ColumnLayout means a session (re)starts and earlier rows no longer apply.
+        """
+        try:
+            with open(self.file_path, 'rb') as file:
+                stat = os.fstat(file.fileno())
+                identity = (stat.st_dev, stat.st_ino)
+                if (identity != self.identity or stat.st_size < self.offset
+                        or file.read(len(self.head)) != self.head):
+                    self.reset()
+                    self.identity = identity
+                file.seek(self.offset)
+                data = file.read()
+                if len(self.head) < HEAD_BYTES:
+                    file.seek(0)
+                    self.head = file.read(HEAD_BYTES)
+        except FileNotFoundError:
+            return []
+        self.offset += len(data)
+
+        lines = []
+        if data:
+            lines = (self.partial + data).split(b'\n')
+            self.partial = lines.pop()
+
+        records = []
+        for line in lines:
+            records.extend(self.feed(line.decode(ENCODING, 'replace')))
+        if not data and self.partial != self.provisional:
+            records.extend(self.provisional_row())
+        return records
+
+    def provisional_row(self):
+        """
+        The open line as a row, when nothing more was written and only its last
+        column can still be incomplete; the partial line itself is kept.
+        """
+        layout = self.parser.layout
+        line = self.partial.decode(ENCODING, 'replace')
+        if layout is None or not line.strip()[:1].isdigit():
+            return []
+        columns = [layout.bib, layout.run, layout.finish, layout.status] + [index for _, index in layout.splits]
+        if line.count(SEPARATOR) < max(index for index in columns if index is not None):
+            return []
+        self.provisional = self.partial
+        record = self.parser.parse_row(line.strip())
+        return [record] if record is not None else []
+
+    def feed(self, line):
+        if self.parser.layout is None:
+            record = self.parser.feed(line)
+            return [record] if record is not None else []
+
+        if is_column_line(line):
+            # Another session was appended; its header lines were held back in pending
+            self.parser = BrowerParser(self.parse_time)
+            lines, self.pending = self.pending + [line], []
+            return [record for record in map(self.parser.feed, lines) if record is not None]
+        if not line.strip()[:1].isdigit():
+            if line.strip():
+                self.pending.append(line)
+            return []
+
+        self.pending = []
+        record = self.parser.feed(line)
+        return [record] if record is not None else []
+
+
+class LiveStandings:
+    def __init__(self):
+        self.header = {'session': "", 'date': "", 'time': ""}
+        self.sessions = 0  # Times the standings were started over, so viewers know to redraw
+        self.start_session(None)
+
+    def start_session(self, layout):
+        self.sessions += 1
+        self.table = TimingTable(len(layout.splits) if layout is not None else 1)
+        self.rows = {}        # (run, bib) -> table row
+        self.run_rows = {}    # run -> table rows in arrival order
+        self.validators = {}  # run -> RunValidator
+        self.errors = {}      # run -> {bib: validation messages}, only for flagged bibs
+        self.standings = {}   # run -> [Standing], best first
+
+    def add(self, records):
+        """Applies records from CsvTail.poll and returns the runs whose standings changed."""
+        changed = set()
+        for record in records:
+            if isinstance(record, TimingRow):
+                try:
+                    key = (int(record.run), int(record.bib))
+                except ValueError:
+                    continue
+                row = self.rows.get(key)
+                if row is None:
+                    row = self.table.append(*record).row
+                    self.rows[key] = row
+                    self.run_rows.setdefault(key[0], []).append(row)
+                else:
+                    self.table.replace(row, record.splits, record.finish, record.status)
+                validator = self.validators.get(key[0])
+                if validator is None:
+                    validator = self.validators[key[0]] = RunValidator(self.table.num_splits)
+                entry = TimingEntry(self.table, row)
+                finish = entry['finish']
+                status = row_status(entry['split1'], finish, entry['status'])
+                # Only the bibs whose checks or messages changed get their messages again
+                errors = self.errors.setdefault(key[0], {})
+                for bib in validator.update(key[1], [to_seconds(split) for split in entry['splits']],
+                                            to_seconds(finish), status):
+                    details = validator.error_details(bib)
+                    if details:
+                        errors[bib] = details
+                    else:
+                        errors.pop(bib, None)
+                changed.add(key[0])
+            elif isinstance(record, ColumnLayout):
+                self.start_session(record)
+                changed = set()
+            elif isinstance(record, HeaderField):
+                self.header[record.name] = format_session_date(record.value) if record.name == 'date' else record.value
+
+        for run in changed:
+            self.standings[run] = self.rank_run(run)
+        return changed
+
+    def latest_run(self):
+        return max(self.standings, default=None)
+
+    def rank_run(self, run):
+        """
+        Standings of one run, with the same ERR rule and tied ranks as the export
+        and the validation messages of each row kept by add.
+        """
+        errors = self.errors.get(run, {})
+        entries = []
+        for row in self.run_rows[run]:
+            entry = TimingEntry(self.table, row)
+            split, finish = entry['split1'], entry['finish']
+            entries.append((entry['bib'], split, finish, row_status(split, finish, entry['status'])))
+
+        split_ranking = Ranking([(split, bib) for bib, split, _, status in entries
+                                 if split is not None and status not in ('DNS', 'ERR')])
+        finish_ranking = Ranking([(finish, bib) for bib, _, finish, status in entries
+                                  if finish is not None and status not in ('DNF', 'DSQ', 'DNS', 'ERR')])
+
+        standings = []
+        for bib, split, finish, status in entries:
+            finish_rank = finish_ranking.ranks.get(bib)
+            standings.append(Standing(
+                finish_rank,
+                bib,
+                split,
+                split_ranking.diff(bib),
+                split_ranking.ranks.get(bib),
+                finish,
+                finish_ranking.diff(bib),
+                status,
+                errors.get(bib, [])
+            ))
+
+        def order(standing):
+            if standing.rank is not None:
+                return (0, standing.finish, standing.bib)
+            group = STANDING_GROUPS.get(standing.status, 0)  # Other statuses rank like ''
+            if group == 0:
+                group = 1  # Still on course, ordered by split
+            return (group, standing.split if standing.split is not None else float('inf'), standing.bib)
+
+        standings.sort(key=order)
+        return standings
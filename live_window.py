@@ -0,0 +1,174 @@
+"""
+Window showing live standings while Brower is still writing the CSV.
+
+It polls a CsvTail every POLL_MS and redraws the shown run only when rows for it
+came in, updating the existing lines in place. Rows failing validation are
+highlighted with their messages in the Check column. Given a folder instead of a
+file, it follows the newest CSV in it, switching when Brower starts a new file.
+"""
+import os
+import tkinter as tk
+from datetime import datetime
+from tkinter.ttk import Combobox, Treeview
+
+from app_log import get_logger
+from live_tail import POLL_MS, CsvTail, LiveStandings, newest_csv
+from time_ticks import format_ticks
+
+log = get_logger('live')
+
+LATEST = "Latest"
+COLUMNS = (
+    ('rank', "Rank", 50),
+    ('bib', "Bib #", 50),
+    ('name', "Name", 180),
+    ('split', "Split 1", 80),
+    ('split_diff', "Split Diff.", 80),
+    ('finish', "Finish Time", 90),
+    ('finish_diff', "Finish Diff.", 90),
+    ('status', "Status", 60),
+    ('check', "Check", 260),
+)
+FLAGGED_COLOR = '#ffe0e0'  # Background of rows that fail validation
+
+
+class LiveWindow:
+    def __init__(self, root, source, get_athlete_name, on_close=None):
+        self.root = root
+        self.get_athlete_name = get_athlete_name
+        self.on_close = on_close
+        self.watch_folder = source if os.path.isdir(source) else None
+        self.tail = None
+        self.standings = LiveStandings()
+        self.shown = None        # (sessions, run) currently drawn
+        self.last_update = None
+        self.job = None
+
+        self.window = tk.Toplevel(root)
+        self.window.title("Live Standings")
+        self.window.geometry("980x520")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        controls = tk.Frame(self.window)
+        controls.pack(fill=tk.X, padx=5, pady=5)
+
+        tk.Label(controls, text="Run:").pack(side=tk.LEFT)
+        self.run_var = tk.StringVar(value=LATEST)
+        self.run_box = Combobox(controls, textvariable=self.run_var, values=[LATEST], width=10, state='readonly')
+        self.run_box.pack(side=tk.LEFT, padx=5)
+        self.run_box.bind('<<ComboboxSelected>>', lambda event: self.draw())
+
+        self.status_var = tk.StringVar()
+        tk.Label(controls, textvariable=self.status_var, anchor='w').pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+
+        self.tree = Treeview(self.window, columns=[key for key, _, _ in COLUMNS], show='headings')
+        for key, heading, width in COLUMNS:
+            self.tree.heading(key, text=heading)
+            self.tree.column(key, width=width, anchor='w' if key in ('name', 'check') else 'center')
+        self.tree.tag_configure('flagged', background=FLAGGED_COLOR)
+        scrollbar = tk.Scrollbar(self.window, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+
+        if self.watch_folder is None:
+            self.follow(source)
+        self.poll()
+
+    def exists(self):
+        return self.window.winfo_exists()
+
+    def follow(self, file_path):
+        """Starts tailing file_path from its beginning."""
+        self.tail = CsvTail(file_path) if file_path else None
+        self.standings = LiveStandings()
+        self.shown = None
+        self.last_update = None
+        self.run_box.config(values=[LATEST])
+        self.tree.delete(*self.tree.get_children())
+        if file_path:
+            log.info("Following %s", os.path.basename(file_path), extra={'fields': {'file': file_path}})
+
+    def selected_run(self):
+        value = self.run_var.get()
+        return self.standings.latest_run() if value == LATEST else int(value)
+
+    def poll(self):
+        """Reads what was appended since the last poll, redraws if needed, then reschedules itself."""
+        if self.watch_folder is not None:
+            try:
+                newest = newest_csv(self.watch_folder)
+            except OSError as e:
+                log.warning("Could not list %s: %s", self.watch_folder, e)
+                newest = self.tail.file_path if self.tail else None
+            if newest != (self.tail.file_path if self.tail else None):
+                self.follow(newest)
+
+        if self.tail is not None:
+            try:
+                changed = self.standings.add(self.tail.poll())
+            except OSError as e:
+                log.warning("Could not read %s: %s", self.tail.file_path, e)
+                changed = set()
+            if changed:
+                self.last_update = datetime.now()
+                self.run_box.config(values=[LATEST] + [str(run) for run in sorted(self.standings.standings)])
+            if self.selected_run() in changed or self.shown != (self.standings.sessions, self.selected_run()):
+                self.draw()
+
+        self.update_status()
+        self.job = self.root.after(POLL_MS, self.poll)
+
+    def update_status(self):
+        if self.tail is None:
+            self.status_var.set(f"Waiting for a CSV in {self.watch_folder}...")
+            return
+        header = self.standings.header
+        parts = [os.path.basename(self.tail.file_path)]
+        if header['session']:
+            parts.append(f"Session #{header['session']}")
+        if self.last_update is not None:
+            parts.append(f"updated {self.last_update:%H:%M:%S}")
+        self.status_var.set(" - ".join(parts))
+
+    def draw(self):
+        """Makes the tree show the selected run's standings, moving and updating rows in place."""
+        run = self.selected_run()
+        self.shown = (self.standings.sessions, run)
+        standings = self.standings.standings.get(run, [])
+
+        wanted = set()
+        for index, standing in enumerate(standings):
+            iid = str(standing.bib)
+            wanted.add(iid)
+            values = (
+                standing.rank if standing.rank is not None else '',
+                standing.bib,
+                self.get_athlete_name(standing.bib),
+                format_ticks(standing.split),
+                format_ticks(standing.split_diff, True),
+                format_ticks(standing.finish),
+                format_ticks(standing.finish_diff, True),
+                standing.status,
+                "; ".join(standing.errors),
+            )
+            tags = ('flagged',) if standing.errors else ()
+            if self.tree.exists(iid):
+                if tuple(str(value) for value in self.tree.item(iid, 'values')) != tuple(map(str, values)):
+                    self.tree.item(iid, values=values, tags=tags)
+                if self.tree.index(iid) != index:
+                    self.tree.move(iid, '', index)
+            else:
+                self.tree.insert('', index, iid=iid, values=values, tags=tags)
+
+        for iid in self.tree.get_children():
+            if iid not in wanted:
+                self.tree.delete(iid)
+
+    def close(self):
+        if self.job is not None:
+            self.root.after_cancel(self.job)
+            self.job = None
+        self.window.destroy()
+        if self.on_close:
+            self.on_close()
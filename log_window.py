@@ -0,0 +1,108 @@
+"""
+Window listing the in-memory log (app_log.RING), refreshed while it is open.
+"""
+import logging
+import tkinter as tk
+from tkinter import filedialog, messagebox
+from tkinter.ttk import Combobox
+
+from app_log import RING, format_entry, set_level
+
+LEVELS = ('DEBUG', 'INFO', 'WARNING', 'ERROR')
+REFRESH_MS = 500
+
+
+class LogWindow:
+    def __init__(self, root, on_close=None):
+        self.root = root
+        self.on_close = on_close
+        self.shown = None   # (record count, level) currently displayed
+        self.job = None
+
+        self.window = tk.Toplevel(root)
+        self.window.title("Log")
+        self.window.geometry("760x420")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        controls = tk.Frame(self.window)
+        controls.pack(fill=tk.X, padx=5, pady=5)
+
+        tk.Label(controls, text="Level:").pack(side=tk.LEFT)
+        self.level_var = tk.StringVar(value='INFO')
+        level_box = Combobox(controls, textvariable=self.level_var, values=LEVELS, width=10, state='readonly')
+        level_box.pack(side=tk.LEFT, padx=5)
+        level_box.bind('<<ComboboxSelected>>', lambda event: self.refresh_now())
+
+        # Per-line parse diagnostics are off by default to keep parsing fast
+        self.parse_debug_var = tk.BooleanVar(value=logging.getLogger('brower.parse').isEnabledFor(logging.DEBUG))
+        tk.Checkbutton(
+            controls,
+            text="Debug parsing",
+            variable=self.parse_debug_var,
+            command=self.toggle_parse_debug
+        ).pack(side=tk.LEFT, padx=5)
+
+        tk.Button(controls, text="Save...", command=self.save).pack(side=tk.RIGHT, padx=5)
+        tk.Button(controls, text="Clear", command=self.clear).pack(side=tk.RIGHT)
+
+        self.text = tk.Text(self.window, wrap=tk.NONE, font=("Courier", 10))
+        scrollbar = tk.Scrollbar(self.window, command=self.text.yview)
+        self.text.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.text.pack(fill=tk.BOTH, expand=True)
+
+        self.refresh()
+
+    def exists(self):
+        return self.window.winfo_exists()
+
+    def level(self):
+        return getattr(logging, self.level_var.get())
+
+    def toggle_parse_debug(self):
+        set_level('parse', logging.DEBUG if self.parse_debug_var.get() else logging.WARNING)
+
+    def refresh(self):
+        """Redraws the entries if anything was logged since the last refresh, then reschedules itself."""
+        shown = (RING.count, self.level())
+        if shown != self.shown:
+            self.shown = shown
+            self.text.configure(state=tk.NORMAL)
+            self.text.delete("1.0", tk.END)
+            self.text.insert(tk.END, '\n'.join(format_entry(entry) for entry in RING.entries(self.level())))
+            self.text.configure(state=tk.DISABLED)
+            self.text.see(tk.END)
+        self.job = self.root.after(REFRESH_MS, self.refresh)
+
+    def clear(self):
+        RING.clear()
+        self.shown = None
+        self.refresh_now()
+
+    def refresh_now(self):
+        if self.job is not None:
+            self.root.after_cancel(self.job)
+        self.refresh()
+
+    def save(self):
+        path = filedialog.asksaveasfilename(
+            parent=self.window,
+            defaultextension=".log",
+            filetypes=[("Log files", "*.log"), ("Text files", "*.txt")]
+        )
+        if not path:
+            return
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                for entry in RING.entries():
+                    f.write(format_entry(entry) + '\n')
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to save log: {str(e)}", parent=self.window)
+
+    def close(self):
+        if self.job is not None:
+            self.root.after_cancel(self.job)
+            self.job = None
+        self.window.destroy()
+        if self.on_close:
+            self.on_close()
@@ -0,0 +1,156 @@
+"""
+In-memory index of recently used athlete names for autocomplete.
+
+Matching ignores case and accents ("lea" finds "Léa") and looks at the start of the
+name or of any word in it ("bru" finds "Julian Brunet"). Two structures serve it:
+
+- buckets: every word's first PREFIX_LENGTH characters (edge n-grams) map to the
+  names under that prefix, kept in recency order. Short queries read the most recent
+  names straight off the end of their bucket.
+- suffixes: a sorted list of (name text from a word start, name), searched with bisect
+  like a flattened trie. Longer queries take their contiguous match range from it and
+  rank that by recency, unless the range is a large share of the bucket, in which case
+  walking the bucket finds the most recent matches sooner.
+"""
+import bisect
+import heapq
+import itertools
+import unicodedata
+
+PREFIX_LENGTH = 4
+
+
+def fold(text):
+    """Lower-cases text and strips accents for matching."""
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def word_starts(folded):
+    """Positions where a word begins in a folded name."""
+    return tuple(i for i, c in enumerate(folded) if not c.isspace() and (i == 0 or folded[i - 1].isspace()))
+
+
+class NameIndex:
+    def __init__(self, names=(), limit=2000):
+        self.limit = limit
+        self.clock = 0
+        self.entries = {}   # name -> (folded name, word start positions, last use), oldest first
+        self.buckets = {}   # folded prefix -> {name: None}, oldest first
+        self.suffixes = []  # sorted (folded text from a word start, name)
+        self.load(names)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def names(self):
+        """All names, least recently used first."""
+        return list(self.entries)
+
+    def prefixes(self, folded, starts):
+        keys = set()
+        for start in starts:
+            word = folded[start:start + PREFIX_LENGTH]
+            for length in range(1, len(word) + 1):
+                keys.add(word[:length])
+        return keys
+
+    def load(self, names):
+        """
+        Replaces the contents with names given oldest first, sorting the suffix list once.
+        """
+        recent = {}
+        for name in names:
+            name = name.strip()
+            if name:
+                recent.pop(name, None)
+                recent[name] = None
+
+        self.clear()
+        for name in list(recent)[-self.limit:] if self.limit else []:
+            folded = fold(name)
+            starts = word_starts(folded)
+            self.clock += 1
+            self.entries[name] = (folded, starts, self.clock)
+            for key in self.prefixes(folded, starts):
+                self.buckets.setdefault(key, {})[name] = None
+            self.suffixes.extend((folded[start:], name) for start in starts)
+        self.suffixes.sort()
+
+    def add(self, name):
+        """
+        Adds a name or marks it as the most recently used, dropping the oldest past the limit.
+        """
+        name = name.strip()
+        if not name:
+            return
+        self.remove(name)
+
+        folded = fold(name)
+        starts = word_starts(folded)
+        self.clock += 1
+        self.entries[name] = (folded, starts, self.clock)
+        for key in self.prefixes(folded, starts):
+            self.buckets.setdefault(key, {})[name] = None
+        for start in starts:
+            bisect.insort(self.suffixes, (folded[start:], name))
+
+        while len(self.entries) > self.limit:
+            self.remove(next(iter(self.entries)))
+
+    def remove(self, name):
+        entry = self.entries.pop(name, None)
+        if entry is None:
+            return
+        folded, starts, _ = entry
+        for key in self.prefixes(folded, starts):
+            bucket = self.buckets[key]
+            del bucket[name]
+            if not bucket:
+                del self.buckets[key]
+        for start in starts:
+            i = bisect.bisect_left(self.suffixes, (folded[start:], name))
+            del self.suffixes[i]
+
+    def clear(self):
+        self.entries.clear()
+        self.buckets.clear()
+        self.suffixes.clear()
+
+    def search(self, text, limit=3):
+        """
+        Returns up to limit names, most recent first, where the whole name or one of its
+        words starts with text.
+        """
+        query = fold(text).strip()
+        if not query:
+            return []
+
+        bucket = self.buckets.get(query[:PREFIX_LENGTH])
+        if not bucket:
+            return []
+        if len(query) <= PREFIX_LENGTH:
+            return list(itertools.islice(reversed(bucket), limit))
+
+        lo = bisect.bisect_left(self.suffixes, (query,))
+        hi = bisect.bisect_left(self.suffixes, (query + '\U0010ffff',), lo)
+        if hi == lo:
+            return []
+
+        if (hi - lo) * 8 < len(bucket):
+            # Few matches: rank the range by recency
+            names = {name for _, name in self.suffixes[lo:hi]}
+            return heapq.nlargest(limit, names, key=lambda name: self.entries[name][2])
+
+        # Most of the bucket matches: the most recent matches are near its end
+        matches = []
+        for name in reversed(bucket):
+            folded, starts, _ = self.entries[name]
+            if any(folded.startswith(query, start) for start in starts):
+                matches.append(name)
+                if len(matches) == limit:
+                    break
+        return matches
@@ -0,0 +1,109 @@
+"""
+Timing spans for startup and exports.
+
+A Profiler records how long each `with profiler.span(name):` block takes, how deep
+it was nested and, when given, how many rows it handled. One Profiler is made per
+export (and one for startup), so its spans read as a breakdown of that job: which of
+parsing, the sheet writers or saving took the time. report() formats them for the
+timing report window and dump() saves them as JSON in the config directory.
+"""
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from storage import atomic_write, config_dir
+
+KEEP_PROFILES = 50  # JSON dumps kept in the profiles directory, newest first
+
+
+class Profiler:
+    def __init__(self, label):
+        self.label = label
+        self.created = datetime.now()
+        self.origin = time.perf_counter()
+        self.spans = []  # {'name', 'depth', 'start', 'seconds', 'rows'} in start order
+        self.depth = 0
+
+    @contextmanager
+    def span(self, name, rows=None):
+        """
+        Times the block. The yielded record's 'rows' can be filled in inside the block
+        when the count is only known once the work is done.
+        """
+        record = {
+            'name': name,
+            'depth': self.depth,
+            'start': time.perf_counter() - self.origin,
+            'seconds': None,
+            'rows': rows,
+        }
+        self.spans.append(record)
+        self.depth += 1
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = time.perf_counter() - started
+            self.depth -= 1
+
+    def total_seconds(self):
+        return sum(span['seconds'] or 0.0 for span in self.spans if span['depth'] == 0)
+
+    def totals(self):
+        """Per span name: (name, calls, seconds, rows), slowest first."""
+        totals = {}
+        for span in self.spans:
+            calls, seconds, rows = totals.get(span['name'], (0, 0.0, 0))
+            totals[span['name']] = (calls + 1, seconds + (span['seconds'] or 0.0), rows + (span['rows'] or 0))
+        return sorted(
+            ((name, calls, seconds, rows) for name, (calls, seconds, rows) in totals.items()),
+            key=lambda total: total[2],
+            reverse=True
+        )
+
+    def report(self):
+        """The spans as text: one line per span, indented by nesting, then totals per name."""
+        lines = [f"{self.label} ({self.created:%Y-%m-%d %H:%M:%S}) - {self.total_seconds() * 1000:.1f} ms"]
+        for span in self.spans:
+            if span['seconds'] is None:
+                continue
+            name = '  ' * (span['depth'] + 1) + span['name']
+            rows = f"{span['rows']} rows" if span['rows'] is not None else ''
+            lines.append(f"{name:<40}{span['seconds'] * 1000:>10.1f} ms  {rows}")
+
+        lines.append("")
+        lines.append("By step:")
+        for name, calls, seconds, rows in self.totals():
+            rows = f"{rows} rows" if rows else ''
+            lines.append(f"  {name:<38}{seconds * 1000:>10.1f} ms  x{calls}  {rows}")
+        return '\n'.join(lines)
+
+    def to_dict(self):
+        return {
+            'label': self.label,
+            'created': self.created.isoformat(timespec='seconds'),
+            'total_seconds': self.total_seconds(),
+            'spans': self.spans,
+            'totals': [
+                {'name': name, 'calls': calls, 'seconds': seconds, 'rows': rows}
+                for name, calls, seconds, rows in self.totals()
+            ],
+        }
+
+    def dump(self, name):
+        """Saves the spans as JSON under the config directory's profiles folder and returns the path."""
+        directory = os.path.join(config_dir(), 'profiles')
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{self.created:%Y%m%d-%H%M%S}-{name}.json")
+        atomic_write(path, json.dumps(self.to_dict(), indent=4, ensure_ascii=False))
+
+        # Keep only the most recent dumps
+        dumps = sorted(f for f in os.listdir(directory) if f.endswith('.json'))
+        for old in dumps[:-KEEP_PROFILES]:
+            try:
+                os.remove(os.path.join(directory, old))
+            except OSError:
+                pass
+        return path
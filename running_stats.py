@@ -0,0 +1,305 @@
+"""
+Incremental statistics for live validation.
+
+RunningStats keeps the count, mean and variance of a changing set of times with
+Welford's updates, and the times themselves in a sorted list (bisect) for min,
+max and median. Adding or removing one time costs O(1) arithmetic, an O(log n)
+bisection and an O(n) list insert or delete. At the size of a run that insert is
+a short memmove, far cheaper than going over the run again in Python. Removal
+lets a rewritten row replace its old times. adaptive_bounds follows
+split_stats.ColumnStats.adaptive_bounds.
+
+RunValidator applies the rules of gen2's validate_run_data to one run as rows
+arrive. Each split and the finish keep RunningStats over the counted times and a
+sorted (time, bib) list of every present time, so when a new row moves a column's
+bounds, the entries between the old and the new bounds are found by bisection and
+only those are checked again. What is stored per entry is which checks fail; the
+messages are built on request with the current bounds. Times are float seconds,
+like the rest of the validation code.
+"""
+import bisect
+import math
+
+INVALID_STATUSES = ('DNF', 'DSQ', 'DNS', 'ERR')  # Rows whose times don't count towards the bounds
+
+
+class RunningStats:
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0      # Sum of squared deviations from the mean
+        self.values = []   # Sorted
+
+    def add(self, value):
+        """O(1) for the statistics, O(n) for the insert into values."""
+        bisect.insort(self.values, value)
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def remove(self, value):
+        """O(1) for the statistics, O(n) for the delete from values."""
+        index = bisect.bisect_left(self.values, value)
+        if index == len(self.values) or self.values[index] != value:
+            raise ValueError(f"{value} is not in the statistics")
+        del self.values[index]
+        self.count -= 1
+        if self.count == 0:
+            self.mean = 0.0
+            self.m2 = 0.0
+            return
+        if self.values[0] == self.values[-1]:
+            # All the same again: drop the rounding the downdates left behind
+            self.mean = self.values[0]
+            self.m2 = 0.0
+            return
+        delta = value - self.mean
+        self.mean -= delta / self.count
+        self.m2 = max(0.0, self.m2 - delta * (value - self.mean))
+
+    @property
+    def variance(self):
+        """Population variance, as split_stats computes it."""
+        return self.m2 / self.count if self.count else None
+
+    @property
+    def std_dev(self):
+        return math.sqrt(self.variance) if self.count else None
+
+    @property
+    def min(self):
+        return self.values[0] if self.values else None
+
+    @property
+    def max(self):
+        return self.values[-1] if self.values else None
+
+    @property
+    def median(self):
+        if not self.values:
+            return None
+        middle = len(self.values) // 2
+        if len(self.values) % 2:
+            return self.values[middle]
+        return (self.values[middle - 1] + self.values[middle]) / 2
+
+    def summary(self):
+        """The statistics in the dict shape used by the reports, or None without any times."""
+        if not self.count:
+            return None
+        return {
+            'mean': self.mean,
+            'std_dev': self.std_dev,
+            'min': self.min,
+            'max': self.max,
+            'range': self.max - self.min,
+            'count': self.count,
+            'median': self.median,
+            'coefficient_of_variation': self.std_dev / self.mean * 100 if self.mean > 0 else None
+        }
+
+    def adaptive_bounds(self, z_score=2.5, min_allowed=3.0, max_allowed=180.0):
+        """
+        (lower, upper), widened for very consistent times and a +/-50% band for
+        short acceleration splits (mean under 5s). None without any times.
+        """
+        if not self.count:
+            return None
+        std_dev = self.std_dev
+        if std_dev < 0.1:
+            z_score *= 1.5
+        if self.mean < 5.0:
+            return max(min_allowed, self.mean * 0.5), self.mean * 1.5
+        return max(min_allowed, self.mean - z_score * std_dev), min(max_allowed, self.mean + z_score * std_dev)
+
+
+class TimeColumn:
+    """One split or the finish of a run: statistics, bounds and who is outside them."""
+
+    def __init__(self):
+        self.stats = RunningStats()  # Counted times only
+        self.present = []            # Sorted (time, bib) of every present time
+        self.bounds = None           # (lower, upper), None while nothing counts
+        self.outside = set()         # Bibs whose time is outside the bounds
+
+    def add(self, bib, time, counted):
+        """Like RunningStats.add, an O(n) insert into present."""
+        bisect.insort(self.present, (time, bib))
+        if counted:
+            self.stats.add(time)
+        if self.bounds is not None and not self.bounds[0] <= time <= self.bounds[1]:
+            self.outside.add(bib)
+
+    def remove(self, bib, time, counted):
+        del self.present[bisect.bisect_left(self.present, (time, bib))]
+        if counted:
+            self.stats.remove(time)
+        self.outside.discard(bib)
+
+    def set_bounds(self, bounds):
+        """
+        Applies new bounds and returns the bibs that moved inside or outside of them,
+        or every bib when the column gains or loses its bounds altogether. Only the
+        times between the old and the new bounds are looked at.
+        """
+        old, self.bounds = self.bounds, bounds
+        if old is None and bounds is None:
+            return set()
+        if old is None or bounds is None:
+            self.outside = set()
+            if bounds is not None:
+                lower, upper = bounds
+                self.outside.update(bib for time, bib in self.present if not lower <= time <= upper)
+            return {bib for _, bib in self.present}
+
+        lower, upper = bounds
+        crossed = (
+            # Below the lower bound is time < lower; above the upper one is time > upper
+            (bisect.bisect_left(self.present, (min(old[0], lower),)),
+             bisect.bisect_left(self.present, (max(old[0], lower),))),
+            (bisect.bisect_right(self.present, (min(old[1], upper), math.inf)),
+             bisect.bisect_right(self.present, (max(old[1], upper), math.inf))),
+        )
+        changed = set()
+        for start, stop in crossed:
+            for time, bib in self.present[start:stop]:
+                if (lower <= time <= upper) == (bib in self.outside):
+                    self.outside.symmetric_difference_update((bib,))
+                    changed.add(bib)
+        return changed
+
+
+class RunValidator:
+    def __init__(self, num_splits, min_regular_split=3.0, min_acceleration_split=0.5):
+        self.min_regular_split = min_regular_split
+        self.min_acceleration_split = min_acceleration_split
+        self.splits = [TimeColumn() for _ in range(num_splits)]
+        self.finish = TimeColumn()
+        self.entries = {}   # bib -> (splits, finish, status)
+        self.failures = {}  # bib -> failed checks (see check), only for bibs that have any
+
+    def update(self, bib, splits, finish, status):
+        """
+        Adds or replaces the row of bib. Returns the bibs whose failed checks changed,
+        i.e. the entries that have to be flagged or cleared again, plus the flagged
+        bibs whose messages quote bounds that moved.
+        """
+        touched = set()
+        old = self.entries.pop(bib, None)
+        if old is not None:
+            touched |= self.apply(bib, old, TimeColumn.remove)
+        row = (tuple(splits), finish, (status or '').strip().upper())
+        self.entries[bib] = row
+        touched |= self.apply(bib, row, TimeColumn.add)
+
+        recheck = {bib}
+        changed = set()
+        for index in touched:
+            column = self.finish if index is None else self.splits[index]
+            bounds = self.column_bounds(index)
+            if bounds != column.bounds:
+                changed.update(other for other in column.outside if other in self.failures)
+            recheck |= column.set_bounds(bounds)
+
+        for other in recheck:
+            failures = self.check(other)
+            if failures != self.failures.get(other, ()):
+                if failures:
+                    self.failures[other] = failures
+                else:
+                    self.failures.pop(other, None)
+                changed.add(other)
+        return changed
+
+    def is_valid(self, bib):
+        return bib not in self.failures
+
+    def apply(self, bib, row, action):
+        """Adds or removes a row's present times; returns the columns touched (None = finish)."""
+        splits, finish, status = row
+        counted = status not in INVALID_STATUSES
+        touched = set()
+        for index, column in enumerate(self.splits):
+            time = splits[index] if index < len(splits) else None
+            if time is not None and time > 0:
+                action(column, bib, time, counted)
+                touched.add(index)
+        if finish is not None and finish > 0:
+            action(self.finish, bib, finish, counted)
+            touched.add(None)
+        return touched
+
+    def column_bounds(self, index):
+        if index is None:
+            return self.finish.stats.adaptive_bounds()
+        stats = self.splits[index].stats
+        if not stats.count:
+            return None
+        if stats.mean < 5.0 and stats.std_dev < 0.5:
+            return stats.adaptive_bounds(3.0, self.min_acceleration_split)
+        return stats.adaptive_bounds(2.5, self.min_regular_split)
+
+    def check(self, bib):
+        """
+        The checks of validate_run_data that bib's row fails, in its message order:
+        ('bounds', split index), ('progression', split index), ('finish_bounds',)
+        and ('finish_before_split',).
+        """
+        splits, finish, status = self.entries[bib]
+        if status == 'DNS':
+            return ()
+
+        out_of_bounds, progression = [], []
+        previous = None
+        for index, column in enumerate(self.splits):
+            time = splits[index] if index < len(splits) else None
+            if time is None or time <= 0 or column.bounds is None:
+                continue
+            if bib in column.outside:
+                out_of_bounds.append(('bounds', index))
+                continue
+            if previous is not None and time <= previous:
+                progression.append(('progression', index))
+            previous = time
+
+        failures = out_of_bounds + progression
+        if finish is not None and finish > 0:
+            if self.finish.bounds is not None and bib in self.finish.outside:
+                failures.append(('finish_bounds',))
+            if previous is not None and finish <= previous:
+                failures.append(('finish_before_split',))
+        return tuple(failures)
+
+    def error_details(self, bib):
+        """The error messages for bib's row, with the bounds as they are now."""
+        failures = self.failures.get(bib)
+        if not failures:
+            return []
+        splits, finish, _ = self.entries[bib]
+        # Last valid split before each split, and overall, for the progression messages
+        previous_valid = {}
+        previous = None
+        for index, column in enumerate(self.splits):
+            time = splits[index] if index < len(splits) else None
+            if time is None or time <= 0 or column.bounds is None or bib in column.outside:
+                continue
+            previous_valid[index] = previous
+            previous = time
+
+        messages = []
+        for failure in failures:
+            kind = failure[0]
+            if kind == 'bounds':
+                index = failure[1]
+                lower, upper = self.splits[index].bounds
+                messages.append(f"Split {index+1}: {splits[index]:.2f}s outside bounds [{lower:.2f}, {upper:.2f}]")
+            elif kind == 'progression':
+                index = failure[1]
+                messages.append(f"Invalid progression: {previous_valid[index]:.2f} → {splits[index]:.2f}")
+            elif kind == 'finish_bounds':
+                lower, upper = self.finish.bounds
+                messages.append(f"Finish: {finish:.2f}s outside bounds [{lower:.2f}, {upper:.2f}]")
+            else:
+                messages.append(f"Finish ({finish:.2f}) ≤ last split ({previous:.2f})")
+        return messages
@@ -0,0 +1,130 @@
+"""
+Batched split statistics for validation, reports and the statistics sheet.
+
+A run is handled as an (entries x splits) float matrix with NaN for missing times,
+so moments, bounds and CV for every split come out of one NumPy pass instead of a
+Python loop per split. Statistics are in seconds: TimingTable columns hold integer
+ticks and are converted here, as the matrix is gathered.
+"""
+import numpy as np
+
+from time_ticks import MISSING_TICKS, TICKS_PER_SECOND
+
+INVALID_STATUSES = ('DNF', 'DSQ', 'DNS', 'ERR')
+
+
+def run_arrays(run_data, num_splits):
+    """
+    Returns (splits, finish, statuses) for a run: an entries x num_splits float matrix and a
+    finish vector in seconds, NaN where missing, plus the upper-cased status of every entry.
+    Entries that are views over a TimingTable are gathered straight from its tick columns;
+    other entries must hold their times in seconds.
+    """
+    count = len(run_data)
+    table = getattr(run_data[0], 'table', None) if count else None
+
+    if table is not None and all(getattr(entry, 'table', None) is table for entry in run_data):
+        rows = np.fromiter((entry.row for entry in run_data), dtype=np.intp, count=count)
+        width = table.num_splits
+        all_splits = np.frombuffer(table.splits, dtype=np.int32).reshape(len(table), width)
+        splits = np.full((count, num_splits), np.nan)
+        columns = min(width, num_splits)
+        splits[:, :columns] = ticks_to_seconds(all_splits[rows, :columns])
+        finish = ticks_to_seconds(np.frombuffer(table.finish, dtype=np.int32)[rows])
+        names = np.array(table.status_names, dtype=object)
+        statuses = names[np.frombuffer(table.status_codes, dtype=np.int8)[rows]]
+        return splits, finish, statuses
+
+    splits = np.full((count, num_splits), np.nan)
+    finish = np.full(count, np.nan)
+    statuses = np.empty(count, dtype=object)
+    for row, entry in enumerate(run_data):
+        for i, split in enumerate(entry['splits'][:num_splits]):
+            if split is not None:
+                splits[row, i] = split
+        if entry['finish'] is not None:
+            finish[row] = entry['finish']
+        statuses[row] = entry['status'].upper()
+    return splits, finish, statuses
+
+
+def ticks_to_seconds(ticks):
+    """Float seconds for an int32 tick array, NaN where the time is missing."""
+    return np.where(ticks == MISSING_TICKS, np.nan, ticks / TICKS_PER_SECOND)
+
+
+def status_mask(statuses, excluded=INVALID_STATUSES):
+    """Boolean mask of entries whose status is not in excluded."""
+    return ~np.isin(statuses.astype(str), list(excluded))
+
+
+class ColumnStats:
+    """
+    Moments of every column of a time matrix, computed together.
+    Only positive, non-NaN values count, optionally restricted to the rows in mask.
+    """
+
+    def __init__(self, matrix, mask=None):
+        values = np.asarray(matrix, dtype=np.float64)
+        if values.ndim == 1:
+            values = values[:, np.newaxis]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            present = values > 0  # NaN compares False
+            if mask is not None:
+                present &= np.asarray(mask, dtype=bool)[:, np.newaxis]
+
+            self.present = present
+            self.values = np.where(present, values, np.nan)
+            self.count = present.sum(axis=0)
+
+            self.mean = np.where(present, values, 0.0).sum(axis=0) / self.count
+            deviation = np.where(present, values - self.mean, 0.0)
+            self.std_dev = np.sqrt((deviation ** 2).sum(axis=0) / self.count)
+
+            empty = self.count == 0
+            self.min = np.where(empty, np.nan, np.where(present, values, np.inf).min(axis=0, initial=np.inf))
+            self.max = np.where(empty, np.nan, np.where(present, values, -np.inf).max(axis=0, initial=-np.inf))
+            self.range = self.max - self.min
+            self.cv = np.where(self.mean > 0, self.std_dev / self.mean * 100, np.nan)
+
+    def __len__(self):
+        return len(self.count)
+
+    def summary(self, column=0):
+        """
+        Statistics of one column in the dict shape used by the reports, or None if it has no times.
+        """
+        if self.count[column] == 0:
+            return None
+        cv = self.cv[column]
+        return {
+            'mean': float(self.mean[column]),
+            'std_dev': float(self.std_dev[column]),
+            'min': float(self.min[column]),
+            'max': float(self.max[column]),
+            'range': float(self.range[column]),
+            'count': int(self.count[column]),
+            'coefficient_of_variation': None if np.isnan(cv) else float(cv)
+        }
+
+    def bounds(self, z_score, min_allowed, max_allowed):
+        """
+        Plain mean +/- z * std bounds per column, clipped to [min_allowed, max_allowed].
+        """
+        lower = np.maximum(min_allowed, self.mean - z_score * self.std_dev)
+        upper = np.minimum(max_allowed, self.mean + z_score * self.std_dev)
+        return lower, upper
+
+    def adaptive_bounds(self, z_score=2.5, min_allowed=3.0, max_allowed=180.0):
+        """
+        Bounds per column that widen for very consistent times and switch to a
+        +/-50% band for short acceleration splits (mean under 5s).
+        """
+        z_score = np.where(self.std_dev < 0.1, np.multiply(z_score, 1.5), z_score)
+        lower, upper = self.bounds(z_score, min_allowed, max_allowed)
+
+        acceleration = self.mean < 5.0
+        lower = np.where(acceleration, np.maximum(min_allowed, self.mean * 0.5), lower)
+        upper = np.where(acceleration, self.mean * 1.5, upper)
+        return lower, upper
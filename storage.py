@@ -0,0 +1,206 @@
+"""
+Crash-safe files for the app's saved state.
+
+atomic_write replaces a file through a temp file in the same directory that is
+fsynced before being renamed over the original, so a power loss mid-save leaves
+either the old or the new contents, never half of each.
+
+RecentJournal keeps the recent names/hills lists as append-only journals: one
+entry per line, oldest first, where a repeated entry means "used again". Using a
+name appends one line instead of rewriting the list. Once the file has grown well
+past the entries it holds, it is compacted back to one line per entry with
+atomic_write. The format is the same plain list the app always wrote, so existing
+recent_names.txt/recent_hills.txt files load unchanged.
+
+StateWriter batches saves of the JSON state (athletes_data.json, settings.json):
+changes only mark a file dirty, and once edits pause the dirty files are serialized
+on the main thread and written with atomic_write in a background thread.
+
+All of these files live in a per-user config directory (see data_path) rather
+than wherever the app happened to be started from.
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+from background_task import BackgroundTask
+
+APP_NAME = "BrowerReformatter"
+COMPACT_SLACK = 500   # Lines the journal may grow past twice its compacted size before compacting
+SAVE_DELAY_MS = 500   # Quiet time after the last change before dirty state is written
+
+
+def config_dir():
+    """The per-user directory holding the app's saved state, created if missing."""
+    if sys.platform == 'win32':
+        base = os.environ.get('APPDATA') or os.path.join(os.path.expanduser('~'), 'AppData', 'Roaming')
+    elif sys.platform == 'darwin':
+        base = os.path.join(os.path.expanduser('~'), 'Library', 'Application Support')
+    else:
+        base = os.environ.get('XDG_CONFIG_HOME') or os.path.join(os.path.expanduser('~'), '.config')
+    path = os.path.join(base, APP_NAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def data_path(filename):
+    """
+    Path of a saved-state file in the config directory. A copy left in the working
+    directory by earlier versions is copied over the first time it is asked for.
+    """
+    path = os.path.join(config_dir(), filename)
+    if not os.path.exists(path) and os.path.isfile(filename):
+        shutil.copy2(filename, path)
+    return path
+
+
+def atomic_write(path, text, encoding='utf-8'):
+    """Writes text to path, replacing the old file only once the new one is on disk."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding=encoding, newline='') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def latest_uses(entries):
+    """entries without repeats, each at its most recent use, oldest first."""
+    recent = {}
+    for entry in entries:
+        recent.pop(entry, None)
+        recent[entry] = None
+    return list(recent)
+
+
+class RecentJournal:
+    def __init__(self, path):
+        self.path = path
+        self.lines = 0           # Lines currently in the file
+        self.compacted_size = 0  # Distinct entries at the last read or compaction
+        self.torn = False        # Last line was cut off mid-write and must be dropped
+
+    def read(self):
+        """
+        Returns the journal's entries oldest first, repeats included. A last line cut
+        off by a crash is dropped and the file compacted without it; a file already
+        past the compaction threshold is compacted too. The threshold counts distinct
+        entries, so repeats don't raise it from one startup to the next.
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                text = f.read()
+        except FileNotFoundError:
+            text = ''
+
+        lines = text.split('\n')
+        # A complete file ends with a newline, leaving an empty last item
+        self.torn = lines.pop() != ''
+        entries = [line.strip() for line in lines if line.strip()]
+
+        unique = latest_uses(entries)
+        if self.torn or len(lines) > 2 * len(unique) + COMPACT_SLACK:
+            self.compact(unique)
+        else:
+            self.lines = len(lines)
+            self.compacted_size = len(unique)
+        return entries
+
+    def append(self, entry, current_entries):
+        """
+        Records entry as the most recently used. current_entries is a callable returning
+        the deduplicated list, oldest first, and is only called when compaction is due.
+        """
+        entry = entry.strip()
+        if not entry:
+            return
+        if self.torn:
+            self.compact(current_entries())
+
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(entry + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self.lines += 1
+
+        if self.lines > 2 * self.compacted_size + COMPACT_SLACK:
+            self.compact(current_entries())
+
+    def compact(self, entries):
+        """Rewrites the journal atomically with exactly entries, oldest first."""
+        entries = list(entries)
+        atomic_write(self.path, ''.join(entry + '\n' for entry in entries))
+        self.lines = self.compacted_size = len(entries)
+        self.torn = False
+
+
+def write_files(files):
+    for path, text in files.items():
+        atomic_write(path, text)
+
+
+class StateWriter:
+    """
+    mark_dirty(path, snapshot) remembers the latest snapshot callable for a file and
+    restarts the save delay, so a burst of edits costs one write per file. Snapshots are
+    called on the main thread when the delay runs out; only the file writes happen in
+    the background, one batch at a time.
+    """
+
+    def __init__(self, root, on_error=None, delay=SAVE_DELAY_MS):
+        self.root = root
+        self.on_error = on_error
+        self.delay = delay
+        self.dirty = {}   # path -> callable returning the data to save as JSON
+        self.job = None
+        self.task = None
+
+    def mark_dirty(self, path, snapshot):
+        self.dirty[path] = snapshot
+        if self.job is not None:
+            self.root.after_cancel(self.job)
+        self.job = self.root.after(self.delay, self.flush)
+
+    def serialize(self):
+        dirty, self.dirty = self.dirty, {}
+        return {
+            path: json.dumps(snapshot(), indent=4, ensure_ascii=False)
+            for path, snapshot in dirty.items()
+        }
+
+    def flush(self):
+        """Starts writing the dirty files in the background."""
+        self.job = None
+        if not self.dirty:
+            return
+        if self.task is not None and self.task.is_running():
+            # Never race two writes of the same file; retry once this batch is on disk
+            self.job = self.root.after(self.delay, self.flush)
+            return
+
+        files = self.serialize()
+        self.task = BackgroundTask(
+            self.root,
+            lambda task: write_files(files),
+            on_done=lambda result: None,
+            on_error=self.on_error
+        ).start()
+
+    def flush_now(self):
+        """Writes everything still pending before returning, e.g. before the window closes."""
+        if self.job is not None:
+            self.root.after_cancel(self.job)
+            self.job = None
+        if self.task is not None and self.task.is_running():
+            self.task.thread.join()
+        write_files(self.serialize())
@@ -0,0 +1,116 @@
+"""
+Integer time representation.
+
+Times are held as whole ticks (TICKS_PER_SECOND per second) from parsing to the
+Excel writers, so sorting, ranking, ties and differences are exact integer math.
+They are only turned into text or float seconds at the presentation edge (cell
+text, chart values, statistics).
+
+Time cells are read by scan_time, which splits a token at ':' and '.' and builds
+the ticks with integer arithmetic; status tokens (DNF/DSQ/DNS) and empty cells
+come out of a lookup table. TimeTokenParser puts a cache of the tokens already
+seen in front of it, since a file repeats the same cells (empty, DNF, common
+times) over and over. Make one per file.
+"""
+
+TICKS_PER_SECOND = 1000           # Thousandths; Brower exports hundredths, so both are exact
+MISSING_TICKS = -2 ** 31          # int32 sentinel for a missing time in table columns
+MIN_VALID_TIME = 10 * TICKS_PER_SECOND  # Shorter split/finish times are timing errors (ERR)
+
+# Status codes returned with the ticks by scan_time
+TIME_OK, TIME_EMPTY, TIME_DNF, TIME_DSQ, TIME_DNS, TIME_INVALID = range(6)
+
+STATUS_TOKENS = {'': TIME_EMPTY, 'DNF': TIME_DNF, 'DSQ': TIME_DSQ, 'DNS': TIME_DNS}
+FRACTION_TICKS = (1000, 100, 10, 1)  # Ticks per 10 ** -n seconds, for a fraction of n digits
+
+
+def to_ticks(seconds):
+    """Seconds (float or None) to ticks."""
+    if seconds is None:
+        return None
+    return int(round(seconds * TICKS_PER_SECOND))
+
+
+def to_seconds(ticks):
+    """Ticks (int or None) to float seconds, for charts and statistics."""
+    if ticks is None:
+        return None
+    return ticks / TICKS_PER_SECOND
+
+
+def scan_time(token, zero_is_missing=False):
+    """
+    Reads one time cell: 'ss.xx' or 'm:ss.xx', a status token or nothing. Returns
+    (ticks, status); ticks is None unless status is TIME_OK. Fractions past
+    thousandths are rounded. zero_is_missing reads a bare '0' as an empty cell.
+    """
+    token = token.strip()
+    if not token[:1].isdecimal():
+        return None, STATUS_TOKENS.get(token.upper(), TIME_INVALID)
+    if zero_is_missing and token == '0':
+        return None, TIME_EMPTY
+
+    minutes, _, seconds = token.rpartition(':')
+    whole, _, fraction = seconds.partition('.')
+    digits = whole + fraction
+    if not (whole and digits.isdecimal() and (not minutes or minutes.isdecimal())):
+        return None, TIME_INVALID
+
+    # The digits without the point are a count of 10 ** -len(fraction) seconds
+    if len(fraction) < len(FRACTION_TICKS):
+        ticks = int(digits) * FRACTION_TICKS[len(fraction)]
+    else:
+        ticks = int(digits[:len(whole) + 3]) + (fraction[3] >= '5')
+    if minutes:
+        ticks += int(minutes) * 60 * TICKS_PER_SECOND
+    return ticks, TIME_OK
+
+
+class TimeTokenParser(dict):
+    """
+    Cache of token -> ticks in front of scan_time. Calling it returns just the ticks,
+    as BrowerParser's parse_time expects; a repeated token is a single dict lookup.
+    Unrecognised tokens are not cached so that invalid counts every such cell.
+    """
+
+    def __init__(self, zero_is_missing=False):
+        super().__init__()
+        self.zero_is_missing = zero_is_missing
+        self.invalid = 0
+
+    def __missing__(self, token):
+        ticks, status = scan_time(token, self.zero_is_missing)
+        if status == TIME_INVALID:
+            self.invalid += 1
+        else:
+            self[token] = ticks
+        return ticks
+
+    __call__ = dict.__getitem__
+
+
+def parse_ticks(time_str):
+    """
+    Parses 'ss.xx' or 'm:ss.xx' into ticks. Returns None for empty, status
+    (DNF/DSQ/DNS) or malformed values.
+    """
+    if not time_str or not isinstance(time_str, str):
+        return None
+    return scan_time(time_str)[0]
+
+
+def format_ticks(ticks, as_difference=False):
+    """
+    Formats ticks as 'ss.xx', or 'm:ss.xx' from a minute up, rounded to hundredths.
+    Differences always carry a sign.
+    """
+    if ticks is None:
+        return ""
+
+    sign = '-' if ticks < 0 else ('+' if as_difference else '')
+    hundredths = (abs(ticks) * 100 + TICKS_PER_SECOND // 2) // TICKS_PER_SECOND
+
+    if hundredths < 6000:
+        return f"{sign}{hundredths // 100}.{hundredths % 100:02d}"
+    minutes, hundredths = divmod(hundredths, 6000)
+    return f"{sign}{minutes}:{hundredths // 100:02d}.{hundredths % 100:02d}"
@@ -0,0 +1,233 @@
+"""
+Session cache for a selected Brower export.
+
+A TimingSession holds the parsed and sorted run data for one file so that
+run writing, graphs and repeated exports all share the same pass over the data.
+
+TimingTable is the columnar store behind it: bib, run and status-code columns are
+typed arrays and split times form a row-major int32 matrix of ticks (see
+time_ticks) with MISSING_TICKS for missing values. TimingEntry is a thin view over
+one row so writers can keep using entry['bib'], entry['splits'], entry['status']
+and friends; its times are ticks (to_seconds converts them for statistics).
+"""
+import logging
+import os
+from array import array
+
+from app_log import get_logger
+from brower_parser import ColumnLayout, TimingRow, iter_brower_records
+from time_ticks import MISSING_TICKS, TimeTokenParser
+
+log = get_logger('parse')
+
+MAX_TICKS = 2 ** 31 - 1
+STATUS_NAMES = ('', 'DNF', 'DSQ', 'DNS', 'ERR')
+
+
+def _time_or_none(value):
+    return None if value == MISSING_TICKS else value
+
+
+def _stored(value):
+    """Column value for a time in ticks; None and times past int32 are stored as missing."""
+    if value is None or not MISSING_TICKS < value <= MAX_TICKS:
+        return MISSING_TICKS
+    return value
+
+
+class TimingTable:
+    def __init__(self, num_splits=1):
+        self.num_splits = num_splits
+        self.bibs = array('l')
+        self.runs = array('l')
+        self.status_codes = array('b')
+        self.splits = array('i')       # ticks, len(self) x num_splits, row-major
+        self.finish = array('i')
+        self.status_names = list(STATUS_NAMES)
+        self.error_details = {}        # row -> list of messages, only for rows that have any
+
+    def __len__(self):
+        return len(self.bibs)
+
+    def status_code(self, status):
+        """
+        Returns the code for a status string, registering unknown statuses on first use.
+        """
+        status = (status or '').strip().upper()
+        try:
+            return self.status_names.index(status)
+        except ValueError:
+            self.status_names.append(status)
+            return len(self.status_names) - 1
+
+    def append(self, bib, run, splits, finish, status):
+        """
+        Adds one row and returns its TimingEntry, or None when the bib or run isn't numeric.
+        """
+        try:
+            bib = int(bib)
+            run = int(run)
+        except (TypeError, ValueError):
+            return None
+
+        self.bibs.append(bib)
+        self.runs.append(run)
+        self.status_codes.append(self.status_code(status))
+        for i in range(self.num_splits):
+            value = splits[i] if i < len(splits) else None
+            self.splits.append(_stored(value))
+        self.finish.append(_stored(finish))
+        return TimingEntry(self, len(self.bibs) - 1)
+
+    def replace(self, row, splits, finish, status):
+        """Overwrites the times and status of an existing row, e.g. when a live row is rewritten."""
+        self.status_codes[row] = self.status_code(status)
+        for i in range(self.num_splits):
+            value = splits[i] if i < len(splits) else None
+            self.splits[row * self.num_splits + i] = _stored(value)
+        self.finish[row] = _stored(finish)
+        self.error_details.pop(row, None)
+
+    def split(self, row, index):
+        if index >= self.num_splits:
+            return None
+        return _time_or_none(self.splits[row * self.num_splits + index])
+
+    def split_column(self, index, rows=None):
+        """
+        Returns the present values of one split column, optionally restricted to some rows.
+        """
+        if index >= self.num_splits:
+            return []
+        n = self.num_splits
+        if rows is None:
+            values = self.splits[index::n]
+        else:
+            values = (self.splits[row * n + index] for row in rows)
+        return [value for value in values if value != MISSING_TICKS]
+
+    def finish_column(self, rows=None):
+        values = self.finish if rows is None else (self.finish[row] for row in rows)
+        return [value for value in values if value != MISSING_TICKS]
+
+    def entries(self):
+        """Row views, with times in ticks."""
+        return [TimingEntry(self, row) for row in range(len(self))]
+
+
+class TimingEntry:
+    """
+    Row view over a TimingTable. Reads like the old per-entry dict.
+    Only 'status' and 'error_details' are writable.
+    """
+    __slots__ = ('table', 'row')
+
+    KEYS = ('bib', 'run', 'splits', 'split1', 'valid_splits', 'finish', 'status', 'error_details')
+
+    def __init__(self, table, row):
+        self.table = table
+        self.row = row
+
+    def __getitem__(self, key):
+        table, row = self.table, self.row
+        if key == 'bib':
+            return table.bibs[row]
+        if key == 'run':
+            return str(table.runs[row])
+        if key == 'status':
+            return table.status_names[table.status_codes[row]]
+        if key == 'finish':
+            return _time_or_none(table.finish[row])
+        if key == 'split1':
+            return table.split(row, 0)
+        if key == 'splits':
+            return [table.split(row, i) for i in range(table.num_splits)]
+        if key == 'valid_splits':
+            return sum(1 for s in self['splits'] if s is not None and s > 0)
+        if key == 'error_details':
+            return table.error_details.get(row, [])
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key == 'status':
+            self.table.status_codes[self.row] = self.table.status_code(value)
+        elif key == 'error_details':
+            if value:
+                self.table.error_details[self.row] = list(value)
+            else:
+                self.table.error_details.pop(self.row, None)
+        else:
+            raise KeyError(f"{key} is read-only")
+
+    def __contains__(self, key):
+        return key in self.KEYS
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return self.KEYS
+
+    def __repr__(self):
+        return f"TimingEntry(bib={self['bib']}, run={self['run']}, status={self['status']!r})"
+
+
+def load_timing_table(file_path, parse_time=None, span=None):
+    """
+    Streams a Brower export into a TimingTable sized to its split columns.
+    parse_time turns a time cell into ticks, or None when there is no time;
+    by default a fresh TimeTokenParser, so repeated cells are parsed once per file.
+    span (a SessionSpan from index_sessions) limits the read to one session.
+    """
+    if parse_time is None:
+        parse_time = TimeTokenParser()
+    table = TimingTable()
+    skipped = 0
+    debug = log.isEnabledFor(logging.DEBUG)
+    for record in iter_brower_records(file_path, parse_time, span):
+        if isinstance(record, ColumnLayout):
+            table = TimingTable(len(record.splits))
+        elif isinstance(record, TimingRow):
+            if table.append(*record) is None:
+                skipped += 1
+                if debug:
+                    log.debug("Skipping row with non-numeric bib or run", extra={'fields': {'row': record}})
+    if skipped:
+        log.warning("Skipped %d rows with a non-numeric bib or run in %s", skipped, os.path.basename(file_path),
+                    extra={'fields': {'file': file_path, 'skipped': skipped}})
+    invalid = getattr(parse_time, 'invalid', 0)
+    if invalid:
+        log.warning("Read %d unrecognised time cells as missing in %s", invalid, os.path.basename(file_path),
+                    extra={'fields': {'file': file_path, 'invalid': invalid}})
+    return table
+
+
+class TimingSession:
+    def __init__(self, key, runs, table=None):
+        self.key = key
+        self.table = table        # TimingTable backing the entries
+        self.runs = runs          # {run_number: sorted entries}
+
+    @staticmethod
+    def file_key(file_path, span=None):
+        """
+        Identifies a file by path, modification time and size so edits invalidate the cache,
+        plus the byte range of the session read from it, if any.
+        """
+        stat = os.stat(file_path)
+        key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+        if span is not None:
+            key += (span.start, span.end)
+        return key
+
+    def matches(self, file_path, span=None):
+        try:
+            return self.key == self.file_key(file_path, span)
+        except OSError:
+            return False
+
+    def run_numbers(self):
+        return sorted(self.runs.keys(), key=int)
@@ -0,0 +1,50 @@
+"""
+Per-run rankings shared by the Excel writers.
+"""
+
+
+class Ranking:
+    """
+    Ranks for one timed column of a run, built once from (time, bib) pairs.
+    Equal times share a rank and the next rank skips ahead (1, 2, 2, 4).
+    """
+
+    def __init__(self, times):
+        self.ordered = sorted(times, key=lambda item: item[0])
+        self.best = self.ordered[0][0] if self.ordered else None
+        self.ranks = {}  # bib -> rank
+        self.diffs = {}  # bib -> difference from best
+
+        rank = 0
+        previous = None
+        for position, (time, bib) in enumerate(self.ordered, 1):
+            if time != previous:
+                rank = position
+                previous = time
+            self.ranks.setdefault(bib, rank)
+            self.diffs.setdefault(bib, time - self.best)
+
+    def __len__(self):
+        return len(self.ordered)
+
+    def rank(self, bib, default=''):
+        return self.ranks.get(bib, default)
+
+    def diff(self, bib):
+        return self.diffs.get(bib)
+
+
+class RunRanking:
+    """
+    Split and finish rankings for one run.
+    split_times is one list of (time, bib) pairs per split; finish_times is a single list.
+    """
+
+    def __init__(self, split_times, finish_times):
+        self.splits = [Ranking(times) for times in split_times]
+        self.finish = Ranking(finish_times)
+
+    def split(self, split_idx):
+        if split_idx < len(self.splits):
+            return self.splits[split_idx]
+        return Ranking([])
@@ -0,0 +1,68 @@
+"""
+Shared Tk timer for animations and debounced refreshes.
+
+Every animated widget registers a step function with UIScheduler.animate; a single
+root.after timer calls all of them once per frame and stops as soon as none are
+left, so an idle window schedules nothing. debounce() coalesces bursts of events
+(keystrokes) into one call once the burst has settled.
+"""
+import tkinter as tk
+
+FRAME_MS = 20      # One animation frame; steps are sized for this rate
+DEBOUNCE_MS = 80   # Quiet time after the last keystroke before refreshing suggestions
+
+
+class UIScheduler:
+    def __init__(self, root):
+        self.root = root
+        self.animations = {}  # key -> step(), which returns True while it still has frames to run
+        self.frame_job = None
+        self.debounced = {}   # key -> pending after() id
+
+    def animate(self, key, step):
+        """
+        Runs step once per frame until it returns False. Registering the same key again
+        replaces the step rather than starting a second animation.
+        """
+        self.animations[key] = step
+        if self.frame_job is None:
+            self.frame_job = self.root.after(FRAME_MS, self.tick)
+
+    def tick(self):
+        self.frame_job = None
+        for key, step in list(self.animations.items()):
+            if not step() and self.animations.get(key) is step:
+                del self.animations[key]
+        if self.animations:
+            self.frame_job = self.root.after(FRAME_MS, self.tick)
+
+    def debounce(self, key, callback, delay=DEBOUNCE_MS):
+        """Calls callback after delay ms, restarting the wait if called again with the same key."""
+        job = self.debounced.pop(key, None)
+        if job is not None:
+            self.root.after_cancel(job)
+
+        def run():
+            self.debounced.pop(key, None)
+            callback()
+
+        self.debounced[key] = self.root.after(delay, run)
+
+
+def update_listbox(listbox, items):
+    """
+    Makes the listbox show items, keeping the rows they share with the current contents
+    and only deleting/inserting the rest. Returns True when anything changed.
+    """
+    current = listbox.get(0, tk.END)
+    common = 0
+    while common < len(current) and common < len(items) and current[common] == items[common]:
+        common += 1
+
+    if common == len(current) == len(items):
+        return False
+    if common < len(current):
+        listbox.delete(common, tk.END)
+    for item in items[common:]:
+        listbox.insert(tk.END, item)
+    return True